@@ -0,0 +1,53 @@
+"""Infraestrutura compartilhada pelos scripts de análise exergética"""
+
+from .analyzer import AspenAnalyzer
+from .backends import Backend, COMBackend, CSVBackend, DictBackend, load_csv_values
+from .document_pool import DocumentPool
+from .fake_aspen import FakeAspenDocument
+from .flowsheet import Flowsheet, available_flowsheets, load_flowsheet
+from .node_store import CachedBackend, NodeStore
+from .nodes import block_input_path, block_output_path, stream_exergy_path, stream_input_path
+from .pool import ScenarioPool
+from .prefetch import NodePlan, fetch_nodes
+from .result_cache import ResultCache, result_key
+from .runner import RunOutcome, run_engine, run_engine_async
+from .snapshot import SnapshotBackend, capture_snapshot, load_snapshot, save_snapshot
+from .sweep import ParametricSweep, SweepTable, full_factorial
+from .topology import Topology, discover_topology
+
+__all__ = [
+    "AspenAnalyzer",
+    "Backend",
+    "COMBackend",
+    "CSVBackend",
+    "CachedBackend",
+    "DictBackend",
+    "DocumentPool",
+    "FakeAspenDocument",
+    "Flowsheet",
+    "NodePlan",
+    "NodeStore",
+    "ParametricSweep",
+    "ResultCache",
+    "RunOutcome",
+    "ScenarioPool",
+    "SnapshotBackend",
+    "SweepTable",
+    "Topology",
+    "available_flowsheets",
+    "block_input_path",
+    "block_output_path",
+    "capture_snapshot",
+    "discover_topology",
+    "fetch_nodes",
+    "full_factorial",
+    "load_csv_values",
+    "load_flowsheet",
+    "load_snapshot",
+    "result_key",
+    "run_engine",
+    "run_engine_async",
+    "save_snapshot",
+    "stream_exergy_path",
+    "stream_input_path",
+]
@@ -0,0 +1,6 @@
+"""Permite executar a análise com `python -m exergia <variantes>`"""
+
+from .analyzer import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""Amostragem adaptativa dos casos: menos simulações nas regiões planas
+
+Uma grade completa gasta a maior parte das execuções onde as perdas quase
+não mudam. O AdaptiveSampler começa com um hipercubo latino nas faixas das
+entradas e depois propõe os pontos onde a perda total da planta (ou as
+perdas escolhidas em objectives) varia mais rápido. A cada lote, ajusta um
+modelo substituto RBF (ver surrogate.py) aos casos já analisados e pontua
+candidatos por
+
+    (exploration + |gradiente previsto|) x distância ao caso mais próximo
+
+de modo que o refinamento se concentra nas regiões íngremes sem amontoar
+pontos. A interface é por lotes (ask/tell): pedidos ainda sem resultado
+contam como ocupados, então vários lotes podem estar em execução ao mesmo
+tempo em um ScenarioPool.
+
+    sampler = AdaptiveSampler({temperatura: (560.0, 640.0), refluxo: (1.5, 4.0)})
+    while sampler.evaluated < 60:
+        cases = sampler.ask(4)
+        sampler.tell(pool.run(cases))
+    sampler.table.to_csv("adaptativo.csv")
+
+    python -m exergia.adaptive rtc --faixa "\\Data\\Blocks\\R-1\\Input\\TEMP=560,640" --orcamento 60
+"""
+
+import argparse
+import asyncio
+
+import numpy as np
+
+from .analyzer import total_loss
+from .backends import COMBackend
+from .flowsheet import load_flowsheet
+from .result_cache import ResultCache
+from .runner import ANALYZABLE
+from .surrogate import SurrogateModel
+from .sweep import ParametricSweep, SweepTable, _print_row, parse_parameter
+
+# Candidatos pontuados por entrada a cada lote de refinamento
+CANDIDATES_PER_INPUT = 200
+# Passo das diferenças finitas do gradiente (entradas escaladas para [0, 1])
+GRADIENT_STEP = 1e-3
+
+
+def latin_hypercube(n, dimensions, rng):
+    """n pontos em [0, 1)^dimensions, um em cada uma das n faixas de cada dimensão"""
+    strata = np.argsort(rng.random((dimensions, n)), axis=1).T
+    return (strata + rng.random((n, dimensions))) / n
+
+
+def _nearest_distances(points, references):
+    """Distância de cada ponto à referência mais próxima (infinita sem referências)"""
+    if len(references) == 0:
+        return np.full(len(points), np.inf)
+    differences = points[:, None, :] - references[None, :, :]
+    return np.sqrt((differences ** 2).sum(axis=-1)).min(axis=1)
+
+
+class AdaptiveSampler:
+    """Propõe casos por lotes: hipercubo latino inicial e refinamento adaptativo
+
+    bounds: {caminho do nó: (mínimo, máximo)}
+    objectives: colunas cujas variações guiam o refinamento (padrão: a perda
+        total, como no resumo da análise; ver analyzer.total_loss)
+    initial: casos do hipercubo latino inicial (padrão: 4 por entrada, ao
+        menos batch_size)
+    exploration: peso da distância pura em relação ao gradiente (0: só
+        regiões íngremes; grande: preenchimento uniforme)
+    """
+
+    def __init__(self, bounds, objectives=None, batch_size=4, initial=None, exploration=0.1, seed=None):
+        self.paths = list(bounds)
+        if not self.paths:
+            raise ValueError("Informe a faixa de ao menos uma entrada")
+        self.lower = np.array([float(bounds[path][0]) for path in self.paths])
+        self.upper = np.array([float(bounds[path][1]) for path in self.paths])
+        if np.any(self.upper <= self.lower):
+            raise ValueError("Cada faixa precisa de mínimo menor que o máximo")
+        self.objectives = list(objectives) if objectives is not None else None
+        self.batch_size = batch_size
+        self.initial = initial if initial is not None else max(4 * len(self.paths), batch_size)
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+        self.table = SweepTable(self.paths)
+        self._initial_points = None
+        self._pending = {}     # entradas (tupla) -> ponto escalado, pedidos sem resultado
+        self._points = []      # pontos escalados já avaliados
+        self._values = []      # objetivos desses pontos (None: caso não analisado)
+
+    @property
+    def evaluated(self):
+        return len(self._points)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _to_case(self, point):
+        values = self.lower + point * (self.upper - self.lower)
+        return {path: float(value) for path, value in zip(self.paths, values)}
+
+    def _to_point(self, case):
+        values = np.array([float(case[path]) for path in self.paths])
+        return (values - self.lower) / (self.upper - self.lower)
+
+    def _key(self, case):
+        return tuple(float(case[path]) for path in self.paths)
+
+    def objective_values(self, row):
+        """Valores dos objetivos de uma linha, ou None se o caso não foi analisado"""
+        if row.get("status") not in ANALYZABLE or "eficiencia_completa" not in row:
+            return None
+        if self.objectives is None:
+            values = [total_loss(row)]
+        else:
+            values = [row.get(column) for column in self.objectives]
+        if any(value is None for value in values):
+            return None
+        values = [float(value) for value in values]
+        return values if np.all(np.isfinite(values)) else None
+
+    def ask(self, n=None):
+        """Próximo lote de casos {caminho: valor} (padrão: batch_size casos)"""
+        n = self.batch_size if n is None else n
+        if self._initial_points is None:
+            self._initial_points = list(latin_hypercube(self.initial, len(self.paths), self.rng))
+        points = []
+        while self._initial_points and len(points) < n:
+            points.append(self._initial_points.pop())
+        if len(points) < n:
+            points += self._refine(n - len(points), points)
+        cases = [self._to_case(point) for point in points]
+        for case, point in zip(cases, points):
+            self._pending[self._key(case)] = point
+        return cases
+
+    def tell(self, rows):
+        """Registra os resultados (linhas do SweepTable) de casos pedidos ou externos"""
+        for row in rows:
+            case = {path: row[path] for path in self.paths}
+            point = self._pending.pop(self._key(case), None)
+            self._points.append(point if point is not None else self._to_point(case))
+            self._values.append(self.objective_values(row))
+            self.table.add({**row, "caso": len(self.table)})
+
+    def _gradient_scores(self, candidates):
+        """|gradiente| previsto dos objetivos (normalizados) em cada candidato, entre 0 e 1"""
+        analyzed = [i for i, values in enumerate(self._values) if values is not None]
+        dimensions = len(self.paths)
+        if len(analyzed) < dimensions + 2:
+            return np.zeros(len(candidates))
+        X = np.array([self._points[i] for i in analyzed])
+        Y = np.array([self._values[i] for i in analyzed])
+        spread = Y.std(axis=0)
+        if not np.any(spread > 0):
+            return np.zeros(len(candidates))
+        Y = Y / np.where(spread > 0, spread, 1.0)
+        try:
+            model = SurrogateModel("rbf").fit(X, Y)
+        except ValueError:
+            return np.zeros(len(candidates))
+
+        gradient = np.zeros((len(candidates), Y.shape[1], dimensions))
+        for i in range(dimensions):
+            step = np.zeros(dimensions)
+            step[i] = GRADIENT_STEP
+            gradient[:, :, i] = (model.predict(candidates + step) - model.predict(candidates - step)) \
+                / (2 * GRADIENT_STEP)
+        scores = np.sqrt((gradient ** 2).sum(axis=-1)).sum(axis=1)
+        top = scores.max()
+        return scores / top if top > 0 else scores
+
+    def _refine(self, n, chosen):
+        """n pontos de refinamento, escolhidos um a um entre candidatos do hipercubo latino"""
+        candidates = latin_hypercube(CANDIDATES_PER_INPUT * len(self.paths), len(self.paths), self.rng)
+        occupied = np.array(self._points + list(self._pending.values()) + list(chosen)).reshape(-1, len(self.paths))
+        distances = _nearest_distances(candidates, occupied)
+        if not np.any(np.isfinite(distances)):
+            distances = np.ones(len(candidates))
+        weights = self.exploration + self._gradient_scores(candidates)
+        points = []
+        for _ in range(n):
+            best = int(np.argmax(weights * distances))
+            points.append(candidates[best])
+            # Os próximos pontos do lote se afastam do escolhido
+            distances = np.minimum(distances, _nearest_distances(candidates, candidates[best:best + 1]))
+        return points
+
+    def run(self, execute, budget, callback=None):
+        """Pede, executa e registra lotes até budget casos avaliados; retorna self.table
+
+        execute: função lista de casos -> linhas, por exemplo
+            ParametricSweep.run (com o documento já aberto) ou ScenarioPool.run
+        """
+        while self.evaluated < budget:
+            cases = self.ask(min(self.batch_size, budget - self.evaluated))
+            rows = list(execute(cases))
+            self.tell(rows)
+            if callback is not None:
+                for row in self.table.rows[-len(rows):]:
+                    callback(row)
+        return self.table
+
+
+def parse_range(text):
+    """"caminho=mínimo,máximo" (argumento --faixa) -> (caminho, (mínimo, máximo))"""
+    path, values = parse_parameter(text)
+    if len(values) != 2 or not all(isinstance(value, float) for value in values):
+        raise ValueError(f"Faixa inválida (esperado caminho=mínimo,máximo): {text}")
+    return path, tuple(values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Varredura adaptativa: hipercubo latino e refinamento onde as perdas variam mais")
+    parser.add_argument("fluxograma", help="variante (nome em flowsheets/ ou arquivo JSON/TOML)")
+    parser.add_argument("--arquivo", help="arquivo .apw (substitui o definido no fluxograma)")
+    parser.add_argument("--faixa", action="append", default=[], metavar="CAMINHO=MIN,MAX",
+                        help="entrada e faixa de valores (repita para várias entradas)")
+    parser.add_argument("--objetivo", action="append", metavar="COLUNA",
+                        help="coluna que guia o refinamento, ex. perda_R-1 (padrão: perda total)")
+    parser.add_argument("--orcamento", type=int, default=40, help="total de casos simulados")
+    parser.add_argument("--lote", type=int, default=4, help="casos pedidos por lote")
+    parser.add_argument("--iniciais", type=int, help="casos do hipercubo latino inicial")
+    parser.add_argument("--exploracao", type=float, default=0.1,
+                        help="peso do preenchimento uniforme em relação ao gradiente")
+    parser.add_argument("--semente", type=int, help="semente dos números aleatórios")
+    parser.add_argument("--saida", help="grava a tabela de resultados (.csv ou .json)")
+    parser.add_argument("--tempo-limite", type=float,
+                        help="interrompe a simulação de um caso após S segundos")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="executa cada lote em N processos, cada um com a própria instância do Aspen")
+    parser.add_argument("--cache-resultados", metavar="DIRETORIO",
+                        help="reaproveita resultados de casos já calculados")
+    args = parser.parse_args(argv)
+
+    if not args.faixa:
+        parser.error("informe ao menos uma --faixa")
+    try:
+        bounds = dict(parse_range(text) for text in args.faixa)
+        sampler = AdaptiveSampler(bounds, args.objetivo, batch_size=args.lote, initial=args.iniciais,
+                                  exploration=args.exploracao, seed=args.semente)
+    except ValueError as e:
+        parser.error(str(e))
+
+    flowsheet = load_flowsheet(args.fluxograma)
+    file_path = args.arquivo or flowsheet.aspen_file
+    result_cache = ResultCache(args.cache_resultados) if args.cache_resultados else None
+    print(f"Varredura adaptativa de {flowsheet.name}: {args.orcamento} casos, lotes de {args.lote}")
+    if args.processos > 1:
+        # pool.py depende de sweep.py
+        from .pool import ScenarioPool
+
+        with ScenarioPool(flowsheet, COMBackend, workers=args.processos, file_path=file_path,
+                          timeout=args.tempo_limite, result_cache=result_cache) as pool:
+            table = sampler.run(pool.run, args.orcamento, callback=_print_row)
+    else:
+        with ParametricSweep(flowsheet, backend=COMBackend(), timeout=args.tempo_limite,
+                             result_cache=result_cache) as sweep:
+            sweep.open(file_path)
+            table = sampler.run(lambda cases: asyncio.run(sweep.run_async(cases)).rows,
+                                args.orcamento, callback=_print_row)
+
+    print(f"{len(table.converged())} de {len(table)} casos convergidos e analisados")
+    if args.saida:
+        if args.saida.lower().endswith(".json"):
+            table.to_json(args.saida)
+        else:
+            table.to_csv(args.saida)
+        print(f"Resultados gravados em {args.saida}")
+    return table
+
+
+if __name__ == '__main__':
+    main()
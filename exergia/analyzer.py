@@ -0,0 +1,1494 @@
+"""Motor da análise exergética da planta, configurado por um fluxograma
+
+O AspenAnalyzer lê os valores da simulação por meio de um backend (Aspen Plus
+via COM, snapshot, CSV, ...) e calcula as perdas exergéticas de cada categoria
+de equipamento descrita no fluxograma (ver flowsheet.py), seguido do balanço
+exergético completo da planta.
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from time import perf_counter
+
+from .backends import COMBackend, CSVBackend, DictBackend
+from .flowsheet import RESULT_KEYS, Flowsheet, load_flowsheet
+from .heat import carnot_heat_exergy
+from .node_store import CachedBackend, archive_hash
+from .result_cache import ResultCache, result_key
+from .runner import run_engine, run_engine_async
+from .nodes import MissingNodesError, block_output_path, stream_exergy_path
+from .snapshot import SnapshotBackend, capture_snapshot
+from .telemetry import SOURCE_BACKEND, SOURCE_CACHE, SOURCE_MISSING, SOURCE_TABLE, NodeTelemetry
+from .tracing import NULL_TRACER, Tracer, traced
+
+
+class AspenAnalyzer:
+    # Método de análise de cada categoria de equipamento do fluxograma
+    CATEGORY_METHODS = {
+        "pumps": "calculate_pumps_exergy_loss",
+        "compressors": "calculate_compressors_exergy_loss",
+        "coolers": "calculate_coolers_exergy_loss",
+        "mixers": "calculate_mixers_exergy_loss",
+        "valves": "calculate_valves_exergy_loss",
+        "separators": "calculate_separators_exergy_loss",
+        "furnaces": "calculate_furnaces_exergy_loss",
+        "heat_exchangers": "calculate_heat_exchanger_exergy_loss",
+        "flash_tanks": "calculate_flash_tanks_exergy_loss",
+        "splitters": "calculate_splitters_exergy_loss",
+        "columns": "calculate_columns_exergy_loss",
+        "reactors": "calculate_reactors_exergy_loss",
+    }
+
+    def __init__(self, flowsheet, backend=None, strict=False):
+        # Fluxograma compilado, ou nome/arquivo da variante a carregar
+        if not isinstance(flowsheet, Flowsheet):
+            flowsheet = load_flowsheet(flowsheet)
+        self.flowsheet = flowsheet
+
+        # Fonte dos valores de nós; por padrão o Aspen Plus via COM
+        self.backend = backend if backend is not None else COMBackend()
+        self.results = {}
+        self.T0 = 298.15  # Temperatura ambiente de referência (K)
+        # No modo estrito a análise é abortada se algum nó planejado faltar
+        self.strict = strict
+
+        # Cache de valores de nós válido apenas para a simulação atual
+        self._node_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Cache negativo: nós ausentes/sem valor não são procurados de novo
+        self._missing_nodes = {}
+        self._missing_lookups = Counter()
+        self.prefetch_stats = {}
+        self._balance_model = None
+        # Grafo bloco/corrente descoberto no Aspen (ou lido do snapshot)
+        self.topology = None
+        # Tabela de correntes (array NumPy) lida em uma única passagem por
+        # Data\Streams; usada por get_stream_exergy quando use_stream_table
+        self.use_stream_table = False
+        self.stream_table = None
+
+        # Contagens e latências de acesso aos nós; exportadas em JSON ao fim
+        # de full_exergy_analysis() quando telemetry_path é definido. Cada
+        # análise e cada novo conjunto de valores (clear_node_cache) começa
+        # um período novo; só os totais em telemetry.totals se acumulam
+        self.telemetry = NodeTelemetry()
+        self.telemetry_path = None
+
+        # Intervalos de tempo das etapas; desligado até enable_tracing()
+        self.tracer = NULL_TRACER
+
+        # Situação da última execução da simulação (runner.RunOutcome)
+        self.run_outcome = None
+
+    @property
+    def aspen(self):
+        """Documento Apwn.Document aberto (None para fontes offline)"""
+        return getattr(self.backend, 'document', None)
+
+    @traced
+    def connect_to_aspen(self, file_path):
+        """Estabelece conexão com o arquivo Aspen Plus"""
+        try:
+            self.backend.connect(file_path)
+            self.clear_node_cache()
+            print("Conexão com Aspen Plus estabelecida com sucesso!")
+
+            self.run_simulation()
+            return True
+        except Exception as e:
+            print(f"Erro ao conectar ao Aspen Plus: {e}")
+            return False
+
+    @traced
+    def run_simulation(self):
+        """Executa a simulação do Aspen Plus"""
+        # Os valores lidos antes da execução deixam de ser válidos
+        self.clear_node_cache()
+        print("Executando simulação Aspen Plus...")
+        self.run_outcome = run_engine(self.backend)
+        print(self.run_outcome.describe())
+        return self.run_outcome
+
+    async def run_simulation_async(self, timeout=None, poll_interval=0.5, progress=None):
+        """Executa a simulação sem bloquear o laço de eventos (ver runner.run_engine_async)
+
+        Retorna o RunOutcome; a simulação é interrompida após timeout segundos
+        ou se a tarefa for cancelada.
+        """
+        self.clear_node_cache()
+        print("Executando simulação Aspen Plus (assíncrona)...")
+        self.run_outcome = await run_engine_async(self.backend, timeout, poll_interval, progress)
+        print(self.run_outcome.describe())
+        return self.run_outcome
+
+    @traced
+    def close_connection(self):
+        """Fecha a conexão com o Aspen Plus"""
+        if self.aspen:
+            self.backend.close()
+            print("Conexão com Aspen Plus encerrada.")
+
+    def clear_node_cache(self):
+        """Descarta os valores de nós armazenados e zera os contadores do cache e a telemetria"""
+        self.telemetry.reset()
+        self._node_cache.clear()
+        self.stream_table = None
+        self._missing_nodes.clear()
+        self._missing_lookups.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_stats(self):
+        """Retorna acertos, falhas e tamanho do cache de nós"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'acertos': self.cache_hits,
+            'falhas': self.cache_misses,
+            'nos_em_cache': len(self._node_cache),
+            'nos_ausentes': len(self._missing_nodes),
+            'taxa_acerto': (self.cache_hits / total * 100) if total > 0 else 0.0,
+        }
+
+    def get_node_value(self, node_path, default=0.0, helper="get_node_value"):
+        """Obtém o valor de um nó com tratamento de erros
+
+        Nós ausentes ou sem valor são lembrados até a próxima simulação e
+        relatados de uma só vez por missing_nodes_report(). helper é o nome
+        da função de acesso (get_stream_exergy, get_heat_duty, ...) usado
+        para agrupar a telemetria.
+        """
+        start = perf_counter()
+        if node_path in self._node_cache:
+            self.cache_hits += 1
+            value, source = self._node_cache[node_path], SOURCE_CACHE
+        elif node_path in self._missing_nodes:
+            self.cache_hits += 1
+            value, source = None, SOURCE_MISSING
+        else:
+            self.cache_misses += 1
+            value, source = self._read_backend_node(node_path), SOURCE_BACKEND
+
+        if value is None:
+            self._missing_lookups[node_path] += 1
+            value = default
+        self.telemetry.record_call(node_path, source, perf_counter() - start, helper)
+        return value
+
+    def _read_backend_node(self, node_path):
+        """Lê um nó da fonte de dados, registrando-o como ausente se falhar"""
+        start = perf_counter()
+        try:
+            value = self.backend.read_node(node_path)
+        except KeyError:
+            self._missing_nodes[node_path] = "não encontrado"
+            return None
+        except Exception as e:
+            self._missing_nodes[node_path] = f"erro: {e}"
+            return None
+        finally:
+            self.telemetry.record_read(node_path, perf_counter() - start)
+
+        # Verificar se o nó possui valor válido
+        if value is None:
+            self._missing_nodes[node_path] = "sem valor"
+            return None
+        self._node_cache[node_path] = value
+        return value
+
+    def missing_nodes(self):
+        """{caminho: motivo} dos nós ausentes ou sem valor nesta simulação"""
+        return dict(self._missing_nodes)
+
+    def missing_nodes_report(self):
+        """Relatório agregado dos nós ausentes (vazio se não houver nenhum)"""
+        if not self._missing_nodes:
+            return ""
+        lines = [f"NÓS INDISPONÍVEIS ({len(self._missing_nodes)}):"]
+        for path, reason in sorted(self._missing_nodes.items()):
+            lookups = self._missing_lookups[path]
+            lines.append(f"  {path}: {reason} ({lookups} consultas)")
+        return "\n".join(lines)
+
+    # ==============================================
+    # SISTEMA PADRONIZADO DE OBTENÇÃO DE VALORES
+    # ==============================================
+
+    def get_stream_exergy(self, stream_name, default=0.0):
+        """Obtém a exergia de uma corrente"""
+        table = self.stream_table
+        if table is not None and "EXERGYFL" in table.property_index:
+            start = perf_counter()
+            value = table.get(stream_name)
+            if value is not None:
+                self.cache_hits += 1
+                self.telemetry.record_call(stream_exergy_path(stream_name), SOURCE_TABLE,
+                                           perf_counter() - start, "get_stream_exergy")
+                return value
+        path = stream_exergy_path(stream_name)
+        return self.get_node_value(path, default, "get_stream_exergy")
+
+    def get_equipment_power(self, equipment_name, default=0.0):
+        """Obtém a potência de um equipamento"""
+        path = block_output_path(equipment_name, "WNET")
+        return self.get_node_value(path, default, "get_equipment_power")
+
+    def get_equipment_heat(self, equipment_name, default=0.0):
+        """Obtém o calor trocado em equipamentos (QNET)"""
+        path = block_output_path(equipment_name, "QNET")
+        return self.get_node_value(path, default, "get_equipment_heat")
+
+    def get_heat_duty(self, equipment_name, default=0.0):
+        """Obtém o calor trocado em equipamentos (QCALC)"""
+        path = block_output_path(equipment_name, "QCALC")
+        return self.get_node_value(path, default, "get_heat_duty")
+
+    def get_reboiler_duty(self, column_name, default=0.0):
+        """Obtém o calor do reboiler de uma coluna"""
+        path = block_output_path(column_name, "REB_DUTY")
+        return self.get_node_value(path, default, "get_reboiler_duty")
+
+    def get_condenser_duty(self, column_name, default=0.0):
+        """Obtém o calor do condensador de uma coluna"""
+        path = block_output_path(column_name, "COND_DUTY")
+        return self.get_node_value(path, default, "get_condenser_duty")
+
+    def get_flash_heat_duty(self, flash_name, default=0.0):
+        """Obtém o calor trocado em tanques flash"""
+        path = block_output_path(flash_name, "QCALC")
+        return self.get_node_value(path, default, "get_flash_heat_duty")
+
+    def get_compressor_heat(self, compressor_name, default=0.0):
+        """Obtém o calor trocado em compressores com resfriamento (QNET ou QCALC)"""
+        variable = self.flowsheet.options["compressor_heat_variable"]
+        path = block_output_path(compressor_name, variable)
+        return self.get_node_value(path, default, "get_compressor_heat")
+
+    def get_streams_exergy(self, equipment, key):
+        """Soma a exergia das correntes de entrada (key="input") ou saída ("output")
+
+        Equipamentos de categorias de corrente única com várias portas trazem
+        a lista ("inputs"/"outputs") no lugar da corrente; todas entram na
+        soma. Retorna (exergia, nomes das correntes separados por vírgula).
+        """
+        streams = equipment[key + "s"] if key + "s" in equipment else (equipment[key],)
+        total = 0.0
+        for stream in streams:
+            total += self.get_stream_exergy(stream)
+        return total, ", ".join(streams)
+
+    # ==============================================
+    # PRÉ-CARREGAMENTO DOS NÓS
+    # ==============================================
+
+    def plan_node_paths(self):
+        """Lista, sem repetição, todos os nós lidos pela análise completa"""
+        return self.flowsheet.node_plan()
+
+    @traced
+    def prefetch_nodes(self):
+        """Lê de uma só vez os nós planejados e preenche o cache da simulação"""
+        plan = self.plan_node_paths()
+        pending = [path for path in plan
+                   if path not in self._node_cache and path not in self._missing_nodes]
+        table_values = 0
+        if self.use_stream_table:
+            # As exergias das correntes vêm da tabela; o lote lê só os blocos
+            table = self.read_stream_table()
+            in_table = table.node_values()
+            table_values = len(in_table)
+            pending = [path for path in pending if path not in in_table]
+
+        start = perf_counter()
+        values = self.backend.read_nodes(pending)
+        self.telemetry.record_batch(len(pending), len(values), perf_counter() - start)
+        self._node_cache.update(values)
+
+        # Os nós não lidos são classificados uma única vez (cache negativo)
+        for path in pending:
+            if path not in values:
+                self._read_backend_node(path)
+
+        self.prefetch_stats = {
+            'referencias': plan.requested,
+            'planejados': len(plan),
+            'lidos': len(values) + table_values,
+            'ausentes': sum(path in self._missing_nodes for path in plan),
+        }
+        print(f"Pré-carregamento: {plan.requested} referências, {len(plan)} nós planejados, "
+              f"{len(values) + table_values} lidos")
+
+        if self.strict:
+            missing = {path: self._missing_nodes[path] for path in plan if path in self._missing_nodes}
+            if missing:
+                raise MissingNodesError(missing)
+        return self.prefetch_stats
+
+    def read_stream_table(self, properties=("EXERGYFL",), all_streams=False):
+        """Lê em uma única passagem as propriedades das correntes para um array NumPy
+
+        Por padrão lê as correntes do fluxograma; all_streams=True lê todas
+        as correntes da simulação (ver stream_table.read_stream_table).
+        """
+        # numpy só é necessário para a tabela de correntes
+        from .stream_table import read_stream_table
+        stream_names = None if all_streams else self.flowsheet.streams
+        start = perf_counter()
+        table = read_stream_table(self.backend, stream_names, properties)
+        self.telemetry.record_batch(len(table) * len(table.properties), table.count(), perf_counter() - start)
+        self.stream_table = table
+        return table
+
+    def save_snapshot(self, snapshot_path):
+        """Grava em arquivo todos os nós usados pela análise, para uso offline"""
+        metadata = {
+            'fluxograma': self.flowsheet.name,
+            'versao_fluxograma': self.flowsheet.version,
+            'fonte': self.backend.description,
+            'T0': self.T0,
+        }
+        # A topologia vai junto, para que execuções offline não a descubram de novo
+        try:
+            topology = self.discover_topology()
+        except NotImplementedError:
+            topology = None
+        read, missing, no_value = capture_snapshot(self.backend, self.plan_node_paths(), snapshot_path,
+                                                   metadata, topology)
+        print(f"Snapshot gravado em {snapshot_path}: {read} nós lidos, {missing} ausentes, "
+              f"{no_value} sem valor")
+
+    # ==============================================
+    # TOPOLOGIA DO FLUXOGRAMA
+    # ==============================================
+
+    def discover_topology(self):
+        """Grafo bloco/corrente da simulação, descoberto uma única vez"""
+        if self.topology is None:
+            self.topology = self.backend.read_topology()
+        return self.topology
+
+    def topology_flowsheet(self):
+        """Fluxograma montado a partir da topologia, com as opções do fluxograma atual"""
+        topology = self.discover_topology()
+        spec = topology.to_spec(self.flowsheet.name, heat_duty=self.get_heat_duty, base=self.flowsheet)
+        return Flowsheet(spec, source="topologia")
+
+    def use_discovered_topology(self):
+        """Substitui o fluxograma digitado pelo descoberto no Aspen
+
+        Retorna as divergências entre os dois (blocos, correntes e repetições).
+        """
+        topology = self.discover_topology()
+        differences = topology.differences(self.flowsheet)
+        differences += [f"Bloco {block} ({topology.blocks[block]['modelo']}) sem categoria de equipamento"
+                        for block in topology.unclassified()]
+        self.flowsheet = self.topology_flowsheet()
+        self._balance_model = None
+        return differences
+
+    def enable_tracing(self):
+        """Passa a registrar os intervalos de tempo de cada etapa"""
+        if not self.tracer.enabled:
+            self.tracer = Tracer()
+        return self.tracer
+
+    def export_trace(self, json_path):
+        """Grava os intervalos registrados como trace do Chrome/Perfetto"""
+        metadata = {'fluxograma': self.flowsheet.name, 'fonte': self.backend.description}
+        count = self.tracer.export_chrome_trace(json_path, metadata) if self.tracer.enabled else 0
+        print(f"Trace gravado em {json_path} ({count} intervalos)")
+        return count
+
+    def export_telemetry(self, json_path):
+        """Grava em JSON as contagens e latências de acesso aos nós"""
+        metadata = {
+            'fluxograma': self.flowsheet.name,
+            'fonte': self.backend.description,
+            'cache': self.cache_stats(),
+        }
+        data = self.telemetry.export_json(json_path, metadata)
+        print(f"Telemetria de nós gravada em {json_path} "
+              f"({data['resumo']['chamadas']} chamadas, {data['resumo']['tempo_fonte_ms']:.1f} ms na fonte)")
+        return data
+
+    # ==============================================
+    # BALANÇO VETORIZADO
+    # ==============================================
+
+    def balance_model(self):
+        """Modelo matricial do fluxograma (compilado na primeira chamada)"""
+        if self._balance_model is None:
+            # numpy só é necessário para o cálculo vetorizado
+            from .balance import BalanceModel
+            self._balance_model = BalanceModel(self.flowsheet)
+        return self._balance_model
+
+    @traced
+    def fast_exergy_analysis(self):
+        """Análise completa sem impressões, via produto matriz-vetor
+
+        Retorna o mesmo dicionário de full_exergy_analysis(). Nós ausentes
+        valem zero, como em get_node_value.
+        """
+        self.prefetch_nodes()
+        model = self.balance_model()
+        ex, d = self._balance_vectors(model)
+        self.balance_result = model.evaluate(ex, d, self.T0)
+        self.results = self.balance_result.as_results()
+        return self.results
+
+    def _balance_vectors(self, model):
+        """Vetores ex e d a partir dos valores já lidos (cache e tabela de correntes)"""
+        ex, d = model.vectors_from_values(self._node_cache)
+        if self.stream_table is not None and "EXERGYFL" in self.stream_table.property_index:
+            ex = self.stream_table.take(model.streams, default=ex)
+        return ex, d
+
+    @traced
+    def t0_sweep(self, T0_values):
+        """Perdas e eficiências para vários estados de referência T0 (K)
+
+        Exergias das correntes e calores dos blocos são lidos uma única vez
+        (prefetch_nodes, se ainda não houver valores em cache); cada T0 só
+        muda os fatores de Carnot, avaliados em uma passagem vetorizada. O
+        resultado tem um eixo à esquerda com um T0 por posição:
+        result.as_results(i) corresponde a T0_values[i].
+
+        As exergias das correntes são as do Aspen (EXERGYFL, no estado de
+        referência configurado na simulação); a varredura afeta os termos de
+        calor.
+        """
+        if not self._node_cache and self.stream_table is None:
+            self.prefetch_nodes()
+        model = self.balance_model()
+        ex, d = self._balance_vectors(model)
+        return model.evaluate_t0_sweep(ex, d, T0_values)
+
+    def evaluate_scenarios(self, stream_exergy, duties=None):
+        """Perdas e eficiências de vários cenários de uma vez (ver BalanceModel)"""
+        return self.balance_model().evaluate_scenarios(stream_exergy, duties, self.T0)
+
+    # ==============================================
+    # CÁLCULOS DE EXERGIA TÉRMICA
+    # ==============================================
+
+    def heat_exergy(self, heat_duty, block, kind):
+        """Exergia de uma troca de calor: |Q| * (1 - T0/T)
+
+        kind é o tipo de troca (cooler, furnace, flash, reactor, condenser,
+        reboiler, compressor); a temperatura de fronteira T vem do fluxograma,
+        com a do bloco prevalecendo. Aceita escalares ou arrays NumPy.
+        """
+        return carnot_heat_exergy(heat_duty, self.flowsheet.boundary_temperature(block, kind), self.T0)
+
+    # ==============================================
+    # ANÁLISES POR TIPO DE EQUIPAMENTO
+    # ==============================================
+
+    @traced
+    def calculate_pumps_exergy_loss(self):
+        """Calcula perda exergética em bombas"""
+        pumps = self.flowsheet.equipment.get("pumps", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE BOMBAS")
+        print("="*50)
+
+        for pump in pumps:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(pump, "input")
+                output_ex, output_streams = self.get_streams_exergy(pump, "output")
+                power = self.get_equipment_power(pump['name'])
+
+                loss = input_ex + power - output_ex
+                efficiency = (1 - (loss / (input_ex + power))) * 100 if (input_ex + power) > 0 else 0
+
+                print(f"\nBomba {pump['name']}:")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                print(f"  Potência: {power:.2f} kW")
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise da bomba {pump['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em bombas: {total_loss:.2f} kW")
+        self.results['bombas'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_compressors_exergy_loss(self):
+        """Calcula perda exergética em compressores"""
+        compressors = self.flowsheet.equipment.get("compressors", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE COMPRESSORES")
+        print("="*50)
+
+        for comp in compressors:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(comp, "input")
+                output_ex, output_streams = self.get_streams_exergy(comp, "output")
+                
+                if comp['type'] == "standard":
+                    # Compressores padrão - apenas potência
+                    power = self.get_equipment_power(comp['name'])
+                    heat_duty = 0.0
+                    exergy_heat = 0.0
+                    loss = input_ex + power - output_ex
+                    
+                    print(f"\nCompressor {comp['name']} (Standard):")
+                    print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                    print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                    print(f"  Potência: {power:.2f} kW")
+                    print(f"  Calor trocado: {heat_duty:.2f} kW")
+                    
+                else:
+                    # Compressores M-COMPR - potência e calor
+                    power = self.get_equipment_power(comp['name'])
+                    heat_duty = self.get_compressor_heat(comp['name'])
+                    exergy_heat = self.heat_exergy(heat_duty, comp['name'], "compressor")
+                    
+                    # Para compressores, o calor é geralmente removido (negativo)
+                    if heat_duty < 0:
+                        # Calor removido: não é entrada, mas sim uma saída de exergia
+                        loss = input_ex + power - output_ex - exergy_heat
+                    else:
+                        # Calor fornecido: entrada de exergia
+                        loss = input_ex + power + exergy_heat - output_ex
+                    
+                    print(f"\nCompressor {comp['name']} (M-COMPR):")
+                    print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                    print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                    print(f"  Potência: {power:.2f} kW")
+                    print(f"  Calor trocado: {heat_duty:.2f} kW")
+                    print(f"  Exergia do calor: {exergy_heat:.2f} kW")
+                    if heat_duty < 0:
+                        print("  → Calor REMOVIDO (saída do sistema)")
+                    else:
+                        print("  → Calor FORNECIDO (entrada no sistema)")
+
+                efficiency = (1 - (loss / (input_ex + power))) * 100 if (input_ex + power) > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do compressor {comp['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em compressores: {total_loss:.2f} kW")
+        self.results['compressores'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_coolers_exergy_loss(self):
+        """Calcula perda exergética em resfriadores"""
+        coolers = self.flowsheet.equipment.get("coolers", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE RESFRIADORES")
+        print("="*50)
+
+        for cooler in coolers:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(cooler, "input")
+                output_ex, output_streams = self.get_streams_exergy(cooler, "output")
+                heat_duty = self.get_heat_duty(cooler['name'])
+
+                exergy_heat = self.heat_exergy(heat_duty, cooler['name'], "cooler")
+                loss = input_ex - output_ex - exergy_heat
+                if self.flowsheet.options["cooler_efficiency_basis"] == "net":
+                    basis = input_ex - exergy_heat
+                else:
+                    basis = input_ex
+                efficiency = (1 - (loss / basis)) * 100 if basis > 0 else 0
+
+                print(f"\nResfriador {cooler['name']}:")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                print(f"  Calor removido: {heat_duty:.2f} kW")
+                print(f"  Exergia do calor: {exergy_heat:.2f} kW")
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do resfriador {cooler['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em resfriadores: {total_loss:.2f} kW")
+        self.results['resfriadores'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_mixers_exergy_loss(self):
+        """Calcula perda exergética em misturadores"""
+        mixers = self.flowsheet.equipment.get("mixers", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE MISTURADORES")
+        print("="*50)
+
+        for mixer in mixers:
+            try:
+                print(f"\nMisturador {mixer['name']}:")
+
+                input_ex = 0.0
+                for stream in mixer['inputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Entrada ({stream}): {stream_ex:.2f} kW")
+                    input_ex += stream_ex
+
+                output_ex, output_streams = self.get_streams_exergy(mixer, "output")
+                print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+
+                loss = input_ex - output_ex
+                efficiency = (1 - (loss / input_ex)) * 100 if input_ex > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do misturador {mixer['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em misturadores: {total_loss:.2f} kW")
+        self.results['misturadores'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_valves_exergy_loss(self):
+        """Calcula perda exergética em válvulas"""
+        valves = self.flowsheet.equipment.get("valves", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE VÁLVULAS")
+        print("="*50)
+
+        for valve in valves:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(valve, "input")
+                output_ex, output_streams = self.get_streams_exergy(valve, "output")
+
+                loss = input_ex - output_ex
+                efficiency = (1 - (loss / input_ex)) * 100 if input_ex > 0 else 0
+
+                print(f"\nVálvula {valve['name']}:")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise da válvula {valve['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em válvulas: {total_loss:.2f} kW")
+        self.results['valvulas'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_separators_exergy_loss(self):
+        """Calcula perda exergética em separadores"""
+        separators = self.flowsheet.equipment.get("separators", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANALISE EXERGETICA DE SEPARADORES")
+        print("="*50)
+
+        for separator in separators:
+            try:
+                print(f"\nSeparador {separator['name']}:")
+
+                input_ex, input_streams = self.get_streams_exergy(separator, "input")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+
+                output_ex = 0.0
+                for stream in separator['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+                    output_ex += stream_ex
+
+                loss = input_ex - output_ex
+                efficiency = (1 - (loss / input_ex)) * 100 if input_ex > 0 else 0
+
+                print(f"  Perda exergetica: {loss:.2f} kW")
+                print(f"  Eficiencia: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na analise do separador {separator['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em separadores: {total_loss:.2f} kW")
+        self.results['separadores'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_furnaces_exergy_loss(self):
+        """Calcula perda exergética em fornos"""
+        furnaces = self.flowsheet.equipment.get("furnaces", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE FORNOS")
+        print("="*50)
+
+        for furnace in furnaces:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(furnace, "input")
+                output_ex, output_streams = self.get_streams_exergy(furnace, "output")
+                heat_supplied = self.get_heat_duty(furnace['name'])
+
+                exergy_heat = self.heat_exergy(heat_supplied, furnace['name'], "furnace")
+                loss = input_ex + exergy_heat - output_ex
+                efficiency = (1 - (loss / (input_ex + exergy_heat))) * 100 if (input_ex + exergy_heat) > 0 else 0
+
+                print(f"\nForno {furnace['name']}:")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                print(f"  Saída ({output_streams}): {output_ex:.2f} kW")
+                print(f"  Calor fornecido: {heat_supplied:.2f} kW")
+                print(f"  Exergia do calor: {exergy_heat:.2f} kW")
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do forno {furnace['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em fornos: {total_loss:.2f} kW")
+        self.results['fornos'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_heat_exchanger_exergy_loss(self):
+        """Calcula perda exergética em trocador de calor HEAT-X"""
+        heat_exchangers = self.flowsheet.equipment.get("heat_exchangers", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE TROCADOR DE CALOR")
+        print("="*50)
+
+        for exchanger in heat_exchangers:
+            try:
+                print(f"\nTrocador de Calor {exchanger['name']}:")
+
+                input_ex = 0.0
+                for stream in exchanger['inputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Entrada ({stream}): {stream_ex:.2f} kW")
+                    input_ex += stream_ex
+
+                output_ex = 0.0
+                for stream in exchanger['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+                    output_ex += stream_ex
+
+                loss = input_ex - output_ex
+                efficiency = (1 - (loss / input_ex)) * 100 if input_ex > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do trocador de calor {exchanger['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em trocador de calor: {total_loss:.2f} kW")
+        self.results['trocador_calor'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_flash_tanks_exergy_loss(self):
+        """Calcula perda exergética em tanques flash"""
+        flash_tanks = self.flowsheet.equipment.get("flash_tanks", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE TANQUES FLASH")
+        print("="*50)
+
+        for tank in flash_tanks:
+            try:
+                input_ex, input_streams = self.get_streams_exergy(tank, "input")
+                heat_duty = self.get_flash_heat_duty(tank['name'])
+                exergy_heat = self.heat_exergy(heat_duty, tank['name'], "flash")
+
+                output_ex = 0.0
+                for stream in tank['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    output_ex += stream_ex
+
+                loss = input_ex + exergy_heat - output_ex
+                efficiency = (1 - (loss / (input_ex + exergy_heat))) * 100 if (input_ex + exergy_heat) > 0 else 0
+
+                print(f"\nTanque Flash {tank['name']}:")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+                print(f"  Calor trocado: {heat_duty:.2f} kW")
+                print(f"  Exergia do calor: {exergy_heat:.2f} kW")
+
+                for stream in tank['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do tanque flash {tank['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em tanques flash: {total_loss:.2f} kW")
+        self.results['tanques_flash'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_splitters_exergy_loss(self):
+        """Calcula perda exergética em splitters"""
+        splitters = self.flowsheet.equipment.get("splitters", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE SPLITTERS")
+        print("="*50)
+
+        for splitter in splitters:
+            try:
+                print(f"\nSplitter {splitter['name']}:")
+
+                input_ex, input_streams = self.get_streams_exergy(splitter, "input")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+
+                output_ex = 0.0
+                for stream in splitter['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+                    output_ex += stream_ex
+
+                loss = input_ex - output_ex
+                efficiency = (1 - (loss / input_ex)) * 100 if input_ex > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do splitter {splitter['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em splitters: {total_loss:.2f} kW")
+        self.results['splitters'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_columns_exergy_loss(self):
+        """Calcula perda exergética em colunas de destilação"""
+        columns = self.flowsheet.equipment.get("columns", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE COLUNAS")
+        print("="*50)
+
+        for column in columns:
+            try:
+                print(f"\nColuna {column['name']}:")
+
+                input_ex, input_streams = self.get_streams_exergy(column, "input")
+                print(f"  Entrada ({input_streams}): {input_ex:.2f} kW")
+
+                output_ex = 0.0
+                for stream in column['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+                    output_ex += stream_ex
+
+                reboiler_duty = self.get_reboiler_duty(column['name'])
+                condenser_duty = self.get_condenser_duty(column['name'])
+
+                exergy_reboiler = self.heat_exergy(reboiler_duty, column['name'], "reboiler")
+                exergy_condenser = self.heat_exergy(condenser_duty, column['name'], "condenser")
+
+                total_exergy_heat = exergy_reboiler + exergy_condenser
+
+                print(f"  Reboiler: {reboiler_duty:.2f} kW")
+                print(f"  Exergia do reboiler: {exergy_reboiler:.2f} kW")
+                print(f"  Condensador: {condenser_duty:.2f} kW")
+                print(f"  Exergia do condensador: {exergy_condenser:.2f} kW")
+                print(f"  Exergia térmica líquida: {total_exergy_heat:.2f} kW")
+
+                loss = input_ex + total_exergy_heat - output_ex
+                efficiency = (1 - (loss / (input_ex + total_exergy_heat))) * 100 if (input_ex + total_exergy_heat) > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise da coluna {column['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em colunas: {total_loss:.2f} kW")
+        self.results['colunas'] = total_loss
+        return total_loss
+
+    @traced
+    def calculate_reactors_exergy_loss(self):
+        """Calcula perda exergética em reatores"""
+        reactors = self.flowsheet.equipment.get("reactors", ())
+
+        total_loss = 0.0
+        print("\n" + "="*50)
+        print("ANÁLISE EXERGÉTICA DE REATORES")
+        print("="*50)
+
+        for reactor in reactors:
+            try:
+                print(f"\nReator {reactor['name']}:")
+
+                input_ex = 0.0
+                for stream in reactor['inputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Entrada ({stream}): {stream_ex:.2f} kW")
+                    input_ex += stream_ex
+
+                output_ex = 0.0
+                for stream in reactor['outputs']:
+                    stream_ex = self.get_stream_exergy(stream)
+                    print(f"  Saída ({stream}): {stream_ex:.2f} kW")
+                    output_ex += stream_ex
+
+                heat_reaction = self.get_heat_duty(reactor['name'])
+                exergy_heat = self.heat_exergy(heat_reaction, reactor['name'], "reactor")
+
+                print(f"  Calor de reação: {heat_reaction:.2f} kW")
+                print(f"  Exergia do calor: {exergy_heat:.2f} kW")
+
+                loss = input_ex - output_ex - exergy_heat
+                efficiency = (1 - (loss / (input_ex - exergy_heat))) * 100 if (input_ex - exergy_heat) > 0 else 0
+
+                print(f"  Perda exergética: {loss:.2f} kW")
+                print(f"  Eficiência: {efficiency:.2f}%")
+                total_loss += max(loss, 0)
+
+            except Exception as e:
+                print(f"Erro na análise do reator {reactor['name']}: {e}")
+                continue
+
+        print(f"\nTotal de perda em reatores: {total_loss:.2f} kW")
+        self.results['reatores'] = total_loss
+        return total_loss
+
+    # ==============================================
+    # SISTEMA CORRIGIDO DE CÁLCULO DE EXERGIA TOTAL
+    # ==============================================
+
+    @traced
+    def calculate_total_work_and_heat_exergy(self):
+        """Calcula o total de exergia de trabalho e calor fornecidos à planta"""
+        total_work_exergy = 0.0
+        total_heat_exergy_input = 0.0  # Exergia térmica que ENTRA no sistema
+        total_heat_exergy_output = 0.0  # Exergia térmica que SAI do sistema
+
+        print("\n" + "="*60)
+        print("CÁLCULO DE EXERGIA DE TRABALHO E CALOR")
+        print("="*60)
+
+        # Exergia de trabalho (bombas e compressores) - SEMPRE ENTRADA
+        print("\nEXERGIA DE TRABALHO (ENTRADA):")
+
+        # Bombas
+        work = self.flowsheet.work
+        heat_input = self.flowsheet.heat_input
+        heat_output = self.flowsheet.heat_output
+
+        pumps = work["pumps"]
+        for pump in pumps:
+            power = self.get_equipment_power(pump)
+            total_work_exergy += power
+            print(f"  {pump}: {power:.2f} kW")
+
+        # Compressores
+        compressors = work["compressors"]
+        for comp in compressors:
+            power = self.get_equipment_power(comp)
+            total_work_exergy += power
+            print(f"  {comp}: {power:.2f} kW")
+
+        print(f"TOTAL EXERGIA DE TRABALHO: {total_work_exergy:.2f} kW")
+
+        # Exergia de calor - SEPARAR ENTRE ENTRADA E SAÍDA
+        print("\nEXERGIA DE CALOR:")
+
+        # EXERGIA TÉRMICA DE ENTRADA (apenas calor fornecido - positivo)
+        print("\n  EXERGIA TÉRMICA DE ENTRADA:")
+        furnaces = heat_input["furnaces"]
+        for furnace in furnaces:
+            heat_duty = self.get_heat_duty(furnace)
+            if heat_duty > 0:  # Calor fornecido ao sistema
+                exergy_heat = self.heat_exergy(heat_duty, furnace, "furnace")
+                total_heat_exergy_input += exergy_heat
+                print(f"    {furnace}: {exergy_heat:.2f} kW (Calor: {heat_duty:.2f} kW)")
+
+        # Reboiler da coluna - CALOR FORNECIDO (ENTRADA)
+        for column in heat_input["reboilers"]:
+            reboiler_duty = self.get_reboiler_duty(column)
+            if reboiler_duty > 0:
+                exergy_reboiler = self.heat_exergy(reboiler_duty, column, "reboiler")
+                total_heat_exergy_input += exergy_reboiler
+                print(f"    Reboiler {column}: {exergy_reboiler:.2f} kW (Calor: {reboiler_duty:.2f} kW)")
+
+        # Tanques flash - CALOR FORNECIDO (ENTRADA)
+        flash_tanks = heat_input["flash_tanks"]
+        for flash in flash_tanks:
+            heat_duty = self.get_flash_heat_duty(flash)
+            if heat_duty > 0:
+                exergy_heat = self.heat_exergy(heat_duty, flash, "flash")
+                total_heat_exergy_input += exergy_heat
+                print(f"    {flash}: {exergy_heat:.2f} kW (Calor: {heat_duty:.2f} kW)")
+
+        # EXERGIA TÉRMICA DE SAÍDA (calor removido - negativo)
+        print("\n  EXERGIA TÉRMICA DE SAÍDA:")
+
+        # Compressores M-COMPR - calor REMOVIDO (SAÍDA) - CORREÇÃO APLICADA
+        m_compressors = heat_output["compressors"]
+        for comp in m_compressors:
+            heat_duty = self.get_compressor_heat(comp)
+            if heat_duty < 0:  # Calor removido do compressor (SAÍDA)
+                exergy_heat = self.heat_exergy(heat_duty, comp, "compressor")
+                total_heat_exergy_output += exergy_heat
+                print(f"    {comp}: {exergy_heat:.2f} kW (Calor REMOVIDO: {heat_duty:.2f} kW)")
+
+        # Reatores - calor REMOVIDO (SAÍDA) - CORREÇÃO APLICADA
+        reactors = heat_output["reactors"]
+        for reactor in reactors:
+            heat_duty = self.get_heat_duty(reactor)
+            if heat_duty < 0:  # Calor removido do reator (SAÍDA)
+                exergy_heat = self.heat_exergy(heat_duty, reactor, "reactor")
+                total_heat_exergy_output += exergy_heat
+                print(f"    {reactor}: {exergy_heat:.2f} kW (Calor REMOVIDO: {heat_duty:.2f} kW)")
+
+        # Resfriadores - CALOR REMOVIDO (SAÍDA)
+        coolers = heat_output["coolers"]
+        for cooler in coolers:
+            heat_duty = self.get_heat_duty(cooler)
+            if heat_duty < 0:  # Calor removido do sistema
+                exergy_heat = self.heat_exergy(heat_duty, cooler, "cooler")
+                total_heat_exergy_output += exergy_heat
+                print(f"    {cooler}: {exergy_heat:.2f} kW (Calor: {heat_duty:.2f} kW)")
+
+        # Condensador da coluna - CALOR REMOVIDO (SAÍDA)
+        for column in heat_output["condensers"]:
+            condenser_duty = self.get_condenser_duty(column)
+            if condenser_duty < 0:
+                exergy_condenser = self.heat_exergy(condenser_duty, column, "condenser")
+                total_heat_exergy_output += exergy_condenser
+                print(f"    Condensador {column}: {exergy_condenser:.2f} kW (Calor: {condenser_duty:.2f} kW)")
+
+        print(f"\nTOTAL EXERGIA DE CALOR DE ENTRADA: {total_heat_exergy_input:.2f} kW")
+        print(f"TOTAL EXERGIA DE CALOR DE SAÍDA: {total_heat_exergy_output:.2f} kW")
+
+        return total_work_exergy, total_heat_exergy_input, total_heat_exergy_output
+
+    @traced
+    def full_exergy_analysis(self):
+        """Executa análise exergética completa"""
+        print("\n" + "="*60)
+        print("ANÁLISE EXERGÉTICA COMPLETA")
+        print("="*60)
+
+        self.results = {}
+        # A telemetria exportada ao final cobre apenas esta análise
+        self.telemetry.reset()
+        try:
+            # Todas as leituras do Aspen acontecem aqui; o restante usa o cache
+            self.prefetch_nodes()
+
+            input_streams = self.flowsheet.input_streams
+
+            total_input_exergy = 0.0
+            print("\nEXERGIA DE ENTRADA (CORRENTES):")
+            for stream in input_streams:
+                ex = self.get_stream_exergy(stream)
+                print(f"  {stream}: {ex:.2f} kW")
+                total_input_exergy += ex
+            print(f"TOTAL: {total_input_exergy:.2f} kW")
+
+            for category in self.flowsheet.categories():
+                getattr(self, self.CATEGORY_METHODS[category])()
+
+            # CÁLCULO CORRIGIDO: Incluir exergias de trabalho e calor separadamente
+            total_work_exergy, total_heat_exergy_input, total_heat_exergy_output = self.calculate_total_work_and_heat_exergy()
+            balance_start = self.tracer.start("balanco_final")
+
+            # Calcular exergia total de entrada (correntes + trabalho + calor de entrada)
+            total_input_exergy_with_work_heat = total_input_exergy + total_work_exergy + total_heat_exergy_input
+
+            output_streams = self.flowsheet.output_streams
+            total_output_exergy = 0.0
+            print("\nEXERGIA DE SAÍDA (CORRENTES):")
+            for stream in output_streams:
+                ex = self.get_stream_exergy(stream)
+                print(f"  {stream}: {ex:.2f} kW")
+                total_output_exergy += ex
+
+            # Calcular exergia total de saída (correntes + calor de saída)
+            total_output_exergy_with_heat = total_output_exergy + total_heat_exergy_output
+
+            options = self.flowsheet.options
+            total_loss_equipamentos = sum(self.results.values())
+            if options["balance"] == "plant":
+                # Ex,loss = Ex,in - Ex,out, com trabalho e calor já separados
+                # entre entrada e saída
+                total_loss = total_input_exergy_with_work_heat - total_output_exergy_with_heat
+            else:
+                total_loss = total_loss_equipamentos
+
+            # Cálculo da eficiência considerando TODAS as formas de energia
+            if total_input_exergy_with_work_heat > 0:
+                efficiency_complete = (1 - (total_loss / total_input_exergy_with_work_heat)) * 100
+            else:
+                efficiency_complete = 0.0
+
+            # Cálculo da eficiência tradicional (apenas correntes)
+            if total_input_exergy > 0:
+                if options["traditional_efficiency"] == "output_over_input_streams":
+                    efficiency_traditional = (total_output_exergy / total_input_exergy) * 100
+                else:
+                    efficiency_traditional = (1 - (total_loss / total_input_exergy)) * 100
+            else:
+                efficiency_traditional = 0.0
+
+            print("\n" + "="*60)
+            print("RESUMO FINAL - BALANÇO EXERGÉTICO COMPLETO")
+            print("="*60)
+            print("\nEXERGIA DE ENTRADA TOTAL:")
+            print(f"  Correntes: {total_input_exergy:.2f} kW")
+            print(f"  Trabalho: {total_work_exergy:.2f} kW")
+            print(f"  Calor fornecido: {total_heat_exergy_input:.2f} kW")
+            print(f"  TOTAL ENTRADA: {total_input_exergy_with_work_heat:.2f} kW")
+
+            print("\nEXERGIA DE SAÍDA TOTAL:")
+            print(f"  Correntes: {total_output_exergy:.2f} kW")
+            print(f"  Calor removido: {total_heat_exergy_output:.2f} kW")
+            print(f"  TOTAL SAÍDA: {total_output_exergy_with_heat:.2f} kW")
+
+            if options["balance"] == "plant":
+                print(f"\nPERDA EXERGÉTICA TOTAL DA PLANTA: {total_loss:.2f} kW")
+                print("(Calculada como: Entrada Total - Saída Total)")
+            else:
+                print(f"\nPERDA EXERGÉTICA TOTAL: {total_loss:.2f} kW")
+
+            # Verificação do balanço
+            balance_difference = total_input_exergy_with_work_heat - total_output_exergy_with_heat - total_loss
+            print(f"VERIFICAÇÃO DO BALANÇO: {balance_difference:.2f} kW (deve ser próximo de zero)")
+
+            print("\nEFICIÊNCIAS:")
+            print(f"  Eficiência exergética tradicional (apenas correntes): {efficiency_traditional:.2f}%")
+            print(f"  Eficiência exergética completa: {efficiency_complete:.2f}%")
+
+            print("\nDETALHAMENTO DAS PERDAS POR EQUIPAMENTO:")
+            for equipment, loss in self.results.items():
+                percentual = (loss / total_loss_equipamentos * 100) if total_loss_equipamentos > 0 else 0
+                print(f"  {equipment}: {loss:.2f} kW ({percentual:.1f}%)")
+
+            # Adicionar resultados ao dicionário
+            self.results['exergia_trabalho_total'] = total_work_exergy
+            self.results['exergia_calor_entrada'] = total_heat_exergy_input
+            self.results['exergia_calor_saida'] = total_heat_exergy_output
+            self.results['exergia_entrada_total'] = total_input_exergy_with_work_heat
+            self.results['exergia_saida_total'] = total_output_exergy_with_heat
+            if options["balance"] == "plant":
+                self.results['perda_total_planta'] = total_loss
+            self.results['eficiencia_tradicional'] = efficiency_traditional
+            self.results['eficiencia_completa'] = efficiency_complete
+            self.results['balanco_diferenca'] = balance_difference
+            self.tracer.finish("balanco_final", balance_start)
+
+            report = self.missing_nodes_report()
+            if report:
+                print("\n" + report)
+            if self.telemetry_path:
+                self.export_telemetry(self.telemetry_path)
+
+            return self.results
+
+        except MissingNodesError:
+            # Modo estrito: a análise não prossegue sem os nós exigidos
+            raise
+        except Exception as e:
+            print(f"Erro na análise completa: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+
+def total_loss(results):
+    """Perda exergética total de um dicionário de resultados, como no resumo da análise
+
+    No balanço da planta é perda_total_planta; no balanço por equipamentos, a
+    soma das perdas das categorias (que já desconsideram perdas negativas).
+    None se os resultados não trazem nenhuma das duas.
+    """
+    if 'perda_total_planta' in results:
+        return results['perda_total_planta']
+    losses = [results[key] for key in RESULT_KEYS.values() if key in results]
+    return sum(losses) if losses else None
+
+
+def print_results(analyzer, results):
+    """Mostra os resultados finais e a estatística do cache de nós"""
+    if results:
+        print("\nAnálise concluída com sucesso!")
+        print("Resultados finais:", results)
+
+    stats = analyzer.cache_stats()
+    print(f"Cache de nós: {stats['acertos']} acertos, {stats['falhas']} leituras na fonte de dados "
+          f"({stats['taxa_acerto']:.1f}% de acerto)")
+
+
+def print_t0_sweep(analyzer, T0_values):
+    """Tabela de perda total e eficiências para cada T0 (K)"""
+    result = analyzer.t0_sweep(T0_values)
+    print(f"\nVarredura de T0 ({len(result.T0)} valores, sem nova consulta ao Aspen):")
+    print(f"{'T0 (K)':>9} {'perdas':>14} {'ef. completa':>13} {'ef. tradicional':>16}")
+    for i, T0 in enumerate(result.T0):
+        results = result.as_results(i)
+        print(f"{T0:>9.2f} {total_loss(results):>14.2f} {results['eficiencia_completa']:>12.2f}% "
+              f"{results['eficiencia_tradicional']:>15.2f}%")
+    return result
+
+
+def run_flowsheet(flowsheet, args, snapshot_path=None, result_cache=None):
+    """Executa a análise de uma variante, online (Aspen) ou offline
+
+    Com result_cache, uma análise já feita para o mesmo .apw, fluxograma e
+    T0 volta do cache antes de abrir o Aspen.
+    """
+    print("\n" + "#"*60)
+    print(f"FLUXOGRAMA: {flowsheet.name} - {flowsheet.description}")
+    print("#"*60)
+    for warning in flowsheet.warnings:
+        print(f"AVISO: {warning}")
+
+    telemetry_path = _flowsheet_output(args.telemetria, flowsheet)
+    trace_path = _flowsheet_output(args.trace, flowsheet)
+
+    offline_backend = None
+    if snapshot_path:
+        offline_backend = SnapshotBackend(snapshot_path)
+    elif args.csv:
+        offline_backend = CSVBackend(*args.csv)
+
+    if offline_backend is not None:
+        analyzer = AspenAnalyzer(flowsheet, backend=offline_backend, strict=args.estrito)
+        _configure_analyzer(analyzer, args, telemetry_path, trace_path)
+        print(f"Usando fonte offline: {offline_backend.description}")
+        if args.topologia:
+            _apply_topology(analyzer, args)
+        results = analyzer.full_exergy_analysis()
+        print_results(analyzer, results)
+        if results and args.varrer_t0:
+            print_t0_sweep(analyzer, args.varrer_t0)
+        if args.salvar_snapshot:
+            analyzer.save_snapshot(args.salvar_snapshot)
+        if trace_path:
+            analyzer.export_trace(trace_path)
+        return results
+
+    backend = CachedBackend(args.cache_nos) if args.cache_nos else None
+    analyzer = AspenAnalyzer(flowsheet, backend=backend, strict=args.estrito)
+    _configure_analyzer(analyzer, args, telemetry_path, trace_path)
+    file_path = args.arquivo or flowsheet.aspen_file
+
+    key = _result_cache_key(analyzer, args, result_cache, file_path)
+    if key is not None:
+        entry = result_cache.get(key)
+        if entry is not None and not (args.estrito and entry["ausentes"]):
+            return _cached_results(analyzer, entry, args)
+
+    results = None
+    if analyzer.connect_to_aspen(file_path):
+        try:
+            outcome = analyzer.run_outcome
+            if outcome is not None and not outcome.converged:
+                print(f"AVISO: {outcome.describe()}; os resultados podem não corresponder às entradas")
+                if args.estrito:
+                    print("Modo estrito: análise cancelada")
+                    return None
+            if backend is not None and args.invalidar_cache:
+                removed = backend.invalidate()
+                print(f"Cache persistente: {removed} nós descartados para {file_path}")
+            if args.topologia:
+                _apply_topology(analyzer, args)
+            if args.salvar_snapshot:
+                analyzer.save_snapshot(args.salvar_snapshot)
+            results = analyzer.full_exergy_analysis()
+            print_results(analyzer, results)
+            if results and key is not None and (outcome is None or outcome.converged):
+                result_cache.put(key, results, _analyzed_nodes(analyzer), analyzer.missing_nodes(),
+                                 metadata={'fluxograma': flowsheet.name, 'arquivo': file_path})
+            if results and args.varrer_t0:
+                print_t0_sweep(analyzer, args.varrer_t0)
+        except MissingNodesError:
+            raise
+        except Exception as e:
+            print(f"Erro durante a análise: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            analyzer.close_connection()
+            if backend is not None:
+                print(f"Cache persistente: {backend.store_hits} nós do banco, "
+                      f"{backend.store_misses} lidos do Aspen")
+    else:
+        print("Não foi possível conectar ao Aspen Plus")
+    if trace_path:
+        analyzer.export_trace(trace_path)
+    return results
+
+
+def _result_cache_key(analyzer, args, result_cache, file_path):
+    """Chave da análise no cache de resultados, ou None se ela não puder ser reaproveitada
+
+    O .apw é analisado como está (nenhuma entrada alterada). --topologia e
+    --salvar-snapshot precisam do documento aberto e não usam o cache.
+    """
+    if result_cache is None or args.topologia or args.salvar_snapshot:
+        return None
+    if not file_path or not os.path.exists(file_path):
+        return None
+    return result_key(analyzer.flowsheet, {}, analyzer.T0, archive_hash(file_path))
+
+
+def _analyzed_nodes(analyzer):
+    """Valores de nós por trás da análise (cache de nós e tabela de correntes)"""
+    nodes = dict(analyzer._node_cache)
+    if analyzer.stream_table is not None:
+        nodes.update(analyzer.stream_table.node_values())
+    return nodes
+
+
+def _cached_results(analyzer, entry, args):
+    """Mostra os resultados gravados no cache, sem abrir o Aspen"""
+    results = entry["resultados"]
+    print(f"Resultados reaproveitados do cache de resultados (gravados em {entry['criado_em']}); "
+          f"o Aspen não foi aberto")
+    print("Resultados finais:", results)
+    if args.varrer_t0:
+        # Os nós gravados com os resultados substituem a leitura do Aspen
+        offline = AspenAnalyzer(analyzer.flowsheet, backend=DictBackend(entry["nos"]))
+        print_t0_sweep(offline, args.varrer_t0)
+    return results
+
+
+def _configure_analyzer(analyzer, args, telemetry_path, trace_path):
+    """Opções de leitura e instrumentação comuns às execuções online e offline"""
+    analyzer.telemetry_path = telemetry_path
+    analyzer.use_stream_table = args.tabela_correntes
+    if trace_path:
+        analyzer.enable_tracing()
+
+
+def _apply_topology(analyzer, args):
+    """--topologia: analisa o fluxograma descoberto no Aspen (ou gravado no snapshot)"""
+    differences = analyzer.use_discovered_topology()
+    print(f"Topologia descoberta: {len(analyzer.topology.blocks)} blocos, "
+          f"{len(differences)} divergências com o fluxograma digitado")
+    for difference in differences:
+        print(f"  {difference}")
+    path = _flowsheet_output(args.exportar_fluxograma, analyzer.flowsheet)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(analyzer.flowsheet.spec, f, ensure_ascii=False, indent=2)
+        print(f"Fluxograma descoberto gravado em {path}")
+
+
+def _flowsheet_output(path, flowsheet):
+    """{fluxograma} no nome do arquivo separa as saídas de cada variante"""
+    return path.replace("{fluxograma}", flowsheet.name) if path else None
+
+
+def main(default_flowsheet=None, argv=None):
+    """Ponto de entrada comum dos scripts e de `python -m exergia`
+
+    Várias variantes podem ser analisadas em sequência no mesmo processo,
+    cada uma com seu próprio snapshot (na mesma ordem dos fluxogramas).
+    """
+    parser = argparse.ArgumentParser(description="Análise exergética da planta no Aspen Plus")
+    parser.add_argument("fluxogramas", nargs="*",
+                        help="variantes (nome em flowsheets/ ou arquivo JSON/TOML) a analisar")
+    parser.add_argument("--arquivo", help="arquivo .apw (substitui o definido no fluxograma)")
+    parser.add_argument("--snapshot", nargs="+", help="executa a análise a partir de snapshots, sem o Aspen Plus")
+    parser.add_argument("--csv", nargs="+", help="executa a análise a partir de tabelas CSV exportadas do Aspen")
+    parser.add_argument("--salvar-snapshot", help="grava um snapshot dos nós após a simulação")
+    parser.add_argument("--cache-nos", help="banco SQLite com os nós já lidos; evita abrir o Aspen "
+                                            "quando o .apw não mudou")
+    parser.add_argument("--invalidar-cache", action="store_true",
+                        help="descarta os nós do .apw atual no banco de --cache-nos")
+    parser.add_argument("--estrito", action="store_true",
+                        help="aborta antes dos cálculos se algum nó exigido estiver ausente")
+    parser.add_argument("--telemetria", help="grava contagens e latências de acesso aos nós em JSON "
+                                             "(use {fluxograma} no nome para várias variantes)")
+    parser.add_argument("--tabela-correntes", action="store_true",
+                        help="lê as exergias de todas as correntes em uma única passagem (requer numpy)")
+    parser.add_argument("--topologia", action="store_true",
+                        help="monta o fluxograma a partir das conexões dos blocos no Aspen (ou no snapshot)")
+    parser.add_argument("--exportar-fluxograma", help="grava em JSON o fluxograma descoberto com --topologia")
+    parser.add_argument("--varrer-t0", nargs="+", type=float, metavar="T0",
+                        help="reavalia perdas e eficiências para outros estados de referência (K), "
+                             "com os valores já lidos (requer numpy)")
+    parser.add_argument("--trace", help="grava os tempos de cada etapa como trace do Chrome/Perfetto "
+                                        "(use {fluxograma} no nome para várias variantes)")
+    parser.add_argument("--cache-resultados", metavar="DIRETORIO",
+                        help="reaproveita a análise já feita para o mesmo .apw, fluxograma e T0, "
+                             "sem abrir o Aspen (diretório compartilhável com a varredura)")
+    parser.add_argument("--cache-limite-mb", type=float, default=256,
+                        help="tamanho máximo do cache de resultados (MB)")
+    args = parser.parse_args(argv)
+
+    names = args.fluxogramas or ([default_flowsheet] if default_flowsheet else [])
+    if not names:
+        parser.error("informe ao menos um fluxograma")
+    if args.snapshot and len(args.snapshot) != len(names):
+        parser.error("informe um snapshot para cada fluxograma")
+
+    result_cache = None
+    if args.cache_resultados:
+        result_cache = ResultCache(args.cache_resultados, max_bytes=int(args.cache_limite_mb * 2**20))
+
+    all_results = {}
+    for i, name in enumerate(names):
+        flowsheet = load_flowsheet(name)
+        snapshot_path = args.snapshot[i] if args.snapshot else None
+        try:
+            all_results[flowsheet.name] = run_flowsheet(flowsheet, args, snapshot_path, result_cache)
+        except MissingNodesError as e:
+            parser.exit(1, f"ERRO ({flowsheet.name}): {e}\n")
+    return all_results
@@ -0,0 +1,257 @@
+"""Fontes de dados (backends) para os valores de nós da análise
+
+Todas as fontes seguem a mesma interface de Backend: connect/run/close
+controlam a simulação e read_node/read_nodes fornecem os valores. A leitura
+de um nó inexistente levanta KeyError; um nó existente sem valor retorna None.
+"""
+
+import csv
+import os
+
+from .nodes import BLOCK_VARIABLES, BLOCKS_COLLECTION, block_output_path, stream_exergy_path
+from .prefetch import fetch_nodes
+from .topology import discover_topology
+
+
+class Backend:
+    """Interface comum das fontes de valores de nós"""
+
+    description = "fonte de dados"
+
+    def connect(self, file_path):
+        """Abre o arquivo de simulação (sem efeito em fontes offline)"""
+
+    def run(self):
+        """Executa a simulação (sem efeito em fontes offline)"""
+
+    def start_run(self):
+        """Inicia a simulação sem aguardar o fim (por padrão, executa de forma síncrona)"""
+        self.run()
+
+    def is_running(self):
+        """Indica se a simulação iniciada por start_run() ainda está em execução"""
+        return False
+
+    def stop(self):
+        """Interrompe a simulação em andamento (sem efeito em fontes offline)"""
+
+    def close(self):
+        """Libera a fonte de dados"""
+
+    def read_node(self, node_path):
+        """Retorna o valor do nó (None se não tiver valor); KeyError se não existir"""
+        raise NotImplementedError
+
+    def reinit(self):
+        """Descarta as estimativas da última execução (sem efeito em fontes offline)"""
+
+    def is_healthy(self):
+        """Indica se a fonte ainda responde (usado pelo DocumentPool)"""
+        return True
+
+    def write_node(self, node_path, value):
+        """Altera o valor de um nó de entrada e retorna o anterior; KeyError se o nó não existir"""
+        raise NotImplementedError(f"A fonte '{self.description}' não aceita alterar entradas")
+
+    def read_topology(self):
+        """Retorna a Topology (grafo bloco/corrente) da simulação"""
+        raise NotImplementedError(f"A fonte '{self.description}' não fornece a topologia do fluxograma")
+
+    def read_nodes(self, node_paths):
+        """Retorna {caminho: valor} apenas para os nós existentes e com valor"""
+        values = {}
+        for node_path in node_paths:
+            try:
+                value = self.read_node(node_path)
+            except Exception:
+                continue
+            if value is not None:
+                values[node_path] = value
+        return values
+
+
+def _dispatch_aspen():
+    """Cria o Apwn.Document via COM
+
+    O pywin32 é importado somente aqui, quando uma conexão real é pedida, para
+    que o pacote carregue em qualquer plataforma e sem o custo da importação
+    em execuções offline.
+    """
+    try:
+        import win32com.client as win32
+    except ImportError as e:
+        raise RuntimeError("pywin32 não está disponível; use uma fonte offline "
+                           "(--snapshot ou --csv) fora do Windows") from e
+    return win32.Dispatch("Apwn.Document")
+
+
+class COMBackend(Backend):
+    """Documento do Aspen Plus acessado via COM (Apwn.Document)"""
+
+    description = "Aspen Plus"
+
+    def __init__(self, dispatch=None):
+        # dispatch permite fornecer outro objeto com a interface do Apwn.Document
+        self.dispatch = dispatch
+        self.document = None
+
+    def connect(self, file_path):
+        if self.dispatch is not None:
+            self.document = self.dispatch()
+        else:
+            self.document = _dispatch_aspen()
+        self.document.InitFromArchive2(os.path.abspath(file_path))
+
+    def run(self):
+        self.document.Engine.Run2()
+
+    def start_run(self):
+        self.document.Engine.Run2(True)
+
+    def is_running(self):
+        return bool(self.document.Engine.IsRunning)
+
+    def stop(self):
+        self.document.Engine.Stop()
+
+    def reinit(self):
+        self.document.Engine.Reinit()
+
+    def is_healthy(self):
+        return self.document is not None and self.document.Tree.FindNode(BLOCKS_COLLECTION) is not None
+
+    def write_node(self, node_path, value):
+        node = self.document.Tree.FindNode(node_path)
+        if node is None:
+            raise KeyError(node_path)
+        previous = node.Value
+        node.Value = value
+        return previous
+
+    def close(self):
+        if self.document:
+            self.document.Close()
+            self.document = None
+
+    def read_node(self, node_path):
+        node = self.document.Tree.FindNode(node_path)
+        if node is None:
+            raise KeyError(node_path)
+        value = getattr(node, 'Value', None)
+        return None if value is None else float(value)
+
+    def read_nodes(self, node_paths):
+        return fetch_nodes(self.document, node_paths)
+
+    def read_topology(self):
+        return discover_topology(self.document)
+
+
+class DictBackend(Backend):
+    """Valores de nós mantidos em memória ({caminho: valor})"""
+
+    description = "dicionário em memória"
+
+    def __init__(self, values=None, topology=None):
+        self.values = dict(values or {})
+        self.topology = topology
+
+    def read_node(self, node_path):
+        value = self.values[node_path]
+        return None if value is None else float(value)
+
+    def read_nodes(self, node_paths):
+        return {path: float(self.values[path]) for path in node_paths
+                if self.values.get(path) is not None}
+
+    def read_topology(self):
+        if self.topology is None:
+            return super().read_topology()
+        return self.topology
+
+
+# Rótulos aceitos para a linha de exergia em tabelas de correntes
+EXERGY_LABELS = ("EXERGYFL", "EXERGY FLOW", "EXERGIA", "FLUXO DE EXERGIA")
+
+
+def _parse_number(text, decimal_comma):
+    text = text.strip()
+    if not text:
+        return None
+    if decimal_comma and "," in text:
+        text = text.replace(".", "").replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _read_rows(csv_path):
+    """Lê o CSV detectando o separador (',', ';' ou tabulação)"""
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = [row for row in csv.reader(f, dialect) if any(cell.strip() for cell in row)]
+    # Com ';' ou tabulação como separador, a vírgula é o separador decimal
+    return rows, dialect.delimiter != ","
+
+
+def load_csv_values(csv_path):
+    """Converte um CSV exportado do Aspen em {caminho: valor}
+
+    São aceitos três leiautes, identificados pelo cabeçalho:
+      - lista de nós: colunas "caminho" (ou "path") e "valor" (ou "value");
+      - tabela de blocos: primeira coluna "bloco" (ou "block") e uma coluna
+        por variável (WNET, QNET, QCALC, REB_DUTY, COND_DUTY);
+      - tabela de correntes: uma coluna por corrente e uma linha de exergia
+        (EXERGYFL, "Exergy Flow", ...), como na Stream Table do Aspen.
+    """
+    rows, decimal_comma = _read_rows(csv_path)
+    if not rows:
+        return {}
+
+    header = [cell.strip() for cell in rows[0]]
+    lowered = [cell.lower() for cell in header]
+    values = {}
+
+    if ("caminho" in lowered or "path" in lowered) and ("valor" in lowered or "value" in lowered):
+        path_col = lowered.index("caminho") if "caminho" in lowered else lowered.index("path")
+        value_col = lowered.index("valor") if "valor" in lowered else lowered.index("value")
+        for row in rows[1:]:
+            if len(row) > max(path_col, value_col):
+                values[row[path_col].strip()] = _parse_number(row[value_col], decimal_comma)
+
+    elif lowered[0] in ("bloco", "block"):
+        for row in rows[1:]:
+            block = row[0].strip()
+            for col, variable in enumerate(header[1:], start=1):
+                if variable.upper() in BLOCK_VARIABLES and col < len(row):
+                    values[block_output_path(block, variable.upper())] = _parse_number(row[col], decimal_comma)
+
+    else:
+        streams = header[1:]
+        for row in rows[1:]:
+            if row[0].strip().upper() not in EXERGY_LABELS:
+                continue
+            for stream, cell in zip(streams, row[1:]):
+                if stream:
+                    values[stream_exergy_path(stream)] = _parse_number(cell, decimal_comma)
+
+    return values
+
+
+class CSVBackend(DictBackend):
+    """Valores de nós importados de um ou mais CSVs (tabelas de correntes/blocos)"""
+
+    description = "importação CSV"
+
+    def __init__(self, *csv_paths):
+        values = {}
+        for csv_path in csv_paths:
+            values.update(load_csv_values(csv_path))
+        super().__init__(values)
+        self.csv_paths = csv_paths
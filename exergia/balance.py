@@ -0,0 +1,422 @@
+"""Balanço exergético vetorizado baseado em matriz de incidência
+
+O fluxograma é compilado uma vez em matrizes esparsas (SparseRows):
+
+    perdas = A @ ex + B_abs(T0) @ |d| + B_sig(T0) @ d
+
+onde ex é o vetor de exergias das correntes (na ordem de Flowsheet.streams),
+d é o vetor de trabalhos e calores dos blocos (na ordem de BalanceModel.duties),
+A é a matriz de incidência equipamento x corrente (+1 entradas, -1 saídas) e
+B_abs/B_sig trazem os termos de trabalho e de calor (fator de Carnot
+1 - T0/T, com T em BalanceModel.duty_temp). Termos de calor em valor absoluto (resfriadores, fornos, flash,
+colunas, reatores) ficam em B_abs; o calor com sinal dos compressores
+resfriados e o trabalho ficam em B_sig. As mesmas regras de
+AspenAnalyzer.calculate_*_exergy_loss são reproduzidas, incluindo a base de
+cálculo das eficiências e o balanço global da planta.
+
+As operações usam o último eixo, de modo que ex e d podem ter dimensões
+adicionais à esquerda (vários cenários ao mesmo tempo).
+"""
+
+import numpy as np
+
+from .flowsheet import CATEGORIES
+from .heat import carnot_heat_exergy
+from .nodes import block_output_path, stream_exergy_path
+
+# Temperatura "infinita": fator de Carnot igual a 1 (termos de trabalho)
+WORK_TEMPERATURE = np.inf
+
+
+class BalanceResult:
+    """Resultado do balanço: arrays por equipamento, por categoria e da planta"""
+
+    def __init__(self, model, losses, efficiencies, category_losses, summary, T0=None):
+        self.model = model
+        self.T0 = T0                          # float, ou vetor (T0,) numa varredura
+        self.losses = losses                  # (..., equipamentos)
+        self.efficiencies = efficiencies      # (..., equipamentos), em %
+        self.category_losses = category_losses  # (..., categorias)
+        self.summary = summary                # {chave: array (...)}
+
+    @property
+    def n_scenarios(self):
+        """Número de cenários (None para uma avaliação simples)"""
+        return self.losses.shape[0] if self.losses.ndim > 1 else None
+
+    def equipment_losses(self, scenario=None):
+        """Lista de (equipamento, perda) de um cenário (ou da avaliação simples)"""
+        losses = self.losses if scenario is None else self.losses[scenario]
+        return [(name, float(loss)) for name, loss in zip(self.model.equipment_names, losses)]
+
+    def equipment_efficiencies(self, scenario=None):
+        """Lista de (equipamento, eficiência em %) de um cenário (ou da avaliação simples)"""
+        efficiencies = self.efficiencies if scenario is None else self.efficiencies[scenario]
+        return [(name, float(value)) for name, value in zip(self.model.equipment_names, efficiencies)]
+
+    def as_results(self, scenario=None):
+        """Dicionário no mesmo formato de AspenAnalyzer.full_exergy_analysis()"""
+        category_losses = self.category_losses if scenario is None else self.category_losses[scenario]
+        results = {key: float(value) for key, value in zip(self.model.result_keys, category_losses)}
+        for key, value in self.summary.items():
+            results[key] = float(value if scenario is None else value[scenario])
+        return results
+
+
+class SparseRows:
+    """Matriz esparsa linhas x colunas guardada como triplas (linha, coluna, coeficiente)
+
+    Cada equipamento toca poucas correntes e poucos termos de trabalho/calor;
+    as triplas ocupam memória proporcional ao número de conexões, e não a
+    linhas x colunas. O produto soma os termos de cada linha com
+    np.add.reduceat no último eixo, de modo que x pode ter eixos adicionais à
+    esquerda (cenários, T0).
+    """
+
+    def __init__(self, n_rows, rows, columns, values, n_columns=None):
+        order = np.argsort(np.asarray(rows, dtype=int), kind="stable")
+        self.n_rows = n_rows
+        self.n_columns = n_columns
+        self.rows = np.asarray(rows, dtype=int)[order]
+        self.columns = np.asarray(columns, dtype=int)[order]
+        self.values = np.asarray(values, dtype=float)[order]
+        # Linhas com ao menos um termo e a posição do primeiro termo de cada uma
+        self.present, self.starts = np.unique(self.rows, return_index=True)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def shape(self):
+        return (self.n_rows, self.n_columns)
+
+    def toarray(self):
+        """Matriz densa equivalente (para inspeção de fluxogramas pequenos)"""
+        dense = np.zeros(self.shape)
+        np.add.at(dense, (self.rows, self.columns), self.values)
+        return dense
+
+    def apply(self, x, values=None):
+        """(..., colunas) -> (..., linhas): soma de coeficiente * x[coluna] em cada linha
+
+        values: coeficientes no lugar de self.values, com eixos adicionais à
+        esquerda (por exemplo, um por T0)
+        """
+        values = self.values if values is None else values
+        terms = x[..., self.columns] * values
+        result = np.zeros(terms.shape[:-1] + (self.n_rows,))
+        if len(self.rows):
+            result[..., self.present] = np.add.reduceat(terms, self.starts, axis=-1)
+        return result
+
+
+class BalanceModel:
+    """Fluxograma compilado em matrizes para o cálculo vetorizado das perdas"""
+
+    def __init__(self, flowsheet):
+        self.flowsheet = flowsheet
+        self.streams = flowsheet.streams
+        self.stream_index = flowsheet.stream_index
+        self.duties = []        # [(bloco, variável)]
+        self.duty_index = {}
+        self._duty_temp = {}    # (bloco, variável) -> temperatura de fronteira (K)
+
+        rows = []               # (categoria, nome, entradas, saídas, termos de perda, termos da base)
+        for category in flowsheet.categories():
+            for item in flowsheet.equipment[category]:
+                inputs, outputs = flowsheet.equipment_streams(item)
+                loss_terms, basis_terms = self._terms(category, item)
+                rows.append((category, item["name"], inputs, outputs, loss_terms, basis_terms))
+
+        self.categories = flowsheet.categories()
+        self.result_keys = [dict(CATEGORIES)[category] for category in self.categories]
+        self.equipment_names = [row[1] for row in rows]
+        self.equipment_categories = [row[0] for row in rows]
+
+        n_rows = len(rows)
+        self._work_and_heat_terms()
+
+        # Triplas (equipamento, coluna, coeficiente) de cada matriz
+        triples = {name: ([], [], []) for name in ("A", "A_basis", "loss_abs", "loss_sig", "basis_abs", "basis_sig")}
+
+        def add(name, i, j, coefficient):
+            for values, value in zip(triples[name], (i, j, coefficient)):
+                values.append(value)
+
+        for i, (category, name, inputs, outputs, loss_terms, basis_terms) in enumerate(rows):
+            for stream in inputs:
+                add("A", i, self.stream_index[stream], 1.0)
+                add("A_basis", i, self.stream_index[stream], 1.0)
+            for stream in outputs:
+                add("A", i, self.stream_index[stream], -1.0)
+            for prefix, terms in (("loss", loss_terms), ("basis", basis_terms)):
+                for kind, duty, coefficient in terms:
+                    add(f"{prefix}_{kind}", i, self.duty_index[duty], coefficient)
+
+        n_streams, n_duties = len(self.streams), len(self.duties)
+        self.A = SparseRows(n_rows, *triples["A"], n_streams)
+        self.A_basis = SparseRows(n_rows, *triples["A_basis"], n_streams)
+        # Coeficientes dos termos de trabalho/calor, multiplicados por (1 - T0/T) na avaliação
+        self.loss_terms = {kind: SparseRows(n_rows, *triples[f"loss_{kind}"], n_duties) for kind in ("abs", "sig")}
+        self.basis_terms = {kind: SparseRows(n_rows, *triples[f"basis_{kind}"], n_duties) for kind in ("abs", "sig")}
+
+        # Categoria de cada equipamento, para os totais por categoria
+        self.groups = SparseRows(len(self.categories),
+                                 [self.categories.index(category) for category in self.equipment_categories],
+                                 range(n_rows), np.ones(n_rows), n_rows)
+
+        # Temperatura de fronteira de cada termo de calor (infinita para trabalho)
+        self.duty_temp = np.array([self._duty_temp.get(key, WORK_TEMPERATURE) for key in self.duties])
+
+        self.input_index = np.array([self.stream_index[s] for s in flowsheet.input_streams], dtype=int)
+        self.output_index = np.array([self.stream_index[s] for s in flowsheet.output_streams], dtype=int)
+
+    # ----------------------------------------------
+    # Compilação
+    # ----------------------------------------------
+
+    def _duty(self, block, variable):
+        key = (block, variable)
+        if key not in self.duty_index:
+            self.duty_index[key] = len(self.duties)
+            self.duties.append(key)
+        return key
+
+    def _heat(self, block, variable, kind):
+        """Termo de calor: registra o duty e retorna (duty, temperatura de fronteira)"""
+        key = self._duty(block, variable)
+        temperature = self.flowsheet.boundary_temperature(block, kind)
+        self._duty_temp.setdefault(key, temperature)
+        return key, temperature
+
+    def _terms(self, category, item):
+        """Termos (tipo, duty, coeficiente) da perda e da base da eficiência
+
+        A temperatura de fronteira de cada termo de calor fica em self.duty_temp.
+        """
+        name = item["name"]
+        options = self.flowsheet.options
+        loss, basis = [], []
+
+        if category == "pumps":
+            power = ("sig", self._duty(name, "WNET"), 1.0)
+            loss.append(power)
+            basis.append(power)
+        elif category == "compressors":
+            power = ("sig", self._duty(name, "WNET"), 1.0)
+            loss.append(power)
+            basis.append(power)
+            if item.get("type", "standard") != "standard":
+                # Calor removido (Q < 0) sai do sistema; fornecido entra: Q * (1 - T0/T)
+                heat, _ = self._heat(name, options["compressor_heat_variable"], "compressor")
+                loss.append(("sig", heat, 1.0))
+        elif category == "coolers":
+            heat, _ = self._heat(name, "QCALC", "cooler")
+            loss.append(("abs", heat, -1.0))
+            if options["cooler_efficiency_basis"] == "net":
+                basis.append(("abs", heat, -1.0))
+        elif category == "furnaces":
+            heat, _ = self._heat(name, "QCALC", "furnace")
+            loss.append(("abs", heat, 1.0))
+            basis.append(("abs", heat, 1.0))
+        elif category == "flash_tanks":
+            heat, _ = self._heat(name, "QCALC", "flash")
+            loss.append(("abs", heat, 1.0))
+            basis.append(("abs", heat, 1.0))
+        elif category == "columns":
+            for variable, kind in (("REB_DUTY", "reboiler"), ("COND_DUTY", "condenser")):
+                heat, _ = self._heat(name, variable, kind)
+                loss.append(("abs", heat, 1.0))
+                basis.append(("abs", heat, 1.0))
+        elif category == "reactors":
+            heat, _ = self._heat(name, "QCALC", "reactor")
+            loss.append(("abs", heat, -1.0))
+            basis.append(("abs", heat, -1.0))
+        return loss, basis
+
+    def _work_and_heat_terms(self):
+        """Índices e temperaturas dos termos do balanço global de trabalho e calor"""
+        flowsheet = self.flowsheet
+        heat_variable = flowsheet.options["compressor_heat_variable"]
+
+        self.work_index = [self.duty_index[self._duty(name, "WNET")]
+                           for names in flowsheet.work.values() for name in names]
+
+        heat_in = [self._heat(name, "QCALC", "furnace") for name in flowsheet.heat_input["furnaces"]]
+        heat_in += [self._heat(name, "QCALC", "flash") for name in flowsheet.heat_input["flash_tanks"]]
+        heat_in += [self._heat(name, "REB_DUTY", "reboiler") for name in flowsheet.heat_input["reboilers"]]
+        heat_out = [self._heat(name, heat_variable, "compressor") for name in flowsheet.heat_output["compressors"]]
+        heat_out += [self._heat(name, "QCALC", "reactor") for name in flowsheet.heat_output["reactors"]]
+        heat_out += [self._heat(name, "QCALC", "cooler") for name in flowsheet.heat_output["coolers"]]
+        heat_out += [self._heat(name, "COND_DUTY", "condenser") for name in flowsheet.heat_output["condensers"]]
+
+        self.heat_in_index = [self.duty_index[key] for key, _ in heat_in]
+        self.heat_in_temp = np.array([t for _, t in heat_in], dtype=float)
+        self.heat_out_index = [self.duty_index[key] for key, _ in heat_out]
+        self.heat_out_temp = np.array([t for _, t in heat_out], dtype=float)
+
+    # ----------------------------------------------
+    # Entrada de dados
+    # ----------------------------------------------
+
+    def node_paths(self):
+        """Caminhos dos nós na ordem dos vetores (correntes, depois trabalho/calor)"""
+        return ([stream_exergy_path(s) for s in self.streams] +
+                [block_output_path(b, v) for b, v in self.duties])
+
+    def vectors_from_values(self, values, default=0.0):
+        """Monta (ex, d) a partir de {caminho: valor}; nós ausentes usam o default"""
+        ex = np.array([values.get(stream_exergy_path(s), default) for s in self.streams], dtype=float)
+        d = np.array([values.get(block_output_path(b, v), default) for b, v in self.duties], dtype=float)
+        return ex, d
+
+    def stream_matrix(self, stream_exergy):
+        """Matriz cenários x correntes na ordem do modelo
+
+        Aceita um array já ordenado como self.streams ou um dicionário
+        {corrente: valores}; correntes não informadas valem zero.
+        """
+        if not isinstance(stream_exergy, dict):
+            ex = np.asarray(stream_exergy, dtype=float)
+            if ex.shape[-1] != len(self.streams):
+                raise ValueError(f"Esperadas {len(self.streams)} colunas de correntes, recebidas {ex.shape[-1]}")
+            return ex
+
+        unknown = set(stream_exergy) - set(self.stream_index)
+        if unknown:
+            raise ValueError(f"Correntes fora do fluxograma: {sorted(unknown)}")
+        n = len(np.atleast_1d(next(iter(stream_exergy.values())))) if stream_exergy else 1
+        ex = np.zeros((n, len(self.streams)))
+        for stream, values in stream_exergy.items():
+            ex[:, self.stream_index[stream]] = values
+        return ex
+
+    def duty_matrix(self, duties, n_scenarios):
+        """Matriz cenários x (bloco, variável) na ordem de self.duties
+
+        Aceita um array já ordenado, ou um dicionário com chaves (bloco,
+        variável) ou caminhos de nó; termos não informados valem zero.
+        """
+        if duties is None:
+            return np.zeros((n_scenarios, len(self.duties)))
+        if not isinstance(duties, dict):
+            d = np.asarray(duties, dtype=float)
+            if d.shape[-1] != len(self.duties):
+                raise ValueError(f"Esperadas {len(self.duties)} colunas de trabalho/calor, recebidas {d.shape[-1]}")
+            return d
+
+        by_path = {block_output_path(b, v): (b, v) for b, v in self.duties}
+        d = np.zeros((n_scenarios, len(self.duties)))
+        for key, values in duties.items():
+            key = by_path.get(key, key)
+            if key not in self.duty_index:
+                raise ValueError(f"Termo de trabalho/calor fora do fluxograma: {key}")
+            d[:, self.duty_index[key]] = values
+        return d
+
+    # ----------------------------------------------
+    # Avaliação
+    # ----------------------------------------------
+
+    def evaluate_scenarios(self, stream_exergy, duties=None, T0=298.15):
+        """Avalia vários pontos de operação em uma única chamada vetorizada
+
+        stream_exergy: cenários x correntes (array ou {corrente: valores})
+        duties: cenários x termos de trabalho/calor (array ou dicionário)
+        Retorna um BalanceResult com arrays (cenários, ...).
+        """
+        ex = self.stream_matrix(stream_exergy)
+        d = self.duty_matrix(duties, ex.shape[0])
+        if d.shape[0] != ex.shape[0]:
+            raise ValueError(f"Número de cenários diferente: correntes {ex.shape[0]}, trabalho/calor {d.shape[0]}")
+        return self.evaluate(ex, d, T0)
+
+    def heat_exergy(self, d, T0=298.15):
+        """Exergia de calor de todos os termos (e cenários) em uma só expressão
+
+        d: (..., termos) na ordem de self.duties; termos de trabalho valem zero.
+        """
+        heat = np.isfinite(self.duty_temp)
+        return np.where(heat, carnot_heat_exergy(np.asarray(d, dtype=float), self.duty_temp, T0), 0.0)
+
+    def duty_terms(self, terms, d, abs_d, T0):
+        """Soma por equipamento dos termos de trabalho/calor: coeficiente * (1 - T0/T) * d"""
+        total = 0.0
+        for kind, x in (("abs", abs_d), ("sig", d)):
+            matrix = terms[kind]
+            total = total + matrix.apply(x, matrix.values * (1.0 - T0 / self.duty_temp[matrix.columns]))
+        return total
+
+    def evaluate(self, ex, d, T0=298.15):
+        """Calcula perdas, eficiências, totais por categoria e o balanço da planta
+
+        T0 pode ser um vetor de temperaturas de referência: os resultados
+        ganham um eixo à esquerda (T0, cenários..., equipamentos), calculado
+        em uma única passagem a partir dos mesmos ex e d.
+        """
+        ex = np.asarray(ex, dtype=float)
+        d = np.asarray(d, dtype=float)
+        abs_d = np.abs(d)
+
+        T0 = np.asarray(T0, dtype=float)
+        sweep = T0.ndim > 0
+        if sweep:
+            # (T0, 1 por eixo de cenário, 1 para o eixo dos termos)
+            T0 = T0.reshape(T0.shape + (1,) * (np.broadcast(ex[..., :1], d[..., :1]).ndim - 1) + (1,))
+
+        losses = self.A.apply(ex) + self.duty_terms(self.loss_terms, d, abs_d, T0)
+        basis = self.A_basis.apply(ex) + self.duty_terms(self.basis_terms, d, abs_d, T0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiencies = np.where(basis > 0, (1.0 - losses / basis) * 100.0, 0.0)
+
+        category_losses = self.groups.apply(np.maximum(losses, 0.0))
+        summary = self._plant_balance(ex, d, T0, category_losses.sum(axis=-1))
+        if sweep:
+            shape = losses.shape[:-1]
+            summary = {key: np.broadcast_to(value, shape) for key, value in summary.items()}
+        return BalanceResult(self, losses, efficiencies, category_losses, summary,
+                             T0.reshape(-1) if sweep else float(T0))
+
+    def evaluate_t0_sweep(self, ex, d, T0_values):
+        """Avalia os mesmos ex e d para cada T0 de T0_values (eixo 0 do resultado)"""
+        return self.evaluate(ex, d, np.atleast_1d(np.asarray(T0_values, dtype=float)))
+
+    def _plant_balance(self, ex, d, T0, total_loss_equipment):
+        options = self.flowsheet.options
+        total_input_exergy = ex[..., self.input_index].sum(axis=-1)
+        total_output_exergy = ex[..., self.output_index].sum(axis=-1)
+
+        total_work = d[..., self.work_index].sum(axis=-1)
+        # Calor fornecido (Q > 0) entra; calor removido (Q < 0) sai
+        heat_in = (np.maximum(d[..., self.heat_in_index], 0.0) * (1.0 - T0 / self.heat_in_temp)).sum(axis=-1)
+        heat_out = (np.maximum(-d[..., self.heat_out_index], 0.0) * (1.0 - T0 / self.heat_out_temp)).sum(axis=-1)
+
+        total_in = total_input_exergy + total_work + heat_in
+        total_out = total_output_exergy + heat_out
+
+        if options["balance"] == "plant":
+            total_loss = total_in - total_out
+        else:
+            total_loss = total_loss_equipment
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency_complete = np.where(total_in > 0, (1.0 - total_loss / total_in) * 100.0, 0.0)
+            if options["traditional_efficiency"] == "output_over_input_streams":
+                traditional = total_output_exergy / total_input_exergy * 100.0
+            else:
+                traditional = (1.0 - total_loss / total_input_exergy) * 100.0
+            efficiency_traditional = np.where(total_input_exergy > 0, traditional, 0.0)
+
+        summary = {
+            'exergia_trabalho_total': total_work,
+            'exergia_calor_entrada': heat_in,
+            'exergia_calor_saida': heat_out,
+            'exergia_entrada_total': total_in,
+            'exergia_saida_total': total_out,
+        }
+        if options["balance"] == "plant":
+            summary['perda_total_planta'] = total_loss
+        summary['eficiencia_tradicional'] = efficiency_traditional
+        summary['eficiencia_completa'] = efficiency_complete
+        summary['balanco_diferenca'] = total_in - total_out - total_loss
+        return summary
@@ -0,0 +1,213 @@
+"""Benchmark da análise com fluxogramas sintéticos de tamanho crescente
+
+As plantas reais têm cerca de 30 blocos; aqui são gerados fluxogramas de 10 a
+10.000 blocos com todas as categorias de equipamentos suportadas (ou apenas
+uma delas), analisados contra um FakeAspenDocument, sem o Aspen. Para cada
+tamanho são reportados execuções por segundo, pico de memória e leituras de
+nós por execução, de modo que regressões de escala fiquem visíveis:
+
+    python -m exergia.benchmark
+    python -m exergia.benchmark --tamanhos 10 100 1000 --categoria columns --json bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+
+from .analyzer import AspenAnalyzer
+from .backends import COMBackend
+from .fake_aspen import FakeAspenDocument
+from .flowsheet import CATEGORIES, Flowsheet, equipment_item
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+MODES = ("completa", "vetorizada")
+
+# Número de correntes de entrada e de saída de cada categoria no fluxograma sintético
+SHAPES = {
+    "pumps": (1, 1),
+    "compressors": (1, 1),
+    "coolers": (1, 1),
+    "mixers": (2, 1),
+    "valves": (1, 1),
+    "separators": (1, 2),
+    "furnaces": (1, 1),
+    "heat_exchangers": (2, 2),
+    "flash_tanks": (1, 3),
+    "splitters": (1, 2),
+    "columns": (1, 3),
+    "reactors": (1, 1),
+}
+
+
+def synthetic_flowsheet_spec(n_blocks, categories=None, name=None):
+    """Especificação de um fluxograma em cadeia com n_blocks equipamentos
+
+    Os blocos alternam entre as categorias pedidas (todas, por padrão); a
+    primeira saída de cada bloco alimenta o bloco seguinte e as demais
+    entradas e saídas são correntes de fronteira da planta.
+    """
+    categories = tuple(categories or [category for category, _ in CATEGORIES])
+    equipment = {category: [] for category in categories}
+    work = {"pumps": [], "compressors": []}
+    heat_input = {"furnaces": [], "flash_tanks": [], "reboilers": []}
+    heat_output = {"compressors": [], "reactors": [], "coolers": [], "condensers": []}
+    input_streams, output_streams = ["S0"], []
+
+    previous = "S0"
+    for i in range(n_blocks):
+        category = categories[i % len(categories)]
+        block = f"{category[:4].upper()}-{i + 1}"
+        n_in, n_out = SHAPES[category]
+        inputs = [previous] + [f"{block}-F{k}" for k in range(1, n_in)]
+        outputs = [f"S{i + 1}"] + [f"{block}-P{k}" for k in range(1, n_out)]
+        input_streams += inputs[1:]
+        output_streams += outputs[1:]
+        previous = outputs[0]
+
+        item = equipment_item(category, block, inputs, outputs)
+        if category == "compressors":
+            item["type"] = "m-compressor" if i % 2 else "standard"
+        equipment[category].append(item)
+
+        if category in work:
+            work[category].append(block)
+        if category == "compressors" and item["type"] != "standard":
+            heat_output["compressors"].append(block)
+        if category in ("furnaces", "flash_tanks"):
+            heat_input[category].append(block)
+        if category in ("reactors", "coolers"):
+            heat_output[category].append(block)
+        if category == "columns":
+            heat_input["reboilers"].append(block)
+            heat_output["condensers"].append(block)
+    output_streams.append(previous)
+
+    return {
+        "name": name or f"sintetico_{n_blocks}",
+        "description": f"Fluxograma sintético com {n_blocks} blocos",
+        "version": 1,
+        "input_streams": input_streams,
+        "output_streams": output_streams,
+        "equipment": {category: items for category, items in equipment.items() if items},
+        "work": work,
+        "heat_input": heat_input,
+        "heat_output": heat_output,
+    }
+
+
+def synthetic_flowsheet(n_blocks, categories=None, name=None):
+    """Fluxograma sintético compilado (ver synthetic_flowsheet_spec)"""
+    return Flowsheet(synthetic_flowsheet_spec(n_blocks, categories, name), source="sintético")
+
+
+def _run(flowsheet, document, mode):
+    """Uma execução completa: conexão, pré-carregamento e análise"""
+    analyzer = AspenAnalyzer(flowsheet, backend=COMBackend(dispatch=lambda: document))
+    # A saída impressa faz parte do custo real, mas não do relatório
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.connect_to_aspen("sintetico.apw")
+        if mode == "completa":
+            results = analyzer.full_exergy_analysis()
+        else:
+            results = analyzer.fast_exergy_analysis()
+        analyzer.close_connection()
+    if not results:
+        raise RuntimeError(f"Análise sintética sem resultados ({flowsheet.name}, {mode})")
+    return analyzer
+
+
+def benchmark_case(flowsheet, mode, min_time=0.5, seed=0):
+    """Mede uma combinação fluxograma/modo; retorna um dicionário de métricas"""
+    document = FakeAspenDocument.synthetic(flowsheet.node_plan(), seed=seed)
+
+    # Primeira execução: aquecimento e contagem de leituras
+    document.reset_calls()
+    analyzer = _run(flowsheet, document, mode)
+    calls = dict(document.calls)
+
+    runs, elapsed = 0, 0.0
+    while elapsed < min_time or runs == 0:
+        start = time.perf_counter()
+        _run(flowsheet, document, mode)
+        elapsed += time.perf_counter() - start
+        runs += 1
+
+    tracemalloc.start()
+    try:
+        _run(flowsheet, document, mode)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'fluxograma': flowsheet.name,
+        'modo': mode,
+        'blocos': len(flowsheet.blocks),
+        'correntes': len(flowsheet.streams),
+        'nos_planejados': len(flowsheet.node_plan()),
+        'execucoes': runs,
+        'execucoes_por_s': runs / elapsed,
+        'ms_por_execucao': elapsed / runs * 1e3,
+        'pico_memoria_mb': peak / 2**20,
+        'chamadas_com_por_execucao': sum(calls.values()) - calls.get('InitFromArchive2', 0)
+                                     - calls.get('Run2', 0) - calls.get('Close', 0),
+        'chamadas_com': calls,
+        'leituras_get_node_value': analyzer.cache_stats()['acertos'] + analyzer.cache_stats()['falhas'],
+    }
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, categories=None, modes=MODES, min_time=0.5):
+    """Executa todas as combinações de tamanho e modo, imprimindo uma tabela
+
+    Uma combinação que não consegue rodar (memória esgotada, análise sem
+    resultados) aparece no relatório como falha, com o motivo em 'erro'.
+    """
+    header = (f"{'blocos':>7} {'modo':>10} {'exec/s':>9} {'ms/exec':>9} "
+              f"{'pico MB':>8} {'COM/exec':>9} {'get_node':>9}")
+    print(header)
+    print("-" * len(header))
+    report = []
+    for size in sizes:
+        flowsheet = synthetic_flowsheet(size, categories)
+        for mode in modes:
+            try:
+                case = benchmark_case(flowsheet, mode, min_time)
+            except (MemoryError, RuntimeError) as e:
+                reason = f"{type(e).__name__}: {e}"
+                report.append({'fluxograma': flowsheet.name, 'modo': mode, 'blocos': len(flowsheet.blocks),
+                               'correntes': len(flowsheet.streams), 'erro': reason})
+                print(f"{size:>7} {mode:>10}  FALHOU: {reason}")
+                continue
+            report.append(case)
+            print(f"{size:>7} {mode:>10} {case['execucoes_por_s']:>9.2f} {case['ms_por_execucao']:>9.2f} "
+                  f"{case['pico_memoria_mb']:>8.2f} {case['chamadas_com_por_execucao']:>9} "
+                  f"{case['leituras_get_node_value']:>9}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark com fluxogramas sintéticos")
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="números de blocos dos fluxogramas sintéticos")
+    parser.add_argument("--categoria", nargs="+", choices=[category for category, _ in CATEGORIES],
+                        help="categorias de equipamentos (padrão: todas)")
+    parser.add_argument("--modo", nargs="+", choices=MODES, default=list(MODES),
+                        help="análise completa (com impressões) e/ou vetorizada")
+    parser.add_argument("--tempo-minimo", type=float, default=0.5,
+                        help="tempo mínimo de medição por caso (s)")
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.tamanhos, args.categoria, args.modo, args.tempo_minimo)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Relatório gravado em {args.json}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Conjunto de documentos do Aspen abertos e prontos para reutilização
+
+Abrir o .apw (Dispatch do Apwn.Document e InitFromArchive2) é a etapa mais
+cara de uma análise. O DocumentPool mantém até K documentos do mesmo arquivo
+abertos e os empresta a análises sucessivas. Ao devolver um documento, as
+entradas alteradas voltam aos valores originais e o motor é reiniciado
+(Engine.Reinit), de modo que cada uso parte do mesmo estado. Documentos que
+falham na verificação de saúde, ou que atingem max_uses empréstimos, são
+fechados e substituídos.
+
+O empréstimo é um Backend: connect() não reabre o arquivo e close() devolve
+o documento ao conjunto. Assim o AspenAnalyzer, o ParametricSweep e o
+CachedBackend usam o documento emprestado sem alterações:
+
+    pool = DocumentPool("planta.apw", size=2)
+    with pool.lease() as backend:
+        analyzer = AspenAnalyzer("versao_final", backend=backend)
+        analyzer.connect_to_aspen("planta.apw")
+        analyzer.fast_exergy_analysis()
+    print(pool.stats())
+
+Documentos COM pertencem à thread que os criou; com o Aspen real, use o
+conjunto a partir de uma única thread (por exemplo, um controlador asyncio).
+O FakeAspenDocument não tem essa restrição.
+"""
+
+import contextlib
+import os
+import threading
+from time import perf_counter
+
+from .backends import Backend, COMBackend
+
+
+class PooledBackend(Backend):
+    """Documento emprestado do DocumentPool (ver módulo)"""
+
+    description = "documento do conjunto"
+
+    def __init__(self, pool, backend):
+        self.pool = pool
+        self.backend = backend
+        self.uses = 0
+        self.leased = False
+        self._original_inputs = {}
+
+    @property
+    def document(self):
+        return getattr(self.backend, 'document', None)
+
+    def connect(self, file_path):
+        if os.path.abspath(file_path) != self.pool.file_path:
+            raise ValueError(f"O documento emprestado é de {self.pool.file_path}, não de {file_path}")
+
+    def close(self):
+        """Devolve o documento ao conjunto (o arquivo continua aberto)"""
+        if self.leased:
+            self.pool.checkin(self)
+
+    def run(self):
+        self.backend.run()
+
+    def start_run(self):
+        self.backend.start_run()
+
+    def is_running(self):
+        return self.backend.is_running()
+
+    def stop(self):
+        self.backend.stop()
+
+    def reinit(self):
+        self.backend.reinit()
+
+    def write_node(self, node_path, value):
+        previous = self.backend.write_node(node_path, value)
+        self._original_inputs.setdefault(node_path, previous)
+        return previous
+
+    def read_node(self, node_path):
+        return self.backend.read_node(node_path)
+
+    def read_nodes(self, node_paths):
+        return self.backend.read_nodes(node_paths)
+
+    def read_topology(self):
+        return self.backend.read_topology()
+
+    def reset(self):
+        """Restaura as entradas alteradas durante o empréstimo e reinicia o motor"""
+        for node_path, value in self._original_inputs.items():
+            self.backend.write_node(node_path, value)
+        self._original_inputs = {}
+        if self.pool.reinit:
+            self.backend.reinit()
+
+
+class DocumentPool:
+    """Até size documentos abertos do mesmo arquivo, emprestados sob demanda
+
+    factory: função sem argumentos que cria o Backend de cada documento
+        (padrão: COMBackend); o conjunto chama connect(file_path) uma vez
+    max_uses: empréstimos antes de fechar e reabrir o documento (None: sem limite)
+    reinit: reinicia o motor (Engine.Reinit) ao receber um documento de volta
+    """
+
+    def __init__(self, file_path, size=1, factory=None, max_uses=None, reinit=True):
+        self.file_path = os.path.abspath(file_path)
+        self.size = size
+        self.factory = factory if factory is not None else COMBackend
+        self.max_uses = max_uses
+        self.reinit = reinit
+        self._idle = []
+        self._all = []
+        self._opening = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            'aberturas': 0,
+            'emprestimos': 0,
+            'devolucoes': 0,
+            'reciclados': 0,
+            'falhas_saude': 0,
+            'falhas_reinicio': 0,
+            'espera_s': 0.0,
+            'abertura_s': 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _open(self):
+        """Cria e conecta um documento (fora do lock: InitFromArchive2 é lento)"""
+        start = perf_counter()
+        backend = self.factory()
+        backend.connect(self.file_path)
+        with self._condition:
+            self._stats['aberturas'] += 1
+            self._stats['abertura_s'] += perf_counter() - start
+        return PooledBackend(self, backend)
+
+    def warm(self):
+        """Abre de uma vez os documentos que faltam para completar o conjunto"""
+        with self._condition:
+            missing = max(self.size - len(self._all) - self._opening, 0)
+            self._opening += missing
+        for attempt in range(missing):
+            try:
+                document = self._open()
+            except BaseException:
+                # Libera a reserva desta tentativa e as das que não serão feitas
+                with self._condition:
+                    self._opening -= missing - attempt
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._opening -= 1
+                self._all.append(document)
+                self._idle.append(document)
+                self._condition.notify()
+
+    @staticmethod
+    def is_healthy(document):
+        """O documento responde a uma consulta simples à árvore"""
+        try:
+            return document.backend.is_healthy()
+        except Exception:
+            return False
+
+    def _discard(self, document):
+        with self._condition:
+            if document in self._all:
+                self._all.remove(document)
+            self._condition.notify()
+        with contextlib.suppress(Exception):
+            document.backend.close()
+
+    def checkout(self, timeout=None):
+        """Empresta um documento; aguarda até timeout segundos se todos estiverem em uso"""
+        start = perf_counter()
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Conjunto de documentos encerrado")
+                open_new = False
+                if not self._idle and len(self._all) + self._opening < self.size:
+                    self._opening += 1
+                    open_new = True
+                elif not self._idle:
+                    remaining = None if timeout is None else timeout - (perf_counter() - start)
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"Nenhum documento livre em {timeout:g} s")
+                    self._condition.wait(remaining)
+                    continue
+                else:
+                    document = self._idle.pop()
+
+            if open_new:
+                try:
+                    document = self._open()
+                except BaseException:
+                    # A vaga reservada volta a ficar livre para quem está esperando
+                    with self._condition:
+                        self._opening -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._opening -= 1
+                    self._all.append(document)
+            elif not self.is_healthy(document):
+                with self._condition:
+                    self._stats['falhas_saude'] += 1
+                self._discard(document)
+                continue
+
+            with self._condition:
+                document.leased = True
+                document.uses += 1
+                self._stats['emprestimos'] += 1
+                self._stats['espera_s'] += perf_counter() - start
+            return document
+
+    def checkin(self, document):
+        """Recebe o documento de volta: restaura as entradas, verifica e recicla"""
+        document.leased = False
+        with self._condition:
+            self._stats['devolucoes'] += 1
+        try:
+            document.reset()
+        except Exception:
+            with self._condition:
+                self._stats['falhas_reinicio'] += 1
+            self._discard(document)
+            return
+        if self.max_uses is not None and document.uses >= self.max_uses:
+            with self._condition:
+                self._stats['reciclados'] += 1
+            self._discard(document)
+            return
+        with self._condition:
+            if self._closed:
+                closing = True
+            else:
+                closing = False
+                self._idle.append(document)
+                self._condition.notify()
+        if closing:
+            self._discard(document)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        """with pool.lease() as backend: ... (devolve o documento ao final)"""
+        document = self.checkout(timeout)
+        try:
+            yield document
+        finally:
+            if document.leased:
+                self.checkin(document)
+
+    def stats(self):
+        """Contagens do conjunto: documentos abertos, livres, empréstimos, reciclagens..."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'tamanho': self.size,
+                'abertos': len(self._all),
+                'livres': len(self._idle),
+                'em_uso': len(self._all) - len(self._idle),
+            })
+        # Cada empréstimo além das aberturas evitou um InitFromArchive2
+        stats['reutilizacoes'] = max(stats['emprestimos'] - stats['aberturas'], 0)
+        return stats
+
+    def close(self):
+        """Fecha os documentos livres; os emprestados são fechados ao serem devolvidos"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for document in idle:
+            self._discard(document)
@@ -0,0 +1,236 @@
+"""Documento Aspen Plus simulado em memória para testes e benchmarks
+
+FakeAspenDocument imita a parte da interface do Apwn.Document usada pela
+análise (Tree.FindNode, Elements, Value, Engine.Run2, InitFromArchive2 e
+Close), sem depender do Aspen nem do Windows. Pode ser preenchido a partir
+de um snapshot ou com valores sintéticos, e aceita uma latência por chamada
+para emular o custo das chamadas COM reais. Um modelo opcional, chamado a
+cada Engine.Run2(), recalcula as saídas a partir das entradas (para testar
+varreduras paramétricas). Uso com o analisador:
+
+    document = FakeAspenDocument.from_snapshot("planta.snap")
+    analyzer = AspenAnalyzer(backend=COMBackend(dispatch=lambda: document))
+"""
+
+import random
+import time
+
+from .backends import COMBackend
+from .snapshot import load_snapshot
+
+
+class FakeElements:
+    """Coleção de elementos filhos de um nó (equivalente a Node.Elements)"""
+
+    def __init__(self, document, node):
+        self._document = document
+        self._node = node
+
+    def Item(self, name):
+        self._document._call("Item")
+        return self._node.children[name]
+
+    def __call__(self, name):
+        return self.Item(name)
+
+    def __iter__(self):
+        self._document._call("Elements")
+        return iter(list(self._node.children.values()))
+
+    def __len__(self):
+        return len(self._node.children)
+
+    @property
+    def Count(self):
+        return len(self._node.children)
+
+
+class FakeNode:
+    """Nó da árvore com Name, Value e Elements"""
+
+    def __init__(self, document, name, value=None):
+        self._document = document
+        self.Name = name
+        self.children = {}
+        self.attributes = {}
+        self._value = value
+
+    @property
+    def Value(self):
+        self._document._call("Value")
+        return self._value
+
+    @Value.setter
+    def Value(self, value):
+        self._document._call("SetValue")
+        self._value = value
+
+    @property
+    def Elements(self):
+        return FakeElements(self._document, self)
+
+    def AttributeValue(self, attribute):
+        self._document._call("AttributeValue")
+        return self.attributes.get(attribute)
+
+    def FindNode(self, node_path):
+        self._document._call("FindNode")
+        return self._document._find(self, node_path)
+
+
+class FakeEngine:
+    """Motor de cálculo simulado (equivalente a Document.Engine)
+
+    Run2(True) retorna de imediato; a execução termina (e o modelo é
+    aplicado) na primeira consulta a IsRunning após run_latency segundos.
+    Stop() interrompe a execução sem atualizar as saídas.
+    """
+
+    def __init__(self, document):
+        self._document = document
+        self._finish_at = None
+
+    def Run2(self, run_async=False):
+        self._document._call("Run2")
+        self._document.runs += 1
+        if run_async:
+            self._finish_at = time.perf_counter() + self._document.run_latency
+            return
+        if self._document.run_latency:
+            time.sleep(self._document.run_latency)
+        self._complete()
+
+    @property
+    def IsRunning(self):
+        self._document._call("IsRunning")
+        if self._finish_at is not None and time.perf_counter() >= self._finish_at:
+            self._complete()
+        return self._finish_at is not None
+
+    def Stop(self):
+        self._document._call("Stop")
+        self._finish_at = None
+
+    def _complete(self):
+        self._finish_at = None
+        if self._document.model is not None:
+            self._document.model(self._document)
+
+    def Reinit(self, *args):
+        self._document._call("Reinit")
+
+
+class FakeAspenDocument:
+    """Substituto em memória do Apwn.Document
+
+    latency: segundos acrescentados a cada chamada (FindNode, Item, Value...)
+    run_latency: segundos acrescentados a cada Engine.Run2()
+    model: função model(document) chamada a cada Engine.Run2(); lê as
+        entradas com value() e grava as saídas com set_node()
+    """
+
+    def __init__(self, values=None, latency=0.0, run_latency=0.0, model=None):
+        self.latency = latency
+        self.run_latency = run_latency
+        self.model = model
+        self.calls = {}
+        self.runs = 0
+        self.archive_path = None
+        self.closed = False
+        self.Tree = FakeNode(self, "Root")
+        self.Engine = FakeEngine(self)
+        for node_path, value in (values or {}).items():
+            self.set_node(node_path, value)
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, **kwargs):
+        """Cria o documento com os nós gravados em um snapshot"""
+        return cls(load_snapshot(snapshot_path)["nos"], **kwargs)
+
+    @classmethod
+    def synthetic(cls, node_paths, seed=0, **kwargs):
+        """Cria o documento com valores aleatórios reprodutíveis para os caminhos
+
+        Correntes recebem exergias positivas; trabalho e calor de blocos podem
+        ter qualquer sinal, como nas saídas reais do Aspen.
+        """
+        rng = random.Random(seed)
+        values = {}
+        for node_path in node_paths:
+            if "\\Streams\\" in node_path:
+                values[node_path] = rng.uniform(100.0, 10000.0)
+            else:
+                values[node_path] = rng.uniform(-2000.0, 2000.0)
+        return cls(values, **kwargs)
+
+    # Interface do Apwn.Document
+
+    def InitFromArchive2(self, archive_path, *args):
+        self._call("InitFromArchive2")
+        self.archive_path = archive_path
+        self.closed = False
+
+    def Close(self, *args):
+        self._call("Close")
+        self.closed = True
+
+    # Manipulação direta da árvore (fora da interface COM)
+
+    def set_node(self, node_path, value):
+        """Cria (se necessário) o nó do caminho e define seu valor"""
+        node = self.Tree
+        for segment in self._segments(node_path):
+            if segment not in node.children:
+                node.children[segment] = FakeNode(self, segment)
+            node = node.children[segment]
+        node._value = value
+        return node
+
+    def value(self, node_path, default=None):
+        """Valor de um nó sem contar a chamada (default se o nó não existir)"""
+        node = self._find(self.Tree, node_path)
+        return default if node is None else node._value
+
+    def set_block(self, block_name, model, connections):
+        """Cria um bloco com o modelo (HAP_RECORDTYPE) e {corrente: porta} em Connections"""
+        block = self.set_node(f"\\Data\\Blocks\\{block_name}", None)
+        block.attributes[6] = model
+        for stream, port in connections.items():
+            self.set_node(f"\\Data\\Blocks\\{block_name}\\Connections\\{stream}", port)
+        return block
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        self.calls = {}
+
+    @staticmethod
+    def _segments(node_path):
+        return [segment for segment in node_path.split("\\") if segment]
+
+    def _call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _find(self, node, node_path):
+        for segment in self._segments(node_path):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+
+def fake_com_backend(values=None, snapshot_path=None, **kwargs):
+    """COMBackend sobre um FakeAspenDocument novo
+
+    Com functools.partial, serve de fábrica de backends para processos de
+    trabalho (ver pool.ScenarioPool): cada processo cria o próprio documento.
+    kwargs são repassados ao FakeAspenDocument (latency, run_latency, model).
+    """
+    if snapshot_path is not None:
+        document = FakeAspenDocument.from_snapshot(snapshot_path, **kwargs)
+    else:
+        document = FakeAspenDocument(values, **kwargs)
+    return COMBackend(dispatch=lambda: document)
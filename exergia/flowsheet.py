@@ -0,0 +1,259 @@
+"""Especificação declarativa do fluxograma da planta
+
+Cada variante da planta é descrita por um arquivo JSON (ou TOML) na pasta
+flowsheets/, com as correntes de fronteira, os equipamentos de cada categoria
+e suas correntes, os equipamentos considerados no balanço de trabalho e calor
+e as opções de cálculo que diferem entre as variantes. load_flowsheet()
+compila o arquivo uma única vez em um Flowsheet indexado, usado pelo
+AspenAnalyzer.
+"""
+
+import json
+import os
+
+from .heat import DEFAULT_BOUNDARY_TEMPERATURES, HEAT_KINDS
+from .prefetch import NodePlan
+
+FLOWSHEETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "flowsheets")
+
+# Categorias de equipamentos na ordem da análise: (chave no arquivo, chave nos resultados)
+CATEGORIES = (
+    ("pumps", "bombas"),
+    ("compressors", "compressores"),
+    ("coolers", "resfriadores"),
+    ("mixers", "misturadores"),
+    ("valves", "valvulas"),
+    ("separators", "separadores"),
+    ("furnaces", "fornos"),
+    ("heat_exchangers", "trocador_calor"),
+    ("flash_tanks", "tanques_flash"),
+    ("splitters", "splitters"),
+    ("columns", "colunas"),
+    ("reactors", "reatores"),
+)
+RESULT_KEYS = dict(CATEGORIES)
+
+# Categorias cujos equipamentos usam as listas "inputs"/"outputs"; as demais
+# usam uma única corrente "input"/"output"
+LIST_INPUT_CATEGORIES = ("mixers", "heat_exchangers", "reactors")
+LIST_OUTPUT_CATEGORIES = ("separators", "heat_exchangers", "flash_tanks", "splitters", "columns", "reactors")
+
+# Grupos de equipamentos do balanço de trabalho e calor
+WORK_GROUPS = ("pumps", "compressors")
+HEAT_INPUT_GROUPS = ("furnaces", "flash_tanks", "reboilers")
+HEAT_OUTPUT_GROUPS = ("compressors", "reactors", "coolers", "condensers")
+
+# Opções de cálculo e valores aceitos (o primeiro é o padrão)
+OPTION_CHOICES = {
+    # Variável de calor dos compressores com resfriamento (M-COMPR)
+    "compressor_heat_variable": ("QNET", "QCALC"),
+    # Base da eficiência dos resfriadores: entrada menos calor, ou só entrada
+    "cooler_efficiency_basis": ("net", "input"),
+    # Perda total: soma das perdas dos equipamentos, ou entrada - saída da planta
+    "balance": ("equipment_losses", "plant"),
+    # Eficiência tradicional: 1 - perda/entrada, ou saída/entrada (só correntes)
+    "traditional_efficiency": ("loss_over_input_streams", "output_over_input_streams"),
+}
+
+
+class Flowsheet:
+    """Fluxograma compilado: listas de equipamentos e índices de correntes e blocos"""
+
+    def __init__(self, spec, source=None):
+        self.spec = spec
+        self.source = source
+        self.name = spec["name"]
+        self.description = spec.get("description", "")
+        self.version = spec.get("version", 1)
+        self.aspen_file = spec.get("aspen_file")
+
+        self.options = {name: choices[0] for name, choices in OPTION_CHOICES.items()}
+        for name, value in spec.get("options", {}).items():
+            if name not in OPTION_CHOICES:
+                raise ValueError(f"Opção desconhecida no fluxograma {self.name}: {name}")
+            if value not in OPTION_CHOICES[name]:
+                raise ValueError(f"Valor inválido para {name} no fluxograma {self.name}: {value}")
+            self.options[name] = value
+
+        # Temperaturas de fronteira (K) por tipo de troca térmica e por bloco
+        self.boundary_temperatures = dict(DEFAULT_BOUNDARY_TEMPERATURES)
+        self.boundary_temperatures.update(self._temperatures(spec.get("boundary_temperatures", {}),
+                                                             "boundary_temperatures"))
+        self.block_temperatures = {}
+        for block, value in spec.get("block_temperatures", {}).items():
+            if isinstance(value, dict):
+                self.block_temperatures[block] = self._temperatures(value, f"block_temperatures.{block}")
+            else:
+                self.block_temperatures[block] = self._temperatures(dict.fromkeys(HEAT_KINDS, value),
+                                                                    f"block_temperatures.{block}")
+
+        self.input_streams = tuple(spec["input_streams"])
+        self.output_streams = tuple(spec["output_streams"])
+
+        equipment = spec.get("equipment", {})
+        unknown = set(equipment) - set(RESULT_KEYS)
+        if unknown:
+            raise ValueError(f"Categorias desconhecidas no fluxograma {self.name}: {sorted(unknown)}")
+        self.equipment = {category: tuple(equipment[category])
+                          for category, _ in CATEGORIES if category in equipment}
+        for category, items in self.equipment.items():
+            for item in items:
+                if "name" not in item:
+                    raise ValueError(f"Equipamento sem nome em {category} no fluxograma {self.name}")
+
+        self.work = self._groups(spec.get("work", {}), WORK_GROUPS, "work")
+        self.heat_input = self._groups(spec.get("heat_input", {}), HEAT_INPUT_GROUPS, "heat_input")
+        self.heat_output = self._groups(spec.get("heat_output", {}), HEAT_OUTPUT_GROUPS, "heat_output")
+
+        self._build_indexes()
+        self._plan = None
+
+    def _temperatures(self, temperatures, section):
+        unknown = set(temperatures) - set(HEAT_KINDS)
+        if unknown:
+            raise ValueError(f"Tipos de troca térmica desconhecidos em {section} no fluxograma "
+                             f"{self.name}: {sorted(unknown)}")
+        for kind, value in temperatures.items():
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"Temperatura inválida em {section}.{kind} no fluxograma {self.name}: {value}")
+        return {kind: float(value) for kind, value in temperatures.items()}
+
+    def _groups(self, groups, allowed, section):
+        unknown = set(groups) - set(allowed)
+        if unknown:
+            raise ValueError(f"Grupos desconhecidos em {section} no fluxograma {self.name}: {sorted(unknown)}")
+        return {group: tuple(groups.get(group, ())) for group in allowed}
+
+    def _build_indexes(self):
+        streams = dict.fromkeys(self.input_streams + self.output_streams)
+        blocks = {}
+        self.warnings = []
+        for category, items in self.equipment.items():
+            for item in items:
+                inputs, outputs = self.equipment_streams(item)
+                streams.update(dict.fromkeys(inputs + outputs))
+                if item["name"] in blocks:
+                    self.warnings.append(f"Equipamento {item['name']} repetido em {category}")
+                blocks.setdefault(item["name"], category)
+        for groups in (self.work, self.heat_input, self.heat_output):
+            for names in groups.values():
+                for name in names:
+                    blocks.setdefault(name, None)
+
+        self.streams = tuple(streams)
+        self.stream_index = {name: i for i, name in enumerate(self.streams)}
+        self.blocks = tuple(blocks)
+        self.block_index = {name: i for i, name in enumerate(self.blocks)}
+        self.block_category = blocks
+
+    @staticmethod
+    def equipment_streams(equipment):
+        """Retorna (entradas, saídas) de um equipamento como tuplas"""
+        inputs = tuple(equipment["inputs"]) if "inputs" in equipment else (equipment["input"],)
+        outputs = tuple(equipment["outputs"]) if "outputs" in equipment else (equipment["output"],)
+        return inputs, outputs
+
+    def boundary_temperature(self, block, kind):
+        """Temperatura de fronteira (K) da troca térmica do bloco, com a do bloco prevalecendo"""
+        overrides = self.block_temperatures.get(block)
+        if overrides and kind in overrides:
+            return overrides[kind]
+        return self.boundary_temperatures[kind]
+
+    def categories(self):
+        """Categorias presentes no fluxograma, na ordem da análise"""
+        return [category for category, _ in CATEGORIES if category in self.equipment]
+
+    def node_plan(self):
+        """Lista, sem repetição, todos os nós lidos pela análise completa"""
+        if self._plan is not None:
+            return self._plan
+
+        heat_variable = self.options["compressor_heat_variable"]
+        plan = NodePlan()
+        for stream in self.input_streams + self.output_streams:
+            plan.add_stream(stream)
+
+        for category, items in self.equipment.items():
+            for item in items:
+                plan.add_equipment_streams(item)
+                name = item["name"]
+                if category in ("pumps", "compressors"):
+                    plan.add_block(name, "WNET")
+                if category == "compressors" and item.get("type", "standard") != "standard":
+                    plan.add_block(name, heat_variable)
+                if category in ("coolers", "furnaces", "flash_tanks", "reactors"):
+                    plan.add_block(name, "QCALC")
+                if category == "columns":
+                    plan.add_block(name, "REB_DUTY")
+                    plan.add_block(name, "COND_DUTY")
+
+        # Balanço de trabalho e calor
+        for names in self.work.values():
+            for name in names:
+                plan.add_block(name, "WNET")
+        for name in self.heat_input["furnaces"] + self.heat_input["flash_tanks"]:
+            plan.add_block(name, "QCALC")
+        for name in self.heat_input["reboilers"]:
+            plan.add_block(name, "REB_DUTY")
+        for name in self.heat_output["compressors"]:
+            plan.add_block(name, heat_variable)
+        for name in self.heat_output["reactors"] + self.heat_output["coolers"]:
+            plan.add_block(name, "QCALC")
+        for name in self.heat_output["condensers"]:
+            plan.add_block(name, "COND_DUTY")
+
+        self._plan = plan
+        return plan
+
+
+def equipment_item(category, name, inputs, outputs):
+    """Entrada de equipamento no formato do arquivo de fluxograma
+
+    Em categorias de corrente única, a corrente vai em "input"/"output" só se
+    for exatamente uma; com nenhuma ou várias, vai a lista "inputs"/"outputs"
+    no lugar dela, e todas as correntes entram no balanço.
+    """
+    item = {"name": name}
+    for key, streams, list_categories in (("input", inputs, LIST_INPUT_CATEGORIES),
+                                          ("output", outputs, LIST_OUTPUT_CATEGORIES)):
+        streams = list(streams)
+        if category in list_categories or len(streams) != 1:
+            item[key + "s"] = streams
+        else:
+            item[key] = streams[0]
+    return item
+
+
+def flowsheet_path(name_or_path):
+    """Resolve o nome de uma variante (ex.: "rtc") para o arquivo em flowsheets/"""
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    for extension in (".json", ".toml"):
+        candidate = os.path.join(FLOWSHEETS_DIR, name_or_path + extension)
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"Fluxograma não encontrado: {name_or_path}")
+
+
+def available_flowsheets():
+    """Nomes das variantes disponíveis em flowsheets/"""
+    names = []
+    for filename in sorted(os.listdir(FLOWSHEETS_DIR)):
+        stem, extension = os.path.splitext(filename)
+        if extension in (".json", ".toml"):
+            names.append(stem)
+    return names
+
+
+def load_flowsheet(name_or_path):
+    """Carrega e compila um fluxograma a partir do nome da variante ou do arquivo"""
+    path = flowsheet_path(name_or_path)
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            spec = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+    return Flowsheet(spec, source=path)
@@ -0,0 +1,29 @@
+"""Exergia de calor pelo fator de Carnot
+
+A exergia associada a uma troca de calor Q na temperatura de fronteira T é
+|Q| * (1 - T0/T). As temperaturas de fronteira padrão de cada tipo de troca
+podem ser substituídas no arquivo do fluxograma ("boundary_temperatures") e
+por bloco ("block_temperatures"); ver Flowsheet.boundary_temperature().
+"""
+
+# Temperaturas de fronteira (K) padrão por tipo de troca térmica
+DEFAULT_BOUNDARY_TEMPERATURES = {
+    "cooler": 303.15,
+    "furnace": 3273.15,
+    "flash": 313.15,
+    "reactor": 303.15,
+    "condenser": 333.15,
+    "reboiler": 570.15,
+    "compressor": 350.15,  # Temperatura típica de compressores
+}
+HEAT_KINDS = tuple(DEFAULT_BOUNDARY_TEMPERATURES)
+
+
+def carnot_heat_exergy(heat_duty, boundary_temperature, T0):
+    """|Q| * (1 - T0/T) para escalares ou arrays NumPy (com broadcasting)
+
+    Com arrays, heat_duty pode ser (cenários x blocos) e boundary_temperature
+    (blocos,): a exergia de calor de todos os blocos e cenários sai em uma
+    única expressão.
+    """
+    return abs(heat_duty) * (1 - T0 / boundary_temperature)
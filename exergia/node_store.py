@@ -0,0 +1,241 @@
+"""Cache persistente (SQLite) dos valores de nós entre processos
+
+Abrir o .apw com InitFromArchive2 e executar Engine.Run2 leva minutos, mesmo
+quando o arquivo não mudou desde a última análise. O NodeStore guarda os
+valores lidos em um banco SQLite, com chave (hash do conteúdo do .apw,
+caminho do nó), e o CachedBackend só inicia o Aspen quando algum nó pedido
+ainda não está no banco.
+
+Nós ausentes (ou sem valor) também são registrados, para que não forcem uma
+nova execução do Aspen. O tamanho do banco é limitado por max_entries: ao
+ultrapassá-lo, os arquivos usados há mais tempo são descartados por inteiro.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from .backends import Backend, COMBackend
+from .nodes import RUN_ERRORS_PATH
+
+# Estado de cada nó gravado no banco
+NODE_VALUE = 0      # nó existente com valor
+NODE_NO_VALUE = 1   # nó existente sem valor
+NODE_MISSING = 2    # nó inexistente
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    hash TEXT PRIMARY KEY,
+    caminho TEXT,
+    usado_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nos (
+    hash TEXT NOT NULL REFERENCES arquivos(hash) ON DELETE CASCADE,
+    caminho TEXT NOT NULL,
+    valor REAL,
+    estado INTEGER NOT NULL,
+    PRIMARY KEY (hash, caminho)
+) WITHOUT ROWID;
+"""
+
+
+def archive_hash(file_path, chunk_size=1 << 20):
+    """SHA-256 do conteúdo do arquivo de simulação"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class NodeStore:
+    """Banco SQLite com os valores de nós de cada versão de arquivo .apw"""
+
+    def __init__(self, db_path, max_entries=1_000_000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        # timeout permite o acesso simultâneo de vários processos
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def lookup(self, digest, node_paths):
+        """Retorna {caminho: (estado, valor)} dos nós já gravados para o arquivo"""
+        node_paths = list(node_paths)
+        found = {}
+        # Consulta em lotes para respeitar o limite de parâmetros do SQLite
+        for start in range(0, len(node_paths), 500):
+            batch = node_paths[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT caminho, estado, valor FROM nos WHERE hash = ? AND caminho IN ({marks})",
+                [digest, *batch])
+            for path, state, value in rows:
+                found[path] = (state, value)
+        if found:
+            self._touch(digest)
+        return found
+
+    def store(self, digest, entries, file_path=None):
+        """Grava {caminho: (estado, valor)} e aplica o limite de tamanho"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO arquivos (hash, caminho, usado_em) VALUES (?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET usado_em = excluded.usado_em, "
+                "caminho = COALESCE(excluded.caminho, arquivos.caminho)",
+                (digest, file_path, time.time()))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO nos (hash, caminho, estado, valor) VALUES (?, ?, ?, ?)",
+                [(digest, path, state, value) for path, (state, value) in entries.items()])
+        self.evict()
+
+    def _touch(self, digest):
+        with self.connection:
+            self.connection.execute("UPDATE arquivos SET usado_em = ? WHERE hash = ?",
+                                    (time.time(), digest))
+
+    def invalidate(self, digest=None):
+        """Descarta os nós de um arquivo (ou de todos, se digest for None)"""
+        with self.connection:
+            if digest is None:
+                removed = self.connection.execute("DELETE FROM nos").rowcount
+                self.connection.execute("DELETE FROM arquivos")
+            else:
+                removed = self.connection.execute("DELETE FROM nos WHERE hash = ?", (digest,)).rowcount
+                self.connection.execute("DELETE FROM arquivos WHERE hash = ?", (digest,))
+        return removed
+
+    def invalidate_file(self, file_path):
+        """Descarta os nós da versão atual de um arquivo .apw"""
+        return self.invalidate(archive_hash(file_path))
+
+    def evict(self):
+        """Remove os arquivos usados há mais tempo até caber em max_entries"""
+        total = self.entry_count()
+        if total <= self.max_entries:
+            return 0
+        removed = 0
+        rows = self.connection.execute(
+            "SELECT a.hash, COUNT(n.caminho) FROM arquivos a LEFT JOIN nos n ON n.hash = a.hash "
+            "GROUP BY a.hash ORDER BY a.usado_em").fetchall()
+        # O arquivo usado mais recentemente nunca é descartado
+        for digest, count in rows[:-1]:
+            if total <= self.max_entries:
+                break
+            removed += self.invalidate(digest)
+            total -= count
+        return removed
+
+    def entry_count(self, digest=None):
+        if digest is None:
+            return self.connection.execute("SELECT COUNT(*) FROM nos").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM nos WHERE hash = ?", (digest,)).fetchone()[0]
+
+    def stats(self):
+        archives = self.connection.execute("SELECT COUNT(*) FROM arquivos").fetchone()[0]
+        return {'arquivos': archives, 'nos': self.entry_count(), 'limite': self.max_entries}
+
+
+class CachedBackend(Backend):
+    """Fonte de dados que consulta o NodeStore antes de iniciar o Aspen
+
+    connect() apenas calcula o hash do arquivo; o backend real (por padrão o
+    COMBackend) só é conectado e executado quando algum nó pedido não está no
+    banco. Uma análise repetida de um .apw inalterado não abre o Aspen.
+    """
+
+    description = "cache persistente"
+
+    def __init__(self, store, backend=None):
+        if not isinstance(store, NodeStore):
+            store = NodeStore(store)
+        self.store = store
+        self.backend = backend if backend is not None else COMBackend()
+        self.file_path = None
+        self.digest = None
+        self.launched = False
+        self.store_hits = 0
+        self.store_misses = 0
+
+    @property
+    def document(self):
+        return getattr(self.backend, 'document', None)
+
+    def connect(self, file_path):
+        self.file_path = os.path.abspath(file_path)
+        self.digest = archive_hash(self.file_path)
+        self.launched = False
+
+    def run(self):
+        # A execução fica para quando um nó precisar ser lido do Aspen
+        pass
+
+    def _launch(self):
+        if not self.launched:
+            print("Cache persistente incompleto: iniciando o Aspen Plus...")
+            self.backend.connect(self.file_path)
+            self.backend.run()
+            self.launched = True
+
+    def close(self):
+        if self.launched:
+            self.backend.close()
+            self.launched = False
+
+    def invalidate(self):
+        """Descarta os nós gravados para o arquivo conectado"""
+        return self.store.invalidate(self.digest)
+
+    def _fetch(self, node_paths):
+        """Lê do backend real os nós que faltam no banco e os grava"""
+        self._launch()
+        values = self.backend.read_nodes(node_paths)
+        entries = {}
+        for path in node_paths:
+            if path in values:
+                entries[path] = (NODE_VALUE, float(values[path]))
+                continue
+            # read_nodes não distingue nó ausente de nó sem valor
+            try:
+                value = self.backend.read_node(path)
+            except KeyError:
+                entries[path] = (NODE_MISSING, None)
+                continue
+            if value is None:
+                entries[path] = (NODE_NO_VALUE, None)
+            else:
+                entries[path] = (NODE_VALUE, float(value))
+        self.store.store(self.digest, entries, self.file_path)
+        return entries
+
+    def _entries(self, node_paths):
+        node_paths = list(dict.fromkeys(node_paths))
+        entries = self.store.lookup(self.digest, node_paths)
+        pending = [path for path in node_paths if path not in entries]
+        self.store_hits += len(entries)
+        self.store_misses += len(pending)
+        if pending:
+            entries.update(self._fetch(pending))
+        return entries
+
+    def read_node(self, node_path):
+        if node_path == RUN_ERRORS_PATH and not self.launched and not self.store.lookup(self.digest, [node_path]):
+            # A situação da execução sozinha não justifica iniciar o Aspen
+            raise KeyError(node_path)
+        state, value = self._entries([node_path])[node_path]
+        if state == NODE_MISSING:
+            raise KeyError(node_path)
+        return value
+
+    def read_topology(self):
+        self._launch()
+        return self.backend.read_topology()
+
+    def read_nodes(self, node_paths):
+        entries = self._entries(node_paths)
+        return {path: value for path, (state, value) in entries.items() if state == NODE_VALUE}
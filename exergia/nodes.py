@@ -0,0 +1,69 @@
+"""Caminhos dos nós da árvore do Aspen Plus lidos pela análise"""
+
+STREAMS_COLLECTION = "\\Data\\Streams"
+BLOCKS_COLLECTION = "\\Data\\Blocks"
+
+# Número de erros da última execução da simulação (0: convergiu)
+RUN_ERRORS_PATH = "\\Data\\Results Summary\\Run-Status\\Output\\PER_ERROR"
+
+# Variáveis de saída de blocos usadas nos balanços
+BLOCK_VARIABLES = ("WNET", "QNET", "QCALC", "REB_DUTY", "COND_DUTY")
+
+# Propriedades de correntes (caminho relativo a Data\Streams\<corrente>\Output)
+STREAM_PROPERTIES = {
+    "EXERGYFL": "STRM_UPP\\EXERGYFL\\MIXED\\TOTAL",  # exergia total (kW)
+    "MASSFLMX": "MASSFLMX\\MIXED",                     # vazão mássica
+    "TEMP_OUT": "TEMP_OUT\\MIXED",                     # temperatura
+    "PRES_OUT": "PRES_OUT\\MIXED",                     # pressão
+}
+
+
+class MissingNodesError(LookupError):
+    """Nós exigidos pela análise ausentes ou sem valor na fonte de dados"""
+
+    def __init__(self, missing):
+        self.missing = dict(missing)  # {caminho: motivo}
+        lines = [f"  {path} ({reason})" for path, reason in self.missing.items()]
+        super().__init__(f"{len(self.missing)} nós exigidos indisponíveis:\n" + "\n".join(lines))
+
+    def __str__(self):
+        return self.args[0]
+
+
+def stream_exergy_path(stream_name):
+    """Caminho da exergia total (EXERGYFL) de uma corrente"""
+    return f"{STREAMS_COLLECTION}\\{stream_name}\\Output\\STRM_UPP\\EXERGYFL\\MIXED\\TOTAL"
+
+
+def stream_property_path(stream_name, prop):
+    """Caminho de uma propriedade de corrente (chave de STREAM_PROPERTIES)"""
+    return f"{STREAMS_COLLECTION}\\{stream_name}\\Output\\{STREAM_PROPERTIES[prop]}"
+
+
+def block_output_path(block_name, variable):
+    """Caminho de uma variável de saída de um bloco (WNET, QCALC, ...)"""
+    return f"{BLOCKS_COLLECTION}\\{block_name}\\Output\\{variable}"
+
+
+def block_input_path(block_name, variable):
+    """Caminho de uma especificação de entrada de um bloco (TEMP, PRES, DUTY, ...)"""
+    return f"{BLOCKS_COLLECTION}\\{block_name}\\Input\\{variable}"
+
+
+def stream_input_path(stream_name, variable, substream="MIXED"):
+    """Caminho de uma especificação de entrada de uma corrente (TEMP, PRES, TOTFLOW, ...)"""
+    return f"{STREAMS_COLLECTION}\\{stream_name}\\Input\\{variable}\\{substream}"
+
+
+def split_node_path(node_path):
+    """Separa um caminho em (coleção, elemento, segmentos restantes)
+
+    Retorna None quando o caminho não pertence a Data\\Streams ou Data\\Blocks.
+    """
+    for collection in (STREAMS_COLLECTION, BLOCKS_COLLECTION):
+        prefix = collection + "\\"
+        if node_path.startswith(prefix):
+            parts = node_path[len(prefix):].split("\\")
+            if len(parts) >= 2:
+                return collection, parts[0], parts[1:]
+    return None
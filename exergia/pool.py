@@ -0,0 +1,233 @@
+"""Execução de casos em vários processos, cada um com a própria simulação
+
+Um único documento do Aspen executa os casos em série. O ScenarioPool inicia
+N processos de trabalho; cada um cria o próprio backend (um Apwn.Document,
+um FakeAspenDocument ou um snapshot) a partir de uma fábrica serializável,
+abre a simulação uma vez e executa os casos que recebe com
+ParametricSweep.run_case. Os resultados voltam assim que cada caso termina.
+Um processo que morre (falha do Aspen, erro fatal) é substituído, e o caso
+que ele executava é refeito até max_retries vezes.
+
+As fábricas precisam ser serializáveis (pickle): a classe COMBackend, ou
+functools.partial de SnapshotBackend ou de fake_aspen.fake_com_backend, com
+um modelo definido no nível de módulo. Como no multiprocessing em geral, o
+script que cria o pool precisa do bloco `if __name__ == '__main__':`.
+
+    factory = functools.partial(fake_com_backend, snapshot_path="planta.snap", model=modelo)
+    with ScenarioPool(flowsheet, factory, workers=8) as pool:
+        for row in pool.imap(cases):
+            print(row["caso"], row["status"])
+"""
+
+import multiprocessing
+import os
+import queue
+from time import perf_counter
+
+from .sweep import ParametricSweep, SweepTable, check_cases
+
+# Situação de um caso cujo processo morreu mais de max_retries vezes
+STATUS_CRASHED = "processo encerrado"
+
+# Mensagens dos processos de trabalho para o processo principal
+_READY = "pronto"
+_RESULT = "resultado"
+_ERROR = "erro"
+
+
+def _worker(worker, flowsheet, backend_factory, file_path, sweep_options, tasks, results):
+    """Laço de um processo de trabalho: abre a simulação e executa os casos recebidos
+
+    worker: (número do processo, geração); a geração distingue um processo
+    substituto das mensagens atrasadas do processo que ele substituiu.
+    """
+    try:
+        sweep = ParametricSweep(flowsheet, backend=backend_factory(), **sweep_options)
+        sweep.open(file_path)
+    except Exception as e:
+        results.put((_ERROR, worker, None, f"{type(e).__name__}: {e}"))
+        return
+    results.put((_READY, worker, os.getpid(), None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, case = task
+            results.put((_RESULT, worker, index, sweep.run_case(case, index)))
+    finally:
+        sweep.close()
+
+
+class ScenarioPool:
+    """N processos de trabalho, cada um com a própria instância do backend
+
+    backend_factories: uma fábrica sem argumentos (repetida para os workers
+        processos) ou uma lista com uma fábrica por processo
+    file_path: arquivo da simulação aberto por cada processo
+    max_retries: vezes que um caso é refeito após a morte do processo
+    max_restarts: total de substituições de processos antes de desistir
+    sweep_options: repassadas ao ParametricSweep (strict, restore, ...)
+    """
+
+    def __init__(self, flowsheet, backend_factories, workers=None, file_path=None,
+                 max_retries=1, max_restarts=None, start_method=None, poll_interval=0.2,
+                 **sweep_options):
+        if callable(backend_factories):
+            backend_factories = [backend_factories] * (workers or os.cpu_count() or 1)
+        self.flowsheet = flowsheet
+        self.backend_factories = list(backend_factories)
+        self.file_path = file_path
+        self.max_retries = max_retries
+        self.max_restarts = max_restarts if max_restarts is not None else 3 * len(self.backend_factories)
+        self.poll_interval = poll_interval
+        self.sweep_options = sweep_options
+        self._context = multiprocessing.get_context(start_method)
+        self._results = None
+        self._processes = {}
+        self._task_queues = {}
+        self._generations = {}
+        self._errors = {}
+        self._idle = []
+        self._busy = {}
+        self._attempts = {}
+        self.stats = {}
+
+    @property
+    def workers(self):
+        return len(self.backend_factories)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def start(self):
+        """Inicia os processos (cada um abre a própria simulação)"""
+        if self._results is not None:
+            return
+        self._results = self._context.Queue()
+        # Processos prontos e em execução valem para todas as chamadas de imap()
+        self._idle = []
+        self._busy = {}  # processo -> (índice, caso) em execução
+        self.stats = {'casos': 0, 'reinicios': 0, 'refeitos': 0,
+                      'por_processo': {worker_id: 0 for worker_id in range(self.workers)}}
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+
+    def _spawn(self, worker_id):
+        tasks = self._context.Queue()
+        self._generations[worker_id] = self._generations.get(worker_id, -1) + 1
+        process = self._context.Process(
+            target=_worker, name=f"exergia-{worker_id}", daemon=True,
+            args=((worker_id, self._generations[worker_id]), self.flowsheet, self.backend_factories[worker_id], self.file_path,
+                  self.sweep_options, tasks, self._results))
+        process.start()
+        self._processes[worker_id] = process
+        self._task_queues[worker_id] = tasks
+
+    def _restart(self, worker_id, reason):
+        self.stats['reinicios'] += 1
+        if self.stats['reinicios'] > self.max_restarts:
+            raise RuntimeError(f"Processos de trabalho reiniciados mais de {self.max_restarts} vezes; "
+                               f"última falha: {reason}")
+        self._processes[worker_id].join(timeout=1)
+        self._spawn(worker_id)
+
+    def imap(self, cases):
+        """Executa os casos e produz as linhas (ver SweepTable) na ordem de término"""
+        self.start()
+        pending = list(enumerate(check_cases(list(cases))))[::-1]
+        self._attempts = {}
+        done = set()
+        last_check = perf_counter()
+
+        while pending or self._busy:
+            while self._idle and pending:
+                worker_id = self._idle.pop()
+                task = pending.pop()
+                self._busy[worker_id] = task
+                self._task_queues[worker_id].put(task)
+
+            try:
+                kind, (worker_id, generation), index, payload = self._results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                kind = None
+
+            # Um processo pode entregar o resultado e morrer logo depois
+            if kind == _RESULT and index not in done:
+                done.add(index)
+                self.stats['casos'] += 1
+                self.stats['por_processo'][worker_id] += 1
+                yield payload
+            # Mensagens atrasadas de processos já substituídos não mudam o estado
+            if kind is not None and generation == self._generations[worker_id]:
+                if kind == _READY:
+                    self._idle.append(worker_id)
+                elif kind == _ERROR:
+                    # Falha ao abrir a simulação; o processo termina e é substituído abaixo
+                    self._errors[worker_id] = payload
+                else:
+                    self._busy.pop(worker_id, None)
+                    self._idle.append(worker_id)
+
+            if kind is None or perf_counter() - last_check > self.poll_interval:
+                last_check = perf_counter()
+                for row in self._replace_dead_workers(pending):
+                    done.add(row["caso"])
+                    self.stats['casos'] += 1
+                    yield row
+
+    def _replace_dead_workers(self, pending):
+        """Substitui processos mortos; o caso em execução volta para a fila ou falha"""
+        failed = []
+        for worker_id, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            reason = self._errors.pop(worker_id, None) or f"código de saída {process.exitcode}"
+            task = self._busy.pop(worker_id, None)
+            if worker_id in self._idle:
+                self._idle.remove(worker_id)
+            self._restart(worker_id, reason)
+            if task is None:
+                continue
+            index, case = task
+            self._attempts[index] = self._attempts.get(index, 0) + 1
+            if self._attempts[index] <= self.max_retries:
+                self.stats['refeitos'] += 1
+                pending.append(task)
+            else:
+                failed.append({"caso": index, **case, "status": STATUS_CRASHED,
+                               "erros_aspen": None, "mensagem": reason})
+        return failed
+
+    def run(self, cases, callback=None):
+        """Executa todos os casos e retorna o SweepTable ordenado por caso"""
+        cases = check_cases(list(cases))
+        table = SweepTable(dict.fromkeys(path for case in cases for path in case))
+        rows = []
+        for row in self.imap(cases):
+            rows.append(row)
+            if callback is not None:
+                callback(row)
+        for row in sorted(rows, key=lambda row: row["caso"]):
+            table.add(row)
+        return table
+
+    def close(self):
+        """Encerra os processos (cada um fecha a própria simulação)"""
+        for worker_id, process in self._processes.items():
+            if process.is_alive():
+                self._task_queues[worker_id].put(None)
+        for process in self._processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes.clear()
+        self._task_queues.clear()
+        self._results = None
+
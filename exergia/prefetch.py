@@ -0,0 +1,111 @@
+"""Planejamento e leitura em bloco dos nós usados pela análise exergética"""
+
+from .nodes import block_output_path, split_node_path, stream_exergy_path
+
+
+class NodePlan:
+    """Conjunto ordenado e sem repetição dos nós necessários para uma análise"""
+
+    def __init__(self):
+        self._paths = {}
+        self.requested = 0  # Referências encontradas, incluindo repetições
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __contains__(self, node_path):
+        return node_path in self._paths
+
+    @property
+    def paths(self):
+        return list(self._paths)
+
+    def add_path(self, node_path):
+        self.requested += 1
+        self._paths.setdefault(node_path, None)
+
+    def add_stream(self, stream_name):
+        self.add_path(stream_exergy_path(stream_name))
+
+    def add_equipment_streams(self, equipment):
+        """Adiciona as correntes de entrada e saída de um equipamento"""
+        for key in ("input", "output"):
+            if key in equipment:
+                self.add_stream(equipment[key])
+        for key in ("inputs", "outputs"):
+            for stream in equipment.get(key, []):
+                self.add_stream(stream)
+
+    def add_block(self, block_name, variable):
+        self.add_path(block_output_path(block_name, variable))
+
+
+def _read_value(node):
+    """Converte o valor de um nó para float (None se ausente ou inválido)
+
+    Value é lido uma única vez, pois cada acesso é uma chamada COM.
+    """
+    if node is None:
+        return None
+    try:
+        value = node.Value
+        return None if value is None else float(value)
+    except Exception:
+        return None
+
+
+def _find_relative(node, segments):
+    """Localiza um descendente do nó com um único FindNode relativo"""
+    try:
+        return node.FindNode("\\".join(segments))
+    except Exception:
+        return None
+
+
+def fetch_nodes(aspen, paths):
+    """Lê os nós em um único laço e retorna {caminho: valor} dos que têm valor
+
+    Os nós de correntes e blocos são obtidos percorrendo uma única vez as
+    coleções Data\\Streams e Data\\Blocks; os demais caminhos usam FindNode.
+    Nós ausentes ou sem valor são omitidos do resultado.
+    """
+    values = {}
+    grouped = {}
+    direct = []
+    for node_path in paths:
+        parts = split_node_path(node_path)
+        if parts is None:
+            direct.append(node_path)
+            continue
+        collection, element_name, segments = parts
+        grouped.setdefault(collection, {}).setdefault(element_name, []).append((node_path, segments))
+
+    for collection, wanted in grouped.items():
+        try:
+            collection_node = aspen.Tree.FindNode(collection)
+        except Exception:
+            collection_node = None
+        if collection_node is None:
+            continue
+
+        for element in collection_node.Elements:
+            requests = wanted.get(element.Name)
+            if not requests:
+                continue
+            for node_path, segments in requests:
+                value = _read_value(_find_relative(element, segments))
+                if value is not None:
+                    values[node_path] = value
+
+    for node_path in direct:
+        try:
+            value = _read_value(aspen.Tree.FindNode(node_path))
+        except Exception:
+            value = None
+        if value is not None:
+            values[node_path] = value
+
+    return values
@@ -0,0 +1,230 @@
+"""Cache de resultados endereçado pelo conteúdo das entradas da simulação
+
+Varreduras revisitam as mesmas combinações de entradas (casos base repetidos,
+grades sobrepostas de pessoas diferentes). O ResultCache guarda os
+resultados de cada caso (o dicionário de full_exergy_analysis(), as perdas
+por equipamento) e os valores de nós por trás deles, sob uma chave SHA-256
+de: conteúdo do .apw base, entradas alteradas, especificação do fluxograma
+(nome, versão e conteúdo) e T0. Um caso repetido volta do cache sem tocar no
+Aspen.
+
+Cada entrada é um arquivo JSON compactado com gzip em
+<diretório>/<2 primeiros dígitos>/<chave>.json.gz, gravado de forma atômica
+(arquivo temporário + os.replace). Não há banco nem trava: o cache pode ficar
+em um diretório compartilhado (NFS), onde o SQLite em modo WAL não é
+confiável. O último uso de cada entrada é a data de modificação do arquivo;
+ao passar de max_bytes (ou max_entries), as entradas usadas há mais tempo
+são removidas.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import uuid
+
+CACHE_FORMAT = "exergia-resultado"
+# Versão 2: entradas da versão 1 podem ter sido calculadas com entradas
+# deixadas por casos anteriores da varredura e não são reaproveitadas
+CACHE_VERSION = 2
+_SUFFIX = ".json.gz"
+RESCAN_WRITES = 100
+
+
+def flowsheet_fingerprint(flowsheet):
+    """Nome, versão e hash do conteúdo da especificação do fluxograma"""
+    spec = json.dumps(flowsheet.spec, sort_keys=True, ensure_ascii=False, default=str)
+    return {
+        'nome': flowsheet.name,
+        'versao': flowsheet.version,
+        'hash': hashlib.sha256(spec.encode("utf-8")).hexdigest(),
+    }
+
+
+def _key_value(value):
+    # 600 e 600.0 são a mesma entrada
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def result_key(flowsheet, inputs, T0, archive_digest=None):
+    """Chave SHA-256 de um caso: entradas + fluxograma + T0 (+ conteúdo do .apw base)
+
+    inputs precisa ser o estado completo das entradas em relação ao .apw
+    base: todo nó fora de inputs está no valor original do arquivo (ver
+    ParametricSweep._write_inputs).
+    """
+    content = {
+        'entradas': {path: _key_value(inputs[path]) for path in sorted(inputs)},
+        'versao': CACHE_VERSION,
+        'fluxograma': flowsheet_fingerprint(flowsheet),
+        'T0': float(T0),
+        'arquivo': archive_digest,
+    }
+    text = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Diretório de resultados por chave de caso, com descarte LRU
+
+    max_bytes: tamanho máximo do diretório (padrão 256 MB)
+    max_entries: número máximo de entradas (None: sem limite)
+    """
+
+    def __init__(self, directory, max_bytes=256 * 2**20, max_entries=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+        # Estimativa local do tamanho; a varredura do diretório só é feita
+        # quando ela passa do limite ou a cada RESCAN_WRITES gravações
+        # (outros processos também gravam)
+        self._size = None
+        self._count = None
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        # Enviado a processos de trabalho (ScenarioPool) sem a estimativa local
+        state = dict(self.__dict__)
+        state.update(hits=0, misses=0, writes=0, evicted=0, _size=None, _count=None)
+        return state
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + _SUFFIX)
+
+    def get(self, key):
+        """Entrada gravada para a chave, ou None; marca o uso para o LRU"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError):
+            # Arquivo truncado ou corrompido: descartado como se não existisse
+            self._remove(path)
+            self.misses += 1
+            return None
+        if data.get("formato") != CACHE_FORMAT or data.get("versao") != CACHE_VERSION:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, results, nodes=None, missing=(), row=None, metadata=None):
+        """Grava os resultados (e os nós por trás deles) sob a chave"""
+        data = {
+            "formato": CACHE_FORMAT,
+            "versao": CACHE_VERSION,
+            "chave": key,
+            "criado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+            "metadados": metadata or {},
+            "resultados": results,
+            "linha": row or {},
+            "nos": {path: float(value) for path, value in (nodes or {}).items()},
+            "ausentes": sorted(missing),
+        }
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, path)
+        self.writes += 1
+
+        if self._size is not None:
+            self._size += os.path.getsize(path)
+            self._count += 1
+        if (self._size is None or self.writes % RESCAN_WRITES == 0
+                or self._over_limit(self._size, self._count)):
+            self.evict()
+        return key
+
+    def _over_limit(self, size, count):
+        return ((self.max_bytes is not None and size > self.max_bytes)
+                or (self.max_entries is not None and count > self.max_entries))
+
+    def _entries(self):
+        """[(último uso, tamanho, caminho)] de todas as entradas do diretório"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((info.st_mtime, info.st_size, path))
+        return entries
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até caber nos limites"""
+        entries = sorted(self._entries())
+        size = sum(entry[1] for entry in entries)
+        count = len(entries)
+        removed = 0
+        # A entrada usada mais recentemente nunca é descartada
+        for _, entry_size, path in entries[:-1]:
+            if not self._over_limit(size, count):
+                break
+            if self._remove(path):
+                removed += 1
+            size -= entry_size
+            count -= 1
+        self._size, self._count = size, count
+        self.evicted += removed
+        return removed
+
+    def rows(self):
+        """Linhas (entradas e resultados) de todos os casos gravados, para reaproveitamento"""
+        rows = []
+        for _, _, path in self._entries():
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError, EOFError):
+                continue
+            if data.get("formato") == CACHE_FORMAT and data.get("linha"):
+                rows.append(data["linha"])
+        return rows
+
+    def clear(self):
+        """Remove todas as entradas"""
+        removed = sum(self._remove(path) for _, _, path in self._entries())
+        self._size, self._count = 0, 0
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'entradas': len(entries),
+            'bytes': sum(entry[1] for entry in entries),
+            'limite_bytes': self.max_bytes,
+            'limite_entradas': self.max_entries,
+            'acertos': self.hits,
+            'falhas': self.misses,
+            'gravacoes': self.writes,
+            'descartes': self.evicted,
+            'taxa_acerto': (self.hits / lookups * 100) if lookups else 0.0,
+        }
@@ -0,0 +1,127 @@
+"""Execução da simulação sem bloqueio: situação, tempo limite e cancelamento
+
+O Engine.Run2() síncrono prende o processo até o fim da simulação; um caso
+travado bloqueia o lote inteiro. run_engine_async() inicia o motor sem
+bloquear (Engine.Run2(True)), consulta Engine.IsRunning a cada
+poll_interval, interrompe com Engine.Stop() ao estourar o tempo limite ou ao
+ser cancelada e retorna a situação da execução (RunOutcome). As chamadas COM
+continuam na thread do laço de eventos, que é a que criou o documento.
+
+    outcome = await run_engine_async(backend, timeout=600)
+    if outcome.converged:
+        ...
+"""
+
+import asyncio
+import time
+from time import perf_counter
+
+from .nodes import RUN_ERRORS_PATH
+
+# Situação de uma execução da simulação
+STATUS_CONVERGED = "convergiu"
+STATUS_ERRORS = "com erros"         # o Aspen terminou com erros (PER_ERROR > 0)
+STATUS_UNKNOWN = "desconhecido"     # sem o nó de situação da execução (fontes offline)
+STATUS_FAILED = "falhou"            # exceção ao gravar as entradas ou executar
+STATUS_TIMEOUT = "tempo esgotado"   # interrompida pelo tempo limite
+STATUS_MISSING = "nos ausentes"     # modo estrito: nós exigidos indisponíveis
+
+# Situações em que os resultados da simulação podem ser analisados
+ANALYZABLE = (STATUS_CONVERGED, STATUS_UNKNOWN)
+
+
+def run_status(backend):
+    """(situação, número de erros) da última execução"""
+    try:
+        errors = backend.read_node(RUN_ERRORS_PATH)
+    except Exception:
+        return STATUS_UNKNOWN, None
+    if errors is None:
+        return STATUS_UNKNOWN, None
+    return (STATUS_CONVERGED if errors == 0 else STATUS_ERRORS), int(errors)
+
+
+class RunOutcome:
+    """Situação de uma execução: status, erros do Aspen, duração e mensagem"""
+
+    def __init__(self, status, errors=None, elapsed=0.0, message=None):
+        self.status = status
+        self.errors = errors
+        self.elapsed = elapsed
+        self.message = message
+
+    @property
+    def converged(self):
+        """Os resultados podem ser analisados (convergiu, ou fonte sem situação)"""
+        return self.status in ANALYZABLE
+
+    def __repr__(self):
+        return f"RunOutcome({self.status!r}, erros={self.errors}, {self.elapsed:.2f} s)"
+
+    def describe(self):
+        text = f"Situação da simulação: {self.status} ({self.elapsed:.2f} s"
+        text += f", {self.errors} erros)" if self.errors else ")"
+        if self.message:
+            text += f": {self.message}"
+        return text
+
+
+def _timed_out(backend, timeout, elapsed):
+    backend.stop()
+    return RunOutcome(STATUS_TIMEOUT, elapsed=elapsed, message=f"interrompida após {timeout:g} s")
+
+
+def run_engine(backend, timeout=None, poll_interval=0.5):
+    """Execução bloqueante seguida da leitura da situação
+
+    Sem timeout, chama Engine.Run2() e aguarda; com timeout, inicia o motor
+    sem bloquear e consulta a situação a cada poll_interval até o limite.
+    """
+    start = perf_counter()
+    try:
+        if timeout is None:
+            backend.run()
+        else:
+            backend.start_run()
+            while backend.is_running():
+                elapsed = perf_counter() - start
+                if elapsed >= timeout:
+                    return _timed_out(backend, timeout, elapsed)
+                time.sleep(min(poll_interval, timeout - elapsed))
+    except KeyboardInterrupt:
+        backend.stop()
+        raise
+    except Exception as e:
+        return RunOutcome(STATUS_FAILED, elapsed=perf_counter() - start, message=str(e))
+    return RunOutcome(*run_status(backend), elapsed=perf_counter() - start)
+
+
+async def run_engine_async(backend, timeout=None, poll_interval=0.5, progress=None):
+    """Inicia a simulação sem bloquear e aguarda o fim, o tempo limite ou o cancelamento
+
+    timeout: segundos de relógio até Engine.Stop() (None: sem limite)
+    progress: função progress(segundos decorridos) chamada a cada consulta
+    O cancelamento da tarefa interrompe a simulação antes de propagar o
+    CancelledError.
+    """
+    start = perf_counter()
+    try:
+        backend.start_run()
+    except Exception as e:
+        return RunOutcome(STATUS_FAILED, elapsed=perf_counter() - start, message=str(e))
+
+    try:
+        while backend.is_running():
+            elapsed = perf_counter() - start
+            if timeout is not None and elapsed >= timeout:
+                return _timed_out(backend, timeout, elapsed)
+            if progress is not None:
+                progress(elapsed)
+            await asyncio.sleep(poll_interval if timeout is None
+                                else min(poll_interval, max(timeout - elapsed, 0.0)))
+    except asyncio.CancelledError:
+        backend.stop()
+        raise
+    except Exception as e:
+        return RunOutcome(STATUS_FAILED, elapsed=perf_counter() - start, message=str(e))
+    return RunOutcome(*run_status(backend), elapsed=perf_counter() - start)
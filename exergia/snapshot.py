@@ -0,0 +1,110 @@
+"""Snapshots offline dos valores de nós lidos do Aspen Plus
+
+Um snapshot é um JSON compactado com gzip contendo todos os nós lidos pela
+análise, de modo que ela possa ser repetida sem o Aspen (por exemplo, em
+Linux). Formato (versão 2):
+
+    {
+        "formato": "exergia-snapshot",
+        "versao": 2,
+        "criado_em": "2024-01-01T12:00:00",
+        "metadados": {...},
+        "nos": {"\\Data\\Streams\\TGO-1\\...": 123.4, ...},
+        "ausentes": ["\\Data\\Blocks\\X\\Output\\QCALC", ...],
+        "sem_valor": ["\\Data\\Streams\\S-9\\Output\\STRM_UPP\\EXERGYFL\\MIXED\\TOTAL", ...],
+        "topologia": {"blocos": {...}}   (opcional, ver topology.py)
+    }
+
+"ausentes" são os nós que não existem na simulação e "sem_valor" os que
+existem mas não têm valor; a SnapshotBackend reproduz os dois casos (KeyError
+e None), como o Aspen. Snapshots da versão 1 juntavam ambos em "ausentes" e
+ainda são lidos, tratando todos como inexistentes.
+"""
+
+import datetime
+import gzip
+import json
+
+from .backends import DictBackend
+from .topology import Topology
+
+SNAPSHOT_FORMAT = "exergia-snapshot"
+SNAPSHOT_VERSION = 2
+# Versões que load_snapshot ainda aceita
+SUPPORTED_VERSIONS = (1, SNAPSHOT_VERSION)
+
+
+def save_snapshot(snapshot_path, values, missing=(), metadata=None, topology=None, no_value=()):
+    """Grava os valores dos nós (e a topologia, se descoberta) em um snapshot"""
+    data = {
+        "formato": SNAPSHOT_FORMAT,
+        "versao": SNAPSHOT_VERSION,
+        "criado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+        "metadados": metadata or {},
+        "nos": {path: float(value) for path, value in values.items()},
+        "ausentes": sorted(set(missing)),
+        "sem_valor": sorted(set(no_value)),
+    }
+    if topology is not None:
+        data["topologia"] = topology.to_dict()
+    with gzip.open(snapshot_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_snapshot(snapshot_path):
+    """Lê um arquivo de snapshot, validando formato e versão"""
+    with gzip.open(snapshot_path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if data.get("formato") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Arquivo não é um snapshot de análise exergética: {snapshot_path}")
+    if data.get("versao") not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Versão de snapshot não suportada: {data.get('versao')} "
+                         f"(esperada {SNAPSHOT_VERSION})")
+    data.setdefault("sem_valor", [])
+    return data
+
+
+def capture_snapshot(backend, node_paths, snapshot_path, metadata=None, topology=None):
+    """Lê os nós de uma fonte de dados (normalmente o Aspen) e grava o snapshot
+
+    read_nodes omite tanto os nós inexistentes quanto os sem valor; cada nó
+    omitido é lido de novo para separar os dois casos. Retorna (lidos,
+    ausentes, sem valor).
+    """
+    node_paths = list(node_paths)
+    values = backend.read_nodes(node_paths)
+    missing = []
+    no_value = []
+    for path in node_paths:
+        if path in values:
+            continue
+        try:
+            value = backend.read_node(path)
+        except Exception:
+            missing.append(path)
+            continue
+        if value is None:
+            no_value.append(path)
+        else:
+            values[path] = value
+    save_snapshot(snapshot_path, values, missing, metadata, topology, no_value)
+    return len(values), len(missing), len(no_value)
+
+
+class SnapshotBackend(DictBackend):
+    """Fonte de valores de nós baseada em um arquivo de snapshot"""
+
+    description = "snapshot"
+
+    def __init__(self, snapshot_path):
+        data = load_snapshot(snapshot_path)
+        topology = Topology.from_dict(data["topologia"]) if "topologia" in data else None
+        # Nós sem valor ficam com None, para que read_node os distinga dos ausentes
+        values = dict.fromkeys(data["sem_valor"])
+        values.update(data["nos"])
+        super().__init__(values, topology)
+        self.snapshot_path = snapshot_path
+        self.metadata = data["metadados"]
+        self.missing = set(data["ausentes"])  # Nós ausentes no momento da captura
+        self.no_value = set(data["sem_valor"])  # Nós existentes, mas sem valor
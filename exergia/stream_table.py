@@ -0,0 +1,117 @@
+"""Tabela de correntes: exergia (e outras propriedades) de todas as correntes
+
+Em vez de um FindNode absoluto por corrente, a coleção Data\\Streams é
+percorrida uma única vez e os valores vão para um array NumPy
+(correntes x propriedades), indexado por um dicionário nome -> linha. Valores
+ausentes ficam como NaN.
+"""
+
+import numpy as np
+
+from .nodes import STREAMS_COLLECTION, STREAM_PROPERTIES, split_node_path, stream_property_path
+from .prefetch import _find_relative, _read_value
+
+DEFAULT_PROPERTIES = ("EXERGYFL",)
+
+
+class StreamTable:
+    """Valores de propriedades de correntes em um array (correntes x propriedades)"""
+
+    def __init__(self, names, properties, values):
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.properties = tuple(properties)
+        self.property_index = {prop: j for j, prop in enumerate(self.properties)}
+        self.values = values
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, stream_name):
+        return stream_name in self.index
+
+    def column(self, prop="EXERGYFL"):
+        """Vetor da propriedade para todas as correntes, na ordem de self.names"""
+        return self.values[:, self.property_index[prop]]
+
+    def get(self, stream_name, prop="EXERGYFL"):
+        """Valor de uma corrente (None se a corrente ou o valor não existir)"""
+        i = self.index.get(stream_name)
+        if i is None:
+            return None
+        value = self.values[i, self.property_index[prop]]
+        return None if np.isnan(value) else float(value)
+
+    def take(self, stream_names, prop="EXERGYFL", default=0.0):
+        """Vetor da propriedade para as correntes pedidas; ausentes usam o default
+
+        default pode ser um escalar ou um vetor com uma posição por corrente.
+        """
+        rows = np.array([self.index.get(name, -1) for name in stream_names], dtype=int)
+        values = np.full(len(rows), np.nan)
+        found = rows >= 0
+        values[found] = self.values[rows[found], self.property_index[prop]]
+        return np.where(np.isnan(values), default, values)
+
+    def count(self):
+        """Número de valores presentes (não NaN)"""
+        return int(np.count_nonzero(~np.isnan(self.values)))
+
+    def missing(self, prop="EXERGYFL"):
+        """Correntes sem valor para a propriedade"""
+        column = self.column(prop)
+        return [name for name, value in zip(self.names, column) if np.isnan(value)]
+
+    def node_values(self):
+        """{caminho do nó: valor} dos valores presentes"""
+        values = {}
+        for prop, j in self.property_index.items():
+            for name, value in zip(self.names, self.values[:, j]):
+                if not np.isnan(value):
+                    values[stream_property_path(name, prop)] = float(value)
+        return values
+
+
+def _walk_streams(aspen, properties):
+    """Percorre Data\\Streams uma vez lendo as propriedades de todas as correntes"""
+    collection = aspen.Tree.FindNode(STREAMS_COLLECTION)
+    names, rows = [], []
+    if collection is None:
+        return names, rows
+    segments = [STREAM_PROPERTIES[prop].split("\\") for prop in properties]
+    for element in collection.Elements:
+        names.append(element.Name)
+        rows.append([_read_value(_find_relative(element, ["Output", *relative])) for relative in segments])
+    return names, rows
+
+
+def _known_streams(backend):
+    """Nomes das correntes de uma fonte offline (a partir dos caminhos gravados)"""
+    names = {}
+    for node_path in getattr(backend, "values", {}):
+        parts = split_node_path(node_path)
+        if parts is not None and parts[0] == STREAMS_COLLECTION:
+            names[parts[1]] = None
+    return list(names)
+
+
+def read_stream_table(backend, stream_names=None, properties=DEFAULT_PROPERTIES):
+    """Lê a tabela de correntes de uma fonte de dados
+
+    stream_names=None lê todas as correntes da simulação: no Aspen, a coleção
+    é percorrida uma única vez; em fontes offline, as correntes gravadas.
+    Com nomes dados, a leitura é um único read_nodes em lote.
+    """
+    properties = tuple(properties)
+    document = getattr(backend, "document", None)
+    if stream_names is None and document is not None:
+        names, rows = _walk_streams(document, properties)
+        values = np.array([[np.nan if v is None else v for v in row] for row in rows],
+                          dtype=float).reshape(len(names), len(properties))
+        return StreamTable(names, properties, values)
+
+    names = list(stream_names) if stream_names is not None else _known_streams(backend)
+    paths = [stream_property_path(name, prop) for name in names for prop in properties]
+    read = backend.read_nodes(paths)
+    values = np.array([read.get(path, np.nan) for path in paths], dtype=float)
+    return StreamTable(names, properties, values.reshape(len(names), len(properties)))
@@ -0,0 +1,439 @@
+"""Modelos substitutos das perdas e eficiências por equipamento
+
+Cada caso de uma varredura custa uma execução do Aspen. Com algumas dezenas
+de casos já calculados (linhas de um SweepTable ou do ResultCache), um
+SurrogateModel prevê as perdas (perda_<bloco>, perda_total_planta) e as
+eficiências (eficiencia_<bloco>, eficiencia_completa, ...) de um novo ponto
+de operação em microssegundos, para triagem de cenários antes de gastar
+simulações. Só usa NumPy:
+
+- "polinomial": polinômio de grau degree nas entradas escaladas para
+  [-1, 1], ajustado por mínimos quadrados com regularização ridge;
+- "rbf": funções de base radial cúbicas (r³) com termo linear, que
+  interpolam os casos de treino (ou os suavizam, com smoothing > 0).
+
+O modelo informa o próprio erro: validate() faz validação cruzada k-fold e
+guarda o RMSE, o MAE, o erro máximo e o R² de cada saída. Sem um tipo
+definido, fit_surrogate() ajusta os candidatos de CANDIDATES e fica com o de
+menor erro relativo médio.
+
+    python -m exergia.surrogate resultados.json --saida substituto.json
+
+    model = fit_surrogate(SweepTable.load("resultados.json"))
+    print(model.report())
+    model.predict_case({"\\Data\\Blocks\\E-1\\Input\\TEMP": 315.0})
+"""
+
+import argparse
+import itertools
+import json
+from time import perf_counter
+
+import numpy as np
+
+from .result_cache import ResultCache
+from .runner import ANALYZABLE
+from .sweep import SweepTable
+
+SURROGATE_FORMAT = "exergia-substituto"
+SURROGATE_VERSION = 1
+KINDS = ("polinomial", "rbf")
+
+# Candidatos de select_surrogate(): (tipo, opções)
+CANDIDATES = (
+    ("polinomial", {"degree": 1}),
+    ("polinomial", {"degree": 2}),
+    ("polinomial", {"degree": 3}),
+    ("rbf", {}),
+)
+
+_OUTPUT_PREFIXES = ("perda_", "eficiencia_")
+
+# Desvio padrão relativo abaixo do qual uma saída é tratada como constante
+CONSTANT_TOLERANCE = 1e-9
+
+
+def _is_input(column):
+    # As entradas da varredura são caminhos de nós do Aspen
+    return column.startswith("\\")
+
+
+def training_data(source, inputs=None, outputs=None):
+    """(X, Y, entradas, saídas) dos casos analisados de um SweepTable ou de uma lista de linhas
+
+    inputs: colunas de entrada (padrão: as entradas da tabela, ou as colunas
+        que são caminhos de nós)
+    outputs: colunas previstas (padrão: todas as perda_* e eficiencia_*)
+    Casos sem algum dos valores ficam de fora.
+    """
+    rows = [row for row in source
+            if row.get("status") in ANALYZABLE and "eficiencia_completa" in row]
+    if inputs is None:
+        inputs = getattr(source, "parameters", None) or [
+            column for column in dict.fromkeys(key for row in rows for key in row) if _is_input(column)]
+    if outputs is None:
+        outputs = [column for column in dict.fromkeys(key for row in rows for key in row)
+                   if column.startswith(_OUTPUT_PREFIXES)]
+    inputs, outputs = list(inputs), list(outputs)
+    if not inputs or not outputs:
+        raise ValueError("Sem colunas de entrada ou de saída para o modelo substituto")
+
+    columns = inputs + outputs
+    values = []
+    for row in rows:
+        try:
+            values.append([float(row[column]) for column in columns])
+        except (KeyError, TypeError, ValueError):
+            continue
+    data = np.array(values, dtype=float).reshape(len(values), len(columns))
+    data = data[np.isfinite(data).all(axis=1)]
+    return data[:, :len(inputs)], data[:, len(inputs):], inputs, outputs
+
+
+def _as_arrays(X, Y):
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    X = X.reshape(len(X), -1)
+    Y = Y.reshape(len(Y), -1)
+    if len(X) != len(Y):
+        raise ValueError(f"{len(X)} casos de entrada para {len(Y)} de saída")
+    return X, Y
+
+
+def _cubic(Z, centers):
+    """Matriz r³ das distâncias entre os pontos e os centros"""
+    distances = np.sqrt(((Z[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1))
+    return distances ** 3
+
+
+def _linear(Z):
+    return np.hstack([np.ones((len(Z), 1)), Z])
+
+
+def validation_metrics(Y, predicted, outputs, method):
+    """Erros por saída (RMSE, MAE, erro máximo, R², RMSE relativo ao desvio padrão)"""
+    error = predicted - Y
+    rmse = np.sqrt((error ** 2).mean(axis=0))
+    mae = np.abs(error).mean(axis=0)
+    max_error = np.abs(error).max(axis=0)
+    spread = Y.std(axis=0)
+    total = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+    residual = (error ** 2).sum(axis=0)
+    # Saída constante nos casos (a menos do arredondamento): R² e erro relativo indefinidos
+    constant = spread <= CONSTANT_TOLERANCE * np.abs(Y).max(axis=0)
+
+    per_output = {}
+    for j, name in enumerate(outputs):
+        per_output[name] = {
+            'rmse': float(rmse[j]),
+            'mae': float(mae[j]),
+            'erro_max': float(max_error[j]),
+            'r2': None if constant[j] else float(1.0 - residual[j] / total[j]),
+            'rmse_relativo': None if constant[j] else float(rmse[j] / spread[j]),
+        }
+    relative = [metrics['rmse_relativo'] for metrics in per_output.values()
+                if metrics['rmse_relativo'] is not None]
+    return {
+        'metodo': method,
+        'casos': len(Y),
+        'rmse_relativo_medio': float(np.mean(relative)) if relative else 0.0,
+        'saidas': per_output,
+    }
+
+
+class SurrogateModel:
+    """Regressão das saídas (perdas, eficiências) em função das entradas da varredura
+
+    kind: "polinomial" ou "rbf"
+    degree: grau do polinômio
+    ridge: regularização do ajuste polinomial (entradas escaladas para [-1, 1])
+    smoothing: suavização da RBF (0: passa exatamente pelos casos de treino)
+    """
+
+    def __init__(self, kind="polinomial", degree=2, ridge=1e-8, smoothing=0.0):
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de modelo desconhecido: {kind} (esperado {', '.join(KINDS)})")
+        self.kind = kind
+        self.degree = degree
+        self.ridge = ridge
+        self.smoothing = smoothing
+        self.inputs = []
+        self.outputs = []
+        self.n_samples = 0
+        self.validation = None
+        self._lower = None
+        self._span = None
+        self._terms = None          # polinomial: índices das entradas de cada termo
+        self._coefficients = None   # polinomial: termos x saídas; rbf: termo linear
+        self._centers = None        # rbf: casos de treino escalados
+        self._weights = None        # rbf: centros x saídas
+
+    @property
+    def options(self):
+        if self.kind == "polinomial":
+            return {'degree': self.degree, 'ridge': self.ridge}
+        return {'smoothing': self.smoothing}
+
+    def describe(self):
+        name = f"polinomial de grau {self.degree}" if self.kind == "polinomial" else "RBF cúbica"
+        return f"{name} ({self.n_samples} casos, {len(self.inputs)} entradas, {len(self.outputs)} saídas)"
+
+    def __repr__(self):
+        return f"SurrogateModel({self.describe()})"
+
+    def _scale(self, X):
+        return 2.0 * (X - self._lower) / self._span - 1.0
+
+    def _features(self, Z):
+        features = np.ones((len(Z), len(self._terms)))
+        for j, term in enumerate(self._terms):
+            for i in term:
+                features[:, j] *= Z[:, i]
+        return features
+
+    def fit(self, X, Y, inputs=None, outputs=None):
+        """Ajusta o modelo aos casos X (casos x entradas) -> Y (casos x saídas)"""
+        X, Y = _as_arrays(X, Y)
+        n, p = X.shape
+        self.inputs = list(inputs) if inputs is not None else [f"x{i}" for i in range(p)]
+        self.outputs = list(outputs) if outputs is not None else [f"y{j}" for j in range(Y.shape[1])]
+        if n == 0:
+            raise ValueError("Nenhum caso para ajustar o modelo substituto")
+
+        self._lower = X.min(axis=0)
+        span = X.max(axis=0) - self._lower
+        # Entradas constantes nos casos de treino não são escaladas
+        self._span = np.where(span > 0, span, 1.0)
+        Z = self._scale(X)
+
+        if self.kind == "polinomial":
+            self._terms = [term for k in range(self.degree + 1)
+                           for term in itertools.combinations_with_replacement(range(p), k)]
+            if n < len(self._terms):
+                raise ValueError(f"O polinômio de grau {self.degree} em {p} entradas precisa de "
+                                 f"ao menos {len(self._terms)} casos ({n} disponíveis)")
+            features = self._features(Z)
+            regularization = np.sqrt(self.ridge) * np.eye(len(self._terms))
+            self._coefficients = np.linalg.lstsq(np.vstack([features, regularization]),
+                                                 np.vstack([Y, np.zeros((len(self._terms), Y.shape[1]))]),
+                                                 rcond=None)[0]
+        else:
+            # Casos repetidos (mesmas entradas) viram um único centro com a média das saídas
+            Z, index = np.unique(Z, axis=0, return_inverse=True)
+            index = index.reshape(-1)
+            Y = np.stack([np.bincount(index, weights=column) for column in Y.T], axis=1) \
+                / np.bincount(index)[:, None]
+            n = len(Z)
+            if n < p + 1:
+                raise ValueError(f"A RBF em {p} entradas precisa de ao menos {p + 1} casos distintos "
+                                 f"({n} disponíveis)")
+            tail = _linear(Z)
+            system = np.block([[_cubic(Z, Z) + self.smoothing * np.eye(n), tail],
+                               [tail.T, np.zeros((p + 1, p + 1))]])
+            rhs = np.vstack([Y, np.zeros((p + 1, Y.shape[1]))])
+            try:
+                solution = np.linalg.solve(system, rhs)
+            except np.linalg.LinAlgError:
+                # Entradas constantes ou casos alinhados: sistema singular
+                solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+            self._centers = Z
+            self._weights = solution[:n]
+            self._coefficients = solution[n:]
+        self.n_samples = len(X)
+        return self
+
+    def predict(self, X):
+        """Previsões (casos x saídas); um único ponto (vetor de entradas) dá um vetor de saídas"""
+        if self._coefficients is None:
+            raise RuntimeError("Modelo substituto não ajustado (chame fit())")
+        X = np.asarray(X, dtype=float)
+        single = X.ndim == 1
+        Z = self._scale(X.reshape(-1, len(self.inputs)))
+        if self.kind == "polinomial":
+            Y = self._features(Z) @ self._coefficients
+        else:
+            Y = _cubic(Z, self._centers) @ self._weights + _linear(Z) @ self._coefficients
+        return Y[0] if single else Y
+
+    def predict_case(self, case):
+        """{saída: previsão} para um caso {caminho: valor}"""
+        missing = [path for path in self.inputs if path not in case]
+        if missing:
+            raise KeyError(f"Entradas ausentes do caso: {', '.join(missing)}")
+        values = self.predict([case[path] for path in self.inputs])
+        return dict(zip(self.outputs, values.tolist()))
+
+    def validate(self, X, Y, folds=5, seed=0):
+        """Validação cruzada k-fold: ajusta sem cada parte e prevê a parte deixada de fora
+
+        O resultado (ver validation_metrics) fica em self.validation.
+        """
+        X, Y = _as_arrays(X, Y)
+        folds = min(folds, len(X))
+        if folds < 2:
+            raise ValueError("A validação cruzada precisa de ao menos 2 casos")
+        order = np.random.default_rng(seed).permutation(len(X))
+        predicted = np.empty_like(Y)
+        for part in np.array_split(order, folds):
+            train = np.setdiff1d(order, part)
+            model = SurrogateModel(self.kind, **self.options).fit(X[train], Y[train])
+            predicted[part] = model.predict(X[part])
+        outputs = self.outputs or [f"y{j}" for j in range(Y.shape[1])]
+        self.validation = validation_metrics(Y, predicted, outputs,
+                                             f"validação cruzada ({folds} partes)")
+        return self.validation
+
+    def report(self):
+        """Texto com o modelo e o erro de validação de cada saída"""
+        lines = [f"Modelo substituto: {self.describe()}"]
+        if self.validation is None:
+            lines.append("Sem validação (chame validate())")
+            return "\n".join(lines)
+        lines.append(f"Erro de {self.validation['metodo']}, "
+                     f"RMSE relativo médio {self.validation['rmse_relativo_medio']:.3f}:")
+        lines.append(f"  {'saída':<32} {'RMSE':>12} {'MAE':>12} {'erro máx':>12} {'R²':>8}")
+        for name, metrics in self.validation['saidas'].items():
+            r2 = f"{metrics['r2']:.4f}" if metrics['r2'] is not None else "-"
+            lines.append(f"  {name:<32} {metrics['rmse']:>12.4g} {metrics['mae']:>12.4g} "
+                         f"{metrics['erro_max']:>12.4g} {r2:>8}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        data = {
+            'formato': SURROGATE_FORMAT,
+            'versao': SURROGATE_VERSION,
+            'tipo': self.kind,
+            'opcoes': self.options,
+            'entradas': self.inputs,
+            'saidas': self.outputs,
+            'casos': self.n_samples,
+            'validacao': self.validation,
+            'minimo': self._lower.tolist(),
+            'escala': self._span.tolist(),
+            'coeficientes': self._coefficients.tolist(),
+        }
+        if self.kind == "polinomial":
+            data['termos'] = [list(term) for term in self._terms]
+        else:
+            data['centros'] = self._centers.tolist()
+            data['pesos'] = self._weights.tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('formato') != SURROGATE_FORMAT or data.get('versao') != SURROGATE_VERSION:
+            raise ValueError("Arquivo não é um modelo substituto desta versão")
+        model = cls(data['tipo'], **data['opcoes'])
+        model.inputs = data['entradas']
+        model.outputs = data['saidas']
+        model.n_samples = data['casos']
+        model.validation = data['validacao']
+        model._lower = np.array(data['minimo'])
+        model._span = np.array(data['escala'])
+        model._coefficients = np.array(data['coeficientes']).reshape(-1, len(model.outputs))
+        if model.kind == "polinomial":
+            model._terms = [tuple(term) for term in data['termos']]
+        else:
+            model._centers = np.array(data['centros']).reshape(-1, len(model.inputs))
+            model._weights = np.array(data['pesos']).reshape(-1, len(model.outputs))
+        return model
+
+    def save(self, json_path):
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, json_path):
+        with open(json_path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def select_surrogate(X, Y, inputs=None, outputs=None, candidates=CANDIDATES, folds=5, seed=0):
+    """Ajusta e valida cada candidato (tipo, opções); retorna o de menor erro relativo médio
+
+    Candidatos sem casos suficientes são ignorados. O erro de todos os
+    candidatos fica em model.validation['candidatos'].
+    """
+    best = None
+    compared = []
+    for kind, options in candidates:
+        model = SurrogateModel(kind, **options)
+        try:
+            model.fit(X, Y, inputs, outputs)
+            model.validate(X, Y, folds, seed)
+        except ValueError:
+            continue
+        compared.append({'tipo': kind, 'opcoes': model.options,
+                         'rmse_relativo_medio': model.validation['rmse_relativo_medio']})
+        if best is None or model.validation['rmse_relativo_medio'] < best.validation['rmse_relativo_medio']:
+            best = model
+    if best is None:
+        raise ValueError(f"Casos insuficientes para qualquer modelo substituto ({len(X)} casos)")
+    best.validation['candidatos'] = compared
+    return best
+
+
+def fit_surrogate(source, inputs=None, outputs=None, kind=None, folds=5, seed=0, **options):
+    """Modelo substituto validado das linhas de um SweepTable (ou lista de linhas)
+
+    kind: "polinomial", "rbf" ou None (escolhe entre CANDIDATES)
+    """
+    X, Y, inputs, outputs = training_data(source, inputs, outputs)
+    if kind is None:
+        return select_surrogate(X, Y, inputs, outputs, folds=folds, seed=seed)
+    model = SurrogateModel(kind, **options).fit(X, Y, inputs, outputs)
+    model.validate(X, Y, folds, seed)
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ajusta um modelo substituto das perdas e eficiências a resultados de varreduras")
+    parser.add_argument("tabelas", nargs="*", help="tabelas de resultados da varredura (.csv ou .json)")
+    parser.add_argument("--cache-resultados", metavar="DIRETORIO",
+                        help="usa também os casos gravados no cache de resultados")
+    parser.add_argument("--tipo", choices=KINDS, help="tipo de modelo (padrão: o de menor erro)")
+    parser.add_argument("--grau", type=int, default=2, help="grau do polinômio (--tipo polinomial)")
+    parser.add_argument("--suavizacao", type=float, default=0.0, help="suavização da RBF (--tipo rbf)")
+    parser.add_argument("--partes", type=int, default=5, help="partes da validação cruzada")
+    parser.add_argument("--saida", help="grava o modelo ajustado (.json)")
+    args = parser.parse_args(argv)
+
+    if not args.tabelas and not args.cache_resultados:
+        parser.error("informe ao menos uma tabela ou --cache-resultados")
+    rows, inputs = [], []
+    for table_path in args.tabelas:
+        table = SweepTable.load(table_path)
+        rows += table.rows
+        inputs += [path for path in table.parameters if path not in inputs]
+    if args.cache_resultados:
+        rows += ResultCache(args.cache_resultados).rows()
+
+    options = {}
+    if args.tipo == "polinomial":
+        options['degree'] = args.grau
+    elif args.tipo == "rbf":
+        options['smoothing'] = args.suavizacao
+    try:
+        model = fit_surrogate(rows, inputs or None, kind=args.tipo, folds=args.partes, **options)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(model.report())
+    for candidate in (model.validation or {}).get('candidatos', ()):
+        print(f"  candidato {candidate['tipo']} {candidate['opcoes']}: "
+              f"RMSE relativo médio {candidate['rmse_relativo_medio']:.3f}")
+    point = np.array(model._lower)
+    repeats = 1000
+    start = perf_counter()
+    for _ in range(repeats):
+        model.predict(point)
+    print(f"Previsão de um caso: {(perf_counter() - start) / repeats * 1e6:.1f} µs")
+    if args.saida:
+        model.save(args.saida)
+        print(f"Modelo gravado em {args.saida}")
+    return model
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,508 @@
+"""Varredura paramétrica: altera entradas do Aspen, executa e analisa cada caso
+
+Em vez de editar o .apw à mão e rodar a análise de novo para cada ponto de
+operação, a varredura abre o documento uma única vez (um InitFromArchive2) e,
+para cada caso, grava os valores de entrada pelo backend, executa o
+Engine.Run2, verifica a convergência e roda o pré-carregamento seguido da
+análise vetorizada. Com run_async(), a simulação de um caso corre enquanto o
+anterior é analisado. Cada caso vira uma linha de um SweepTable. Os casos vêm
+de um fatorial completo ou de uma lista (CSV ou JSON):
+
+    python -m exergia.sweep rtc --variar "\\Data\\Blocks\\E-1\\Input\\TEMP=300,310,320"
+    python -m exergia.sweep rtc --casos casos.csv --saida resultados.csv
+
+As entradas são caminhos de nós do Aspen (ver nodes.block_input_path e
+nodes.stream_input_path). Testes sem o Aspen usam um FakeAspenDocument com um
+modelo que recalcula as saídas a cada execução.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+from time import perf_counter
+
+from .analyzer import AspenAnalyzer
+from .backends import COMBackend
+from .flowsheet import load_flowsheet
+from .node_store import archive_hash
+from .nodes import MissingNodesError
+from .result_cache import ResultCache, result_key
+from .runner import (ANALYZABLE, STATUS_FAILED, STATUS_MISSING, RunOutcome, run_engine,
+                     run_engine_async)
+
+
+def full_factorial(parameters):
+    """Todos os casos {caminho: valor} do produto dos valores de cada entrada
+
+    parameters: {caminho do nó: [valores]}; a última entrada varia mais rápido.
+    """
+    paths = list(parameters)
+    return [dict(zip(paths, values)) for values in itertools.product(*parameters.values())]
+
+
+def _parse_value(text):
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _parse_cell(column, text):
+    if text in ("True", "False"):
+        return text == "True"
+    if column == "caso":
+        return int(text)
+    return _parse_value(text)
+
+
+def parse_parameter(text):
+    """"caminho=v1,v2,..." (argumento --variar) -> (caminho, [valores])"""
+    path, sep, values = text.rpartition("=")
+    if not sep or not path:
+        raise ValueError(f"Parâmetro inválido (esperado caminho=v1,v2,...): {text}")
+    return path.strip(), [_parse_value(value) for value in values.split(",")]
+
+
+def check_cases(cases):
+    """Exige que todos os casos definam as mesmas entradas
+
+    Uma entrada ausente de um caso ficaria no valor original do .apw, mas a
+    tabela de resultados não mostraria esse valor; listas irregulares são
+    recusadas.
+    """
+    paths = set(cases[0]) if cases else set()
+    for index, case in enumerate(cases):
+        if set(case) != paths:
+            missing = sorted(paths - set(case)) or sorted(set(case) - paths)
+            raise ValueError(f"Os casos precisam definir as mesmas entradas: o caso {index} "
+                             f"difere do caso 0 em {', '.join(missing)}")
+    return cases
+
+
+def load_cases(cases_path):
+    """Lista de casos de um CSV (uma coluna por caminho) ou JSON ([{caminho: valor}])
+
+    Células vazias e casos com entradas diferentes são recusados (ValueError).
+    """
+    if cases_path.lower().endswith(".json"):
+        with open(cases_path, encoding="utf-8") as f:
+            return check_cases(json.load(f))
+    with open(cases_path, newline="", encoding="utf-8-sig") as f:
+        return check_cases([{path: _parse_value(value) for path, value in row.items() if value and value.strip()}
+                            for row in csv.DictReader(f)])
+
+
+class SweepTable:
+    """Resultados da varredura: uma linha (dicionário) por caso
+
+    Colunas: caso, as entradas, situação da execução (ver runner.py), erros
+    do Aspen, nós ausentes, tempo, os resultados de full_exergy_analysis() e a perda e a
+    eficiência de cada equipamento (perda_<bloco>, eficiencia_<bloco>).
+    """
+
+    def __init__(self, parameters=()):
+        self.parameters = list(parameters)
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    @property
+    def columns(self):
+        columns = ["caso", *self.parameters, "status", "erros_aspen", "nos_ausentes", "tempo_s"]
+        for row in self.rows:
+            columns += [key for key in row if key not in columns]
+        return columns
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def column(self, name):
+        """Valores de uma coluna (None nos casos sem o valor)"""
+        return [row.get(name) for row in self.rows]
+
+    def converged(self):
+        """Linhas dos casos que convergiram (ou sem situação conhecida) e foram analisados"""
+        return [row for row in self.rows
+                if row["status"] in ANALYZABLE and "eficiencia_completa" in row]
+
+    def array(self, columns, converged_only=True):
+        """Array NumPy (casos x colunas); valores ausentes viram NaN"""
+        import numpy as np
+
+        rows = self.converged() if converged_only else self.rows
+        return np.array([[np.nan if row.get(c) is None else row[c] for c in columns] for row in rows],
+                        dtype=float).reshape(len(rows), len(columns))
+
+    def to_csv(self, csv_path):
+        columns = self.columns
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, columns)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def to_json(self, json_path):
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"colunas": self.columns, "entradas": self.parameters, "casos": self.rows},
+                      f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, table_path):
+        """Lê uma tabela gravada por to_json() ou to_csv()"""
+        if table_path.lower().endswith(".json"):
+            with open(table_path, encoding="utf-8") as f:
+                data = json.load(f)
+            table = cls(data.get("entradas", ()))
+            table.rows = data["casos"]
+            return table
+        with open(table_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            # As entradas ficam entre "caso" e "status" (ver columns)
+            columns = reader.fieldnames or []
+            parameters = columns[1:columns.index("status")] if "status" in columns else []
+            table = cls(parameters)
+            for row in reader:
+                table.add({column: _parse_cell(column, value) for column, value in row.items() if value != ""})
+        return table
+
+
+class ParametricSweep:
+    """Executa casos em um único documento do Aspen aberto
+
+    restore: ao final, as entradas alteradas voltam aos valores originais
+    reinit_on_failure: após um caso sem convergência, descarta as estimativas
+        (Engine.Reinit) para que o próximo caso não parta de uma solução ruim
+    quiet: suprime as mensagens do analisador em cada caso
+    timeout: segundos de relógio por simulação; o caso que passar do limite é
+        interrompido (Engine.Stop) e marcado como "tempo esgotado"
+    result_cache: ResultCache; casos já calculados (mesmas entradas, .apw,
+        fluxograma e T0) voltam do cache sem tocar no Aspen
+    """
+
+    def __init__(self, flowsheet, backend=None, strict=False, restore=True, reinit_on_failure=True,
+                 quiet=True, timeout=None, poll_interval=0.5, result_cache=None):
+        self.analyzer = AspenAnalyzer(flowsheet, backend=backend, strict=strict)
+        self.backend = self.analyzer.backend
+        self.restore = restore
+        self.reinit_on_failure = reinit_on_failure
+        self.quiet = quiet
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.result_cache = result_cache
+        self.file_path = None
+        self.archive_digest = None
+        self._connected = False
+        self._original_inputs = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def open(self, file_path=None):
+        """Abre o documento uma vez para todos os casos
+
+        Com result_cache, a abertura fica para o primeiro caso que não
+        estiver no cache: uma varredura repetida não abre o Aspen.
+        """
+        self.file_path = file_path or self.analyzer.flowsheet.aspen_file
+        self._original_inputs = {}
+        if self.result_cache is None:
+            self._connect()
+        elif os.path.exists(self.file_path):
+            self.archive_digest = archive_hash(self.file_path)
+
+    def _connect(self):
+        if not self._connected:
+            self.backend.connect(self.file_path)
+            self._connected = True
+
+    def close(self):
+        """Restaura as entradas originais (se pedido) e fecha o documento"""
+        if self.file_path is None:
+            return
+        try:
+            if self._connected and self.restore:
+                for path, value in self._original_inputs.items():
+                    self.backend.write_node(path, value)
+        finally:
+            if self._connected:
+                self.backend.close()
+            self._connected = False
+            self.file_path = None
+
+    def _write_inputs(self, case):
+        """Grava as entradas do caso
+
+        Entradas alteradas por casos anteriores e ausentes deste voltam ao
+        valor original, de modo que o caso roda exatamente com as entradas
+        registradas na linha.
+        """
+        for path, value in self._original_inputs.items():
+            if path not in case:
+                self.backend.write_node(path, value)
+        for path, value in case.items():
+            previous = self.backend.write_node(path, value)
+            self._original_inputs.setdefault(path, previous)
+
+    def _execute(self, case):
+        """Grava as entradas e executa o caso (com tempo limite, se definido)"""
+        try:
+            self._connect()
+            self._write_inputs(case)
+        except Exception as e:
+            return RunOutcome(STATUS_FAILED, message=str(e))
+        return run_engine(self.backend, self.timeout, self.poll_interval)
+
+    async def _execute_async(self, case, progress=None):
+        try:
+            self._connect()
+            self._write_inputs(case)
+        except Exception as e:
+            return RunOutcome(STATUS_FAILED, message=str(e))
+        return await run_engine_async(self.backend, self.timeout, self.poll_interval, progress)
+
+    def _read_results(self, row, outcome):
+        """Registra a situação da execução e lê os nós do caso
+
+        Retorna (ex, d, nós lidos, nós ausentes), ou None se o caso não
+        puder ser analisado.
+        """
+        row["status"], row["erros_aspen"] = outcome.status, outcome.errors
+        row["tempo_simulacao_s"] = outcome.elapsed
+        if outcome.message:
+            row["mensagem"] = outcome.message
+
+        analyzer = self.analyzer
+        analyzer.clear_node_cache()
+        if not outcome.converged:
+            if self.reinit_on_failure:
+                self.backend.reinit()
+            return None
+        try:
+            with contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext():
+                analyzer.prefetch_nodes()
+        except MissingNodesError as e:
+            row["status"] = STATUS_MISSING
+            row["mensagem"] = str(e)
+            return None
+        finally:
+            row["nos_ausentes"] = len(analyzer.missing_nodes())
+        ex, d = analyzer._balance_vectors(analyzer.balance_model())
+        return ex, d, dict(analyzer._node_cache), list(analyzer.missing_nodes())
+
+    def _analyze(self, row, captured, key=None):
+        """Balanço vetorizado do caso a partir dos valores lidos; grava no cache"""
+        if captured is None:
+            return row
+        ex, d, nodes, missing = captured
+        result = self.analyzer.balance_model().evaluate(ex, d, self.analyzer.T0)
+        results = result.as_results()
+        row.update(results)
+        row.update({f"perda_{name}": loss for name, loss in result.equipment_losses()})
+        row.update({f"eficiencia_{name}": value for name, value in result.equipment_efficiencies()})
+        if key is not None:
+            cached_row = {column: value for column, value in row.items()
+                          if column not in ("caso", "tempo_s", "tempo_simulacao_s", "cache")}
+            self.result_cache.put(key, results, nodes, missing, cached_row,
+                                  {'fluxograma': self.analyzer.flowsheet.name, 'arquivo': self.file_path})
+        return row
+
+    def _cache_key(self, case):
+        """Chave do caso no cache de resultados
+
+        O caso é o estado completo das entradas: antes de cada execução,
+        _write_inputs devolve ao valor original as entradas que ele não
+        define. Um acerto não grava nada no documento; o próximo caso
+        executado restaura o que ficou do anterior.
+        """
+        if self.result_cache is None:
+            return None
+        return result_key(self.analyzer.flowsheet, case, self.analyzer.T0, self.archive_digest)
+
+    def _from_cache(self, row, key):
+        """Preenche a linha com o resultado gravado para a chave, se houver"""
+        if key is None:
+            return False
+        entry = self.result_cache.get(key)
+        row["cache"] = entry is not None
+        if entry is not None:
+            row.update(entry["linha"])
+        return row["cache"]
+
+    def run_case(self, case, index=0):
+        """Grava as entradas, executa, verifica a convergência e analisa um caso"""
+        row = {"caso": index, **case}
+        start = perf_counter()
+        with self.analyzer.tracer.span("caso", caso=index):
+            key = self._cache_key(case)
+            if not self._from_cache(row, key):
+                self._analyze(row, self._read_results(row, self._execute(case)), key)
+        row["tempo_s"] = perf_counter() - start
+        return row
+
+    async def run_case_async(self, case, index=0, progress=None):
+        """Como run_case(), sem bloquear o laço de eventos durante a simulação"""
+        row = {"caso": index, **case}
+        start = perf_counter()
+        with self.analyzer.tracer.span("caso", caso=index):
+            key = self._cache_key(case)
+            if not self._from_cache(row, key):
+                outcome = await self._execute_async(case, progress)
+                self._analyze(row, self._read_results(row, outcome), key)
+        row["tempo_s"] = perf_counter() - start
+        return row
+
+    async def run_async(self, cases, file_path=None, callback=None):
+        """Como run(), sobrepondo a simulação de cada caso à análise do anterior
+
+        Os nós de um caso são lidos logo que ele termina; o balanço e o
+        callback desse caso rodam enquanto o motor já calcula o seguinte.
+        """
+        cases = check_cases(list(cases))
+        table = SweepTable(dict.fromkeys(path for case in cases for path in case))
+        tracer = self.analyzer.tracer
+        opened_here = self.file_path is None
+        if opened_here:
+            self.open(file_path)
+        previous = None
+        try:
+            for index, case in enumerate(cases):
+                row = {"caso": index, **case}
+                start = perf_counter()
+                token = tracer.start("caso")
+                key = self._cache_key(case)
+                if self._from_cache(row, key):
+                    if previous is not None:
+                        self._finish_async_case(table, *previous, callback)
+                    self._finish_async_case(table, row, None, None, start, token, callback)
+                    previous = None
+                    continue
+                execution = asyncio.ensure_future(self._execute_async(case))
+                # Deixa a tarefa gravar as entradas e iniciar o motor antes da análise
+                await asyncio.sleep(0)
+                if previous is not None:
+                    self._finish_async_case(table, *previous, callback)
+                previous = (row, self._read_results(row, await execution), key, start, token)
+            if previous is not None:
+                self._finish_async_case(table, *previous, callback)
+        finally:
+            if opened_here:
+                self.close()
+        return table
+
+    def _finish_async_case(self, table, row, captured, key, start, token, callback):
+        self._analyze(row, captured, key)
+        row["tempo_s"] = perf_counter() - start
+        self.analyzer.tracer.finish("caso", token, caso=row["caso"])
+        table.add(row)
+        if callback is not None:
+            callback(row)
+
+    def run(self, cases, file_path=None, callback=None):
+        """Executa todos os casos e retorna o SweepTable
+
+        Abre o documento se ainda não estiver aberto (e o fecha ao final
+        nesse caso). callback(linha) é chamado após cada caso.
+        """
+        cases = check_cases(list(cases))
+        table = SweepTable(dict.fromkeys(path for case in cases for path in case))
+        opened_here = self.file_path is None
+        if opened_here:
+            self.open(file_path)
+        try:
+            for index, case in enumerate(cases):
+                row = self.run_case(case, index)
+                table.add(row)
+                if callback is not None:
+                    callback(row)
+        finally:
+            if opened_here:
+                self.close()
+        return table
+
+
+def _print_row(row):
+    efficiency = row.get("eficiencia_completa")
+    efficiency = f"{efficiency:.2f}%" if efficiency is not None else "-"
+    elapsed = f"({row['tempo_s']:.2f} s)" if "tempo_s" in row else ""
+    print(f"Caso {row['caso']:>4}: {row['status']:<18} eficiência completa {efficiency:>9} {elapsed}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura paramétrica de entradas do Aspen Plus")
+    parser.add_argument("fluxograma", help="variante (nome em flowsheets/ ou arquivo JSON/TOML)")
+    parser.add_argument("--arquivo", help="arquivo .apw (substitui o definido no fluxograma)")
+    parser.add_argument("--variar", action="append", default=[], metavar="CAMINHO=V1,V2,...",
+                        help="entrada e valores do fatorial completo (repita para várias entradas)")
+    parser.add_argument("--casos", help="lista de casos em CSV (uma coluna por caminho) ou JSON")
+    parser.add_argument("--saida", help="grava a tabela de resultados (.csv ou .json)")
+    parser.add_argument("--tempo-limite", type=float,
+                        help="interrompe a simulação de um caso após S segundos")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="executa os casos em N processos, cada um com a própria instância do Aspen")
+    parser.add_argument("--estrito", action="store_true",
+                        help="casos com nós exigidos ausentes não são analisados")
+    parser.add_argument("--cache-resultados", metavar="DIRETORIO",
+                        help="reaproveita resultados de casos já calculados (diretório compartilhável)")
+    parser.add_argument("--cache-limite-mb", type=float, default=256,
+                        help="tamanho máximo do cache de resultados (MB)")
+    parser.add_argument("--manter-entradas", action="store_true",
+                        help="não restaura as entradas originais ao final")
+    args = parser.parse_args(argv)
+
+    if bool(args.variar) == bool(args.casos):
+        parser.error("informe --variar ou --casos")
+    try:
+        if args.casos:
+            cases = load_cases(args.casos)
+        else:
+            cases = full_factorial(dict(parse_parameter(text) for text in args.variar))
+    except ValueError as e:
+        parser.error(str(e))
+
+    flowsheet = load_flowsheet(args.fluxograma)
+    result_cache = None
+    if args.cache_resultados:
+        result_cache = ResultCache(args.cache_resultados, max_bytes=int(args.cache_limite_mb * 2**20))
+    print(f"Varredura de {flowsheet.name}: {len(cases)} casos")
+    if args.processos > 1:
+        # pool.py depende deste módulo
+        from .pool import ScenarioPool
+
+        with ScenarioPool(flowsheet, COMBackend, workers=args.processos,
+                          file_path=args.arquivo or flowsheet.aspen_file,
+                          strict=args.estrito, restore=not args.manter_entradas,
+                          timeout=args.tempo_limite, result_cache=result_cache) as pool:
+            table = pool.run(cases, callback=_print_row)
+    else:
+        sweep = ParametricSweep(flowsheet, backend=COMBackend(), strict=args.estrito,
+                                restore=not args.manter_entradas, timeout=args.tempo_limite,
+                                result_cache=result_cache)
+        table = asyncio.run(sweep.run_async(cases, args.arquivo, callback=_print_row))
+
+    print(f"{len(table.converged())} de {len(table)} casos convergidos e analisados")
+    if result_cache is not None:
+        print(f"Cache de resultados: {sum(bool(row.get('cache')) for row in table)} casos reaproveitados")
+    if args.saida:
+        if args.saida.lower().endswith(".json"):
+            table.to_json(args.saida)
+        else:
+            table.to_csv(args.saida)
+        print(f"Resultados gravados em {args.saida}")
+    return table
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Telemetria de acesso aos nós: contagens e latências por caminho, tipo e função
+
+Cada chamada de AspenAnalyzer.get_node_value (e portanto de get_stream_exergy,
+get_equipment_power, get_heat_duty, ...) é registrada com a origem do valor
+(cache, cache negativo ou fonte de dados), sua duração e a função de acesso
+que a fez, de modo que o relatório mostre quais funções dominam o tempo e
+quais acertam o cache. As leituras feitas na fonte de dados (individuais ou
+em lote) são registradas à parte, separando o tempo de E/S (COM) do tempo
+gasto em Python.
+"""
+
+import json
+import time
+
+from .nodes import split_node_path
+
+# Origens de uma chamada a get_node_value (ou get_stream_exergy, para a tabela)
+SOURCE_CACHE = "cache"
+SOURCE_MISSING = "ausente"
+SOURCE_BACKEND = "fonte"
+SOURCE_TABLE = "tabela"
+
+PERCENTILES = (50, 90, 99)
+
+
+def node_kind(node_path):
+    """Tipo do nó: 'EXERGYFL' para correntes, a variável para blocos (WNET, ...)"""
+    parts = split_node_path(node_path)
+    if parts is None:
+        return "outro"
+    collection, _, segments = parts
+    if collection.endswith("Streams"):
+        return "EXERGYFL"
+    return segments[-1]
+
+
+def percentile(sorted_values, p):
+    """Percentil (posto mais próximo) de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-p * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _Series:
+    """Durações de um grupo de eventos"""
+
+    __slots__ = ("durations", "sources")
+
+    def __init__(self):
+        self.durations = []
+        self.sources = {}
+
+    def add(self, seconds, source=None):
+        self.durations.append(seconds)
+        if source is not None:
+            self.sources[source] = self.sources.get(source, 0) + 1
+
+    def summary(self):
+        ordered = sorted(self.durations)
+        data = {
+            'chamadas': len(ordered),
+            'total_ms': sum(ordered) * 1e3,
+        }
+        for p in PERCENTILES:
+            data[f'p{p}_us'] = percentile(ordered, p) * 1e6
+        data['max_us'] = (ordered[-1] if ordered else 0.0) * 1e6
+        if self.sources:
+            data['origens'] = dict(self.sources)
+        return data
+
+
+class NodeTelemetry:
+    """Contagens e latências de acesso aos nós de uma análise
+
+    reset() inicia um novo período (uma execução da simulação ou uma
+    análise); as durações anteriores são descartadas. Os totais de todos os
+    períodos ficam apenas como contadores em self.totals.
+    """
+
+    def __init__(self):
+        self.totals = {'chamadas': 0, 'leituras': 0, 'lotes': 0}
+        self.reset()
+
+    def reset(self):
+        self._calls = {}     # caminho -> _Series (get_node_value)
+        self._helpers = {}   # função de acesso -> _Series (get_stream_exergy, ...)
+        self._reads = {}     # caminho -> _Series (leituras individuais na fonte)
+        self._batches = []   # (nós pedidos, nós lidos, segundos)
+        self.started = time.perf_counter()
+
+    def record_call(self, node_path, source, seconds, helper="get_node_value"):
+        series = self._calls.get(node_path)
+        if series is None:
+            series = self._calls[node_path] = _Series()
+        series.add(seconds, source)
+        series = self._helpers.get(helper)
+        if series is None:
+            series = self._helpers[helper] = _Series()
+        series.add(seconds, source)
+        self.totals['chamadas'] += 1
+
+    def record_read(self, node_path, seconds):
+        series = self._reads.get(node_path)
+        if series is None:
+            series = self._reads[node_path] = _Series()
+        series.add(seconds)
+        self.totals['leituras'] += 1
+
+    def record_batch(self, requested, read, seconds):
+        self._batches.append((requested, read, seconds))
+        self.totals['lotes'] += 1
+
+    @staticmethod
+    def _by_kind(series_by_path):
+        kinds = {}
+        for path, series in series_by_path.items():
+            merged = kinds.setdefault(node_kind(path), _Series())
+            merged.durations.extend(series.durations)
+            for source, count in series.sources.items():
+                merged.sources[source] = merged.sources.get(source, 0) + count
+        return {kind: series.summary() for kind, series in sorted(kinds.items())}
+
+    def slowest_paths(self, limit=10):
+        """Caminhos com maior tempo acumulado na fonte de dados"""
+        totals = [(sum(series.durations), path) for path, series in self._reads.items()]
+        return [path for _, path in sorted(totals, reverse=True)[:limit]]
+
+    def to_dict(self):
+        calls = sum(len(s.durations) for s in self._calls.values())
+        cached = sum(s.sources.get(SOURCE_CACHE, 0) + s.sources.get(SOURCE_MISSING, 0)
+                     + s.sources.get(SOURCE_TABLE, 0) for s in self._calls.values())
+        call_time = sum(sum(s.durations) for s in self._calls.values())
+        read_time = sum(sum(s.durations) for s in self._reads.values())
+        batch_time = sum(seconds for _, _, seconds in self._batches)
+        return {
+            'resumo': {
+                'chamadas': calls,
+                'respondidas_pelo_cache': cached,
+                'taxa_acerto': (cached / calls * 100) if calls else 0.0,
+                'tempo_chamadas_ms': call_time * 1e3,
+                'tempo_fonte_ms': (read_time + batch_time) * 1e3,
+                'tempo_decorrido_ms': (time.perf_counter() - self.started) * 1e3,
+            },
+            'lotes': [{'pedidos': requested, 'lidos': read, 'total_ms': seconds * 1e3}
+                      for requested, read, seconds in self._batches],
+            'por_funcao': {helper: series.summary() for helper, series in sorted(self._helpers.items())},
+            'por_tipo': self._by_kind(self._calls),
+            'leituras_por_tipo': self._by_kind(self._reads),
+            'por_caminho': {path: series.summary() for path, series in sorted(self._calls.items())},
+            'leituras_por_caminho': {path: series.summary() for path, series in sorted(self._reads.items())},
+            'mais_lentos': self.slowest_paths(),
+            'acumulado': dict(self.totals),
+        }
+
+    def export_json(self, json_path, metadata=None):
+        """Grava a telemetria em JSON"""
+        data = {'metadados': metadata or {}, **self.to_dict()}
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return data
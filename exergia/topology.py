@@ -0,0 +1,206 @@
+"""Descoberta automática da topologia do fluxograma a partir da árvore do Aspen
+
+Cada bloco em Data\\Blocks tem um nó Connections cujos elementos são as
+correntes ligadas a ele; o valor de cada elemento é a porta ("F(IN)",
+"P(OUT)", ...). O tipo do modelo (Pump, RadFrac, ...) é o atributo
+HAP_RECORDTYPE do nó do bloco. A topologia descoberta pode ser comparada com
+o fluxograma digitado à mão, convertida em uma especificação de fluxograma e
+gravada no snapshot, para que execuções offline não precisem descobri-la de
+novo.
+"""
+
+from .flowsheet import equipment_item
+from .nodes import BLOCKS_COLLECTION, STREAMS_COLLECTION
+from .prefetch import _find_relative
+
+# Atributo do nó com o tipo do registro (modelo do bloco)
+HAP_RECORDTYPE = 6
+
+# Modelo do Aspen -> categoria de equipamento do fluxograma
+MODEL_CATEGORIES = {
+    "Pump": "pumps",
+    "Compr": "compressors",
+    "MCompr": "compressors",
+    "Mixer": "mixers",
+    "Valve": "valves",
+    "Sep": "separators",
+    "Sep2": "separators",
+    "HeatX": "heat_exchangers",
+    "Flash2": "flash_tanks",
+    "Flash3": "flash_tanks",
+    "FSplit": "splitters",
+    "RadFrac": "columns",
+    "DSTWU": "columns",
+    "Distl": "columns",
+    "RStoic": "reactors",
+    "RYield": "reactors",
+    "REquil": "reactors",
+    "RGibbs": "reactors",
+    "RCSTR": "reactors",
+    "RPlug": "reactors",
+    "RBatch": "reactors",
+    # Heater é resfriador ou forno conforme o sinal do calor (ver Topology.category)
+    "Heater": None,
+}
+
+
+def _attribute(node, attribute):
+    try:
+        return node.AttributeValue(attribute)
+    except Exception:
+        return None
+
+
+def _energy_streams(aspen):
+    """Correntes de calor e de trabalho (sem exergia de material)"""
+    collection = aspen.Tree.FindNode(STREAMS_COLLECTION)
+    if collection is None:
+        return set()
+    return {stream.Name for stream in collection.Elements
+            if str(_attribute(stream, HAP_RECORDTYPE) or "").upper() in ("HEAT", "WORK")}
+
+
+def discover_topology(aspen):
+    """Percorre Data\\Blocks\\*\\Connections uma única vez e monta a Topology
+
+    Apenas correntes de material entram no grafo.
+    """
+    blocks = {}
+    collection = aspen.Tree.FindNode(BLOCKS_COLLECTION)
+    if collection is None:
+        return Topology(blocks)
+    energy_streams = _energy_streams(aspen)
+
+    for block in collection.Elements:
+        inputs, outputs = [], []
+        connections = _find_relative(block, ["Connections"])
+        if connections is not None:
+            for connection in connections.Elements:
+                if connection.Name in energy_streams:
+                    continue
+                port = str(connection.Value or "").upper()
+                if "(OUT)" in port:
+                    outputs.append(connection.Name)
+                else:
+                    inputs.append(connection.Name)
+        model = _attribute(block, HAP_RECORDTYPE)
+        blocks[block.Name] = {
+            "modelo": None if model is None else str(model),
+            "entradas": inputs,
+            "saidas": outputs,
+        }
+    return Topology(blocks)
+
+
+class Topology:
+    """Grafo bloco/corrente descoberto no Aspen
+
+    blocks: {bloco: {"modelo": str, "entradas": [correntes], "saidas": [correntes]}}
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def to_dict(self):
+        return {"blocos": self.blocks}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["blocos"])
+
+    def category(self, block, heat_duty=None):
+        """Categoria do bloco; Heater depende do sinal de heat_duty(bloco)"""
+        model = self.blocks[block]["modelo"]
+        if model == "Heater":
+            duty = heat_duty(block) if heat_duty is not None else None
+            return "furnaces" if duty is not None and duty > 0 else "coolers"
+        return MODEL_CATEGORIES.get(model)
+
+    def streams(self):
+        """(alimentações, produtos): correntes sem bloco de origem ou de destino"""
+        produced, consumed = {}, {}
+        for info in self.blocks.values():
+            produced.update(dict.fromkeys(info["saidas"]))
+            consumed.update(dict.fromkeys(info["entradas"]))
+        feeds = [stream for stream in consumed if stream not in produced]
+        products = [stream for stream in produced if stream not in consumed]
+        return feeds, products
+
+    def unclassified(self):
+        """Blocos cujo modelo não corresponde a nenhuma categoria de equipamento"""
+        return [block for block, info in self.blocks.items()
+                if info["modelo"] not in MODEL_CATEGORIES]
+
+    def to_spec(self, name, heat_duty=None, base=None):
+        """Especificação de fluxograma (como em flowsheets/*.json) a partir do grafo
+
+        base: Flowsheet cujas opções, descrição e arquivo são reaproveitados.
+        Blocos sem categoria (ver unclassified()) ficam de fora.
+        """
+        equipment = {}
+        work = {"pumps": [], "compressors": []}
+        heat_input = {"furnaces": [], "flash_tanks": [], "reboilers": []}
+        heat_output = {"compressors": [], "reactors": [], "coolers": [], "condensers": []}
+
+        for block, info in self.blocks.items():
+            category = self.category(block, heat_duty)
+            if category is None:
+                continue
+            item = equipment_item(category, block, info["entradas"], info["saidas"])
+            if category == "compressors":
+                item["type"] = "m-compressor" if info["modelo"] == "MCompr" else "standard"
+            equipment.setdefault(category, []).append(item)
+
+            if category in work:
+                work[category].append(block)
+            if category == "compressors" and item["type"] != "standard":
+                heat_output["compressors"].append(block)
+            if category in ("furnaces", "flash_tanks"):
+                heat_input[category].append(block)
+            if category in ("reactors", "coolers"):
+                heat_output[category].append(block)
+            if category == "columns":
+                heat_input["reboilers"].append(block)
+                heat_output["condensers"].append(block)
+
+        feeds, products = self.streams()
+        spec = {
+            "name": name,
+            "description": base.description if base is not None else "Topologia descoberta no Aspen",
+            "version": 1,
+            "input_streams": feeds,
+            "output_streams": products,
+            "equipment": equipment,
+            "work": work,
+            "heat_input": heat_input,
+            "heat_output": heat_output,
+        }
+        if base is not None:
+            spec["aspen_file"] = base.aspen_file
+            spec["options"] = dict(base.options)
+            spec["boundary_temperatures"] = dict(base.boundary_temperatures)
+            spec["block_temperatures"] = {block: dict(t) for block, t in base.block_temperatures.items()}
+        return spec
+
+    def differences(self, flowsheet):
+        """Divergências entre o fluxograma digitado e a topologia descoberta"""
+        differences = list(flowsheet.warnings)
+        for category, items in flowsheet.equipment.items():
+            for item in items:
+                name = item["name"]
+                if name not in self.blocks:
+                    differences.append(f"Bloco {name} ({category}) não existe no Aspen")
+                    continue
+                inputs, outputs = flowsheet.equipment_streams(item)
+                info = self.blocks[name]
+                if set(inputs) != set(info["entradas"]):
+                    differences.append(f"Entradas de {name}: fluxograma {sorted(inputs)}, "
+                                       f"Aspen {sorted(info['entradas'])}")
+                if set(outputs) != set(info["saidas"]):
+                    differences.append(f"Saídas de {name}: fluxograma {sorted(outputs)}, "
+                                       f"Aspen {sorted(info['saidas'])}")
+        listed = set(flowsheet.block_category)
+        for name, info in self.blocks.items():
+            if name not in listed:
+                differences.append(f"Bloco {name} ({info['modelo']}) do Aspen ausente do fluxograma")
+        return differences
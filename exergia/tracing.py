@@ -0,0 +1,130 @@
+"""Intervalos de tempo (spans) das etapas da análise, no formato Chrome trace
+
+O arquivo gerado por Tracer.export_chrome_trace() abre em chrome://tracing ou
+em https://ui.perfetto.dev. Com o rastreamento desligado (NULL_TRACER, o
+padrão) cada etapa custa apenas a verificação de tracer.enabled.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Tracer:
+    """Coleta eventos completos ('X') com início e duração em microssegundos"""
+
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def start(self, name):
+        """Marca o início de um intervalo; retorna o token para finish()"""
+        return time.perf_counter()
+
+    def finish(self, name, start, category="etapa", **args):
+        end = time.perf_counter()
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def span(self, name, category="etapa", **args):
+        return _Span(self, name, category, args)
+
+    def stage_totals(self):
+        """{etapa: tempo total em ms}"""
+        totals = {}
+        for event in self.events:
+            totals[event['name']] = totals.get(event['name'], 0.0) + event['dur'] / 1e3
+        return totals
+
+    def export_chrome_trace(self, json_path, metadata=None):
+        """Grava os eventos no formato JSON do Chrome/Perfetto"""
+        data = {
+            'traceEvents': self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': metadata or {},
+        }
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return len(self.events)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "begin")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.begin = self.tracer.start(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.finish(self.name, self.begin, self.category, **self.args)
+        return False
+
+
+class _NullTracer:
+    """Rastreamento desligado: nenhuma medição, nenhum evento"""
+
+    enabled = False
+    events = ()
+
+    def start(self, name):
+        return None
+
+    def finish(self, name, start, category="etapa", **args):
+        pass
+
+    def span(self, name, category="etapa", **args):
+        return _NULL_SPAN
+
+    def stage_totals(self):
+        return {}
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+NULL_TRACER = _NullTracer()
+
+
+def traced(method):
+    """Registra cada chamada do método como um intervalo em self.tracer"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if not tracer.enabled:
+            return method(self, *args, **kwargs)
+        start = tracer.start(name)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            tracer.finish(name, start)
+
+    return wrapper
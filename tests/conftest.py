@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os testes usam o pacote exergia da raiz do repositório, sem instalação
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,99 @@
+"""Gera baseline.json com os resultados dos scripts originais de cada variante
+
+Os três scripts da raiz do repositório eram implementações independentes
+antes da extração do pacote exergia (commit 8002787). Este utilitário os lê
+do histórico do git, substitui o win32com por um FakeAspenDocument com
+valores sintéticos e grava, para cada variante e semente, os valores de nós
+e os resultados de full_exergy_analysis(). test_engine.py compara o pacote
+com esses resultados.
+
+    python tests/data/gerar_baseline.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from exergia import FakeAspenDocument, load_flowsheet  # noqa: E402
+from exergia.nodes import BLOCK_VARIABLES, block_output_path  # noqa: E402
+
+BASELINE_COMMIT = "8002787"
+SCRIPTS = {
+    "versao_final": "Calc_exergy [versão final].py",
+    "rtc": "[RTC] - Calc_exergy.py",
+    "sist_rec_gas": "[sist rec gas]  Calac_Exergy.py",
+}
+SEEDS = range(5)
+
+
+def synthetic_values(flowsheet, seed):
+    """Nós do plano e todas as variáveis de todos os blocos, com valores aleatórios
+
+    As variáveis fora do plano revelam leituras da variável errada (QNET no
+    lugar de QCALC, por exemplo).
+    """
+    rng = random.Random(seed)
+    values = {}
+    for node_path in sorted(flowsheet.node_plan()):
+        if "\\Streams\\" in node_path:
+            values[node_path] = rng.uniform(100.0, 10000.0)
+        else:
+            values[node_path] = rng.uniform(-2000.0, 2000.0)
+    for block in flowsheet.blocks:
+        for variable in BLOCK_VARIABLES:
+            values.setdefault(block_output_path(block, variable), rng.uniform(-2000.0, 2000.0))
+    return values
+
+
+def load_script(name, script):
+    """Executa o script original do histórico com o win32com substituído"""
+    source = subprocess.run(["git", "show", f"{BASELINE_COMMIT}:{script}"], cwd=ROOT,
+                            capture_output=True, check=True).stdout.decode("utf-8")
+    module = types.ModuleType(f"baseline_{name}")
+    exec(compile(source, script, "exec"), module.__dict__)
+    return module
+
+
+def main():
+    current = {}
+    client = types.ModuleType("win32com.client")
+    client.Dispatch = lambda name: FakeAspenDocument(current["valores"])
+    package = types.ModuleType("win32com")
+    package.client = client
+    sys.modules["win32com"] = package
+    sys.modules["win32com.client"] = client
+
+    baseline = {}
+    for name, script in SCRIPTS.items():
+        module = load_script(name, script)
+        flowsheet = load_flowsheet(name)
+        baseline[name] = []
+        for seed in SEEDS:
+            current["valores"] = synthetic_values(flowsheet, seed)
+            analyzer = module.AspenAnalyzer()
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzer.connect_to_aspen("baseline.apw")
+                results = analyzer.full_exergy_analysis()
+            baseline[name].append({
+                "semente": seed,
+                "nos": current["valores"],
+                "resultados": results,
+            })
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(f"Baseline gravado em {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""DocumentPool: empréstimo, devolução e falhas ao abrir documentos"""
+
+import threading
+import time
+
+import pytest
+
+from exergia import COMBackend, DocumentPool, FakeAspenDocument
+
+INPUT = "\\Data\\Blocks\\R-1\\Input\\TEMP"
+
+
+class FlakyFactory:
+    """Cria COMBackends sobre FakeAspenDocuments; as primeiras `failures` aberturas falham"""
+
+    def __init__(self, failures=0, gate=None):
+        self.failures = failures
+        self.gate = gate
+        self.documents = []
+
+    def __call__(self):
+        return COMBackend(dispatch=self._dispatch)
+
+    def _dispatch(self):
+        if self.gate is not None:
+            self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("sem licença")
+        document = FakeAspenDocument({INPUT: 600.0})
+        self.documents.append(document)
+        return document
+
+
+def test_checkout_after_failed_open(tmp_path):
+    factory = FlakyFactory(failures=1)
+    pool = DocumentPool(str(tmp_path / "planta.apw"), size=1, factory=factory)
+    with pytest.raises(RuntimeError):
+        pool.checkout(timeout=1)
+
+    document = pool.checkout(timeout=1)
+    assert pool.stats()["em_uso"] == 1
+    pool.checkin(document)
+    stats = pool.stats()
+    assert (stats["aberturas"], stats["abertos"], stats["livres"]) == (1, 1, 1)
+    assert pool.checkout(timeout=1) is document
+    assert pool.stats()["reutilizacoes"] == 1
+
+
+def test_failed_open_wakes_waiting_checkout(tmp_path):
+    gate = threading.Event()
+    factory = FlakyFactory(failures=1, gate=gate)
+    pool = DocumentPool(str(tmp_path / "planta.apw"), size=1, factory=factory)
+    outcome = {}
+
+    def first():
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+        outcome["first"] = True
+
+    def second():
+        outcome["second"] = pool.checkout(timeout=5)
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    threads[0].start()
+    # O segundo pedido chega com a única vaga reservada pela abertura do primeiro
+    while not pool._opening:
+        time.sleep(0.001)
+    threads[1].start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(10)
+    assert outcome["first"]
+    assert outcome["second"].leased
+    assert pool.stats()["abertos"] == 1
+
+
+def test_failed_warm_releases_reservations(tmp_path):
+    factory = FlakyFactory(failures=1)
+    pool = DocumentPool(str(tmp_path / "planta.apw"), size=3, factory=factory)
+    with pytest.raises(RuntimeError):
+        pool.warm()
+    assert pool.stats()["abertos"] == 0
+
+    pool.warm()
+    assert pool.stats()["abertos"] == pool.stats()["livres"] == 3
+
+
+def test_checkin_restores_inputs(tmp_path):
+    factory = FlakyFactory()
+    with DocumentPool(str(tmp_path / "planta.apw"), size=1, factory=factory) as pool:
+        with pool.lease() as backend:
+            backend.write_node(INPUT, 640.0)
+        assert factory.documents[0].value(INPUT) == 600.0
+        assert factory.documents[0].calls["Reinit"] == 1
@@ -0,0 +1,37 @@
+"""Análise completa e vetorizada comparadas aos scripts originais (data/baseline.json)"""
+
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+from exergia import AspenAnalyzer, COMBackend, FakeAspenDocument, load_flowsheet
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "data", "baseline.json")
+with open(BASELINE_PATH, encoding="utf-8") as f:
+    BASELINE = json.load(f)
+CASES = [(name, case) for name, cases in BASELINE.items() for case in cases]
+CASE_IDS = [f"{name}-{case['semente']}" for name, case in CASES]
+
+
+def analyze(name, values, method):
+    document = FakeAspenDocument(values)
+    analyzer = AspenAnalyzer(load_flowsheet(name), backend=COMBackend(dispatch=lambda: document))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert analyzer.connect_to_aspen("baseline.apw")
+        return getattr(analyzer, method)()
+
+
+@pytest.mark.parametrize("method", ["full_exergy_analysis", "fast_exergy_analysis"])
+@pytest.mark.parametrize("name, case", CASES, ids=CASE_IDS)
+def test_matches_baseline(name, case, method):
+    results = analyze(name, case["nos"], method)
+    assert results == pytest.approx(case["resultados"], rel=1e-9, abs=1e-6)
+
+
+@pytest.mark.parametrize("name, case", CASES, ids=CASE_IDS)
+def test_full_analysis_keeps_result_order(name, case):
+    results = analyze(name, case["nos"], "full_exergy_analysis")
+    assert list(results) == list(case["resultados"])
@@ -0,0 +1,90 @@
+"""NodeStore e CachedBackend: acertos, falhas e estados dos nós gravados"""
+
+import contextlib
+import io
+
+import pytest
+
+from exergia import AspenAnalyzer, CachedBackend, COMBackend, FakeAspenDocument, NodeStore, load_flowsheet
+
+VALUE = "\\Data\\Blocks\\P-1\\Output\\WNET"
+NO_VALUE = "\\Data\\Blocks\\P-1\\Output\\QNET"
+MISSING = "\\Data\\Blocks\\P-2\\Output\\WNET"
+PATHS = [VALUE, NO_VALUE, MISSING]
+
+
+@pytest.fixture
+def apw(tmp_path):
+    path = tmp_path / "planta.apw"
+    path.write_bytes(b"versao 1")
+    return path
+
+
+def cached_backend(store, values):
+    document = FakeAspenDocument(values)
+    backend = CachedBackend(store, COMBackend(dispatch=lambda: document))
+    return backend, document
+
+
+def test_second_run_is_served_by_the_store(tmp_path, apw):
+    store = NodeStore(str(tmp_path / "nos.sqlite"))
+    values = {VALUE: 5.0, NO_VALUE: None}
+
+    first, document = cached_backend(store, values)
+    first.connect(apw)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert first.read_nodes(PATHS) == {VALUE: 5.0}
+    assert (first.store_hits, first.store_misses) == (0, 3)
+    assert document.calls["InitFromArchive2"] == 1
+
+    second, document = cached_backend(store, values)
+    second.connect(apw)
+    assert second.read_nodes(PATHS) == {VALUE: 5.0}
+    assert second.read_node(NO_VALUE) is None
+    with pytest.raises(KeyError):
+        second.read_node(MISSING)
+    assert (second.store_hits, second.store_misses) == (5, 0)
+    assert not second.launched
+    assert "InitFromArchive2" not in document.calls
+
+
+def test_changed_archive_misses(tmp_path, apw):
+    store = NodeStore(str(tmp_path / "nos.sqlite"))
+    first, _ = cached_backend(store, {VALUE: 5.0})
+    first.connect(apw)
+    with contextlib.redirect_stdout(io.StringIO()):
+        first.read_nodes([VALUE])
+
+    apw.write_bytes(b"versao 2")
+    second, _ = cached_backend(store, {VALUE: 7.0})
+    second.connect(apw)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert second.read_nodes([VALUE]) == {VALUE: 7.0}
+    assert (second.store_hits, second.store_misses) == (0, 1)
+    assert store.stats()["arquivos"] == 2
+
+
+def test_eviction_keeps_most_recent_archive(tmp_path):
+    store = NodeStore(str(tmp_path / "nos.sqlite"), max_entries=3)
+    store.store("antigo", {VALUE: (0, 1.0), NO_VALUE: (1, None)})
+    store.store("novo", {VALUE: (0, 2.0), MISSING: (2, None)})
+    assert store.lookup("antigo", PATHS) == {}
+    assert store.lookup("novo", PATHS) == {VALUE: (0, 2.0), MISSING: (2, None)}
+
+
+def test_analyzer_cache_counts(tmp_path, apw):
+    flowsheet = load_flowsheet("rtc")
+    plan = sorted(flowsheet.node_plan())
+    synthetic = FakeAspenDocument.synthetic(plan, seed=3)
+    values = {path: synthetic.value(path) for path in plan}
+    store = NodeStore(str(tmp_path / "nos.sqlite"))
+    results, counts = [], []
+    for _ in range(2):
+        backend, _ = cached_backend(store, values)
+        analyzer = AspenAnalyzer(flowsheet, backend=backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert analyzer.connect_to_aspen(str(apw))
+            results.append(analyzer.full_exergy_analysis())
+        counts.append((backend.store_hits, backend.store_misses))
+    assert results[0] == results[1]
+    assert counts == [(0, len(plan)), (len(plan), 0)]
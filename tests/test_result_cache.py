@@ -0,0 +1,81 @@
+"""ResultCache: chave dos casos, descarte LRU e limite de tamanho"""
+
+import os
+
+from exergia import load_flowsheet
+from exergia.result_cache import ResultCache, result_key
+
+RESULTS = {"bombas": 10.0, "eficiencia_completa": 80.0}
+
+
+def keys(n):
+    return [f"{i:02d}" + "0" * 62 for i in range(n)]
+
+
+def age(cache, key, seconds):
+    """Marca o último uso da entrada como seconds atrás"""
+    path = cache._path(key)
+    stamp = os.path.getmtime(path) - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_result_key():
+    flowsheet = load_flowsheet("rtc")
+    path = "\\Data\\Blocks\\R-1\\Input\\TEMP"
+    assert result_key(flowsheet, {path: 600}, 298.15, "a") == result_key(flowsheet, {path: 600.0}, 298.15, "a")
+    assert result_key(flowsheet, {path: 600}, 298.15, "a") != result_key(flowsheet, {path: 601}, 298.15, "a")
+    assert result_key(flowsheet, {path: 600}, 298.15, "a") != result_key(flowsheet, {path: 600}, 298.15, "b")
+    assert result_key(flowsheet, {path: 600}, 298.15, "a") != result_key(flowsheet, {path: 600}, 300.0, "a")
+
+
+def test_hits_and_misses(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = keys(1)[0]
+    assert cache.get(key) is None
+    cache.put(key, RESULTS, nodes={"a": 1}, missing=["b"], row={"caso": 0})
+    entry = cache.get(key)
+    assert entry["resultados"] == RESULTS
+    assert entry["nos"] == {"a": 1.0}
+    assert entry["ausentes"] == ["b"]
+    assert cache.rows() == [{"caso": 0}]
+    assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=3)
+    first, second, third, fourth = keys(4)
+    for i, key in enumerate((first, second, third)):
+        cache.put(key, RESULTS)
+        age(cache, key, 100 - i)
+    # A consulta renova a primeira entrada; a segunda passa a ser a mais antiga
+    assert cache.get(first) is not None
+    cache.put(fourth, RESULTS)
+    assert cache.evicted == 1
+    assert cache.get(second) is None
+    assert all(cache.get(key) is not None for key in (first, third, fourth))
+
+
+def test_size_cap(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    all_keys = keys(6)
+    cache.put(all_keys[0], RESULTS)
+    entry_size = os.path.getsize(cache._path(all_keys[0]))
+
+    cache = ResultCache(str(tmp_path), max_bytes=int(2.5 * entry_size))
+    for i, key in enumerate(all_keys):
+        cache.put(key, RESULTS)
+        age(cache, key, 100 - i)
+    stats = cache.stats()
+    assert stats["bytes"] <= 2.5 * entry_size
+    assert stats["entradas"] == 2
+    assert cache.get(all_keys[-1]) is not None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = keys(1)[0]
+    cache.put(key, RESULTS)
+    with open(cache._path(key), "wb") as f:
+        f.write(b"truncado")
+    assert cache.get(key) is None
+    assert not os.path.exists(cache._path(key))
@@ -0,0 +1,87 @@
+"""Snapshots: gravação, leitura e distinção entre nós ausentes e sem valor"""
+
+import contextlib
+import gzip
+import io
+import json
+
+import pytest
+
+from exergia import AspenAnalyzer, DictBackend, FakeAspenDocument, SnapshotBackend, load_flowsheet
+from exergia.snapshot import SNAPSHOT_VERSION, capture_snapshot, load_snapshot
+from exergia.topology import Topology
+
+VALUE = "\\Data\\Streams\\S1\\Output\\STRM_UPP\\EXERGYFL\\MIXED\\TOTAL"
+NO_VALUE = "\\Data\\Streams\\S2\\Output\\STRM_UPP\\EXERGYFL\\MIXED\\TOTAL"
+MISSING = "\\Data\\Streams\\S3\\Output\\STRM_UPP\\EXERGYFL\\MIXED\\TOTAL"
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "planta.snap"
+    topology = Topology({"B1": {"modelo": "Pump", "entradas": ["S1"], "saidas": ["S2"]}})
+    counts = capture_snapshot(DictBackend({VALUE: 12.5, NO_VALUE: None}), [VALUE, NO_VALUE, MISSING],
+                              path, metadata={"fluxograma": "teste"}, topology=topology)
+    assert counts == (1, 1, 1)
+    return path
+
+
+def test_round_trip(snapshot_path):
+    data = load_snapshot(snapshot_path)
+    assert data["versao"] == SNAPSHOT_VERSION
+    assert data["nos"] == {VALUE: 12.5}
+    assert data["sem_valor"] == [NO_VALUE]
+    assert data["ausentes"] == [MISSING]
+
+    backend = SnapshotBackend(snapshot_path)
+    assert backend.metadata == {"fluxograma": "teste"}
+    assert backend.read_topology().to_dict() == Topology(
+        {"B1": {"modelo": "Pump", "entradas": ["S1"], "saidas": ["S2"]}}).to_dict()
+    assert backend.read_nodes([VALUE, NO_VALUE, MISSING]) == {VALUE: 12.5}
+
+
+def test_valueless_and_missing_nodes(snapshot_path):
+    backend = SnapshotBackend(snapshot_path)
+    assert backend.read_node(VALUE) == 12.5
+    assert backend.read_node(NO_VALUE) is None
+    with pytest.raises(KeyError):
+        backend.read_node(MISSING)
+
+
+def test_version_1_snapshot_is_read(tmp_path):
+    path = tmp_path / "antigo.snap"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"formato": "exergia-snapshot", "versao": 1, "metadados": {},
+                   "nos": {VALUE: 1.0}, "ausentes": [NO_VALUE]}, f)
+    backend = SnapshotBackend(path)
+    assert backend.read_node(VALUE) == 1.0
+    with pytest.raises(KeyError):
+        backend.read_node(NO_VALUE)
+
+
+def test_unknown_version_is_rejected(tmp_path):
+    path = tmp_path / "futuro.snap"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"formato": "exergia-snapshot", "versao": SNAPSHOT_VERSION + 1}, f)
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_offline_analysis_reports_missing_reasons(tmp_path):
+    flowsheet = load_flowsheet("rtc")
+    plan = sorted(flowsheet.node_plan())
+    document = FakeAspenDocument.synthetic(plan, seed=1)
+    values = {path: document.value(path) for path in plan[2:]}
+    values[plan[0]] = None  # plan[1] fica fora: nó inexistente
+
+    path = tmp_path / "rtc.snap"
+    online = AspenAnalyzer(flowsheet, backend=DictBackend(values))
+    with contextlib.redirect_stdout(io.StringIO()):
+        online.save_snapshot(path)
+        offline = AspenAnalyzer(flowsheet, backend=SnapshotBackend(path))
+        expected = online.full_exergy_analysis()
+        results = offline.full_exergy_analysis()
+
+    assert offline.missing_nodes() == {plan[0]: "sem valor", plan[1]: "não encontrado"}
+    assert offline.missing_nodes() == online.missing_nodes()
+    assert results == expected
@@ -0,0 +1,129 @@
+"""ParametricSweep sobre um FakeAspenDocument com modelo: entradas, execução assíncrona e falhas"""
+
+import asyncio
+
+import pytest
+
+from exergia import COMBackend, FakeAspenDocument, load_flowsheet
+from exergia.nodes import RUN_ERRORS_PATH, block_input_path
+from exergia.runner import STATUS_CONVERGED, STATUS_ERRORS, STATUS_FAILED, STATUS_TIMEOUT
+from exergia.sweep import ParametricSweep
+
+TEMP = block_input_path("B1", "TEMP")
+PRES = block_input_path("B1", "PRES")
+ORIGINAL = {TEMP: 300.0, PRES: 1.0}
+# Casos especiais do modelo: exceção, erros do Aspen e simulação lenta
+FAILING, WITH_ERRORS, SLOW = 305.0, 315.0, 320.0
+# Colunas que dependem do relógio
+TIMING = ("tempo_s", "tempo_simulacao_s")
+
+FLOWSHEET = load_flowsheet("versao_final")
+PLAN = sorted(FLOWSHEET.node_plan())
+
+
+def make_document():
+    """Documento cujas saídas dependem de TEMP e PRES; registra as entradas de cada execução"""
+    document = FakeAspenDocument.synthetic(PLAN, seed=1)
+    for path, value in ORIGINAL.items():
+        document.set_node(path, value)
+    document.set_node(RUN_ERRORS_PATH, 0)
+    base = {path: document.value(path) for path in PLAN}
+    document.inputs_seen = []
+
+    def model(doc):
+        temperature, pressure = doc.value(TEMP), doc.value(PRES)
+        doc.inputs_seen.append({TEMP: temperature, PRES: pressure})
+        if temperature == FAILING:
+            raise RuntimeError("falha na inicialização do bloco")
+        factor = (temperature / 300.0) * (1 + 0.1 * (pressure - 1))
+        for path, value in base.items():
+            doc.set_node(path, value * factor)
+        doc.set_node(RUN_ERRORS_PATH, 2 if temperature == WITH_ERRORS else 0)
+
+    document.model = model
+    run2 = document.Engine.Run2
+
+    def run(run_async=False):
+        document.run_latency = 1.0 if document.value(TEMP) == SLOW else 0.0
+        run2(run_async)
+
+    document.Engine.Run2 = run
+    return document
+
+
+def make_sweep(document, **kwargs):
+    return ParametricSweep(FLOWSHEET, backend=COMBackend(dispatch=lambda: document),
+                           poll_interval=0.01, **kwargs)
+
+
+def comparable(table):
+    return [{column: value for column, value in row.items() if column not in TIMING} for row in table]
+
+
+def test_each_row_runs_with_exactly_its_inputs():
+    document = make_document()
+    sweep = make_sweep(document)
+    sweep.open("planta.apw")
+    try:
+        with_pressure = sweep.run_case({TEMP: 600.0, PRES: 5.0}, 0)
+        without_pressure = sweep.run_case({TEMP: 600.0}, 1)
+    finally:
+        sweep.close()
+    # PRES alterado pelo caso anterior voltou ao valor original
+    assert document.inputs_seen == [{TEMP: 600.0, PRES: 5.0}, {TEMP: 600.0, PRES: 1.0}]
+    assert document.value(PRES) == ORIGINAL[PRES]
+    assert document.value(TEMP) == ORIGINAL[TEMP]
+
+    fresh = make_sweep(make_document()).run([{TEMP: 600.0}], "planta.apw").rows[0]
+    assert comparable([without_pressure]) == comparable([{**fresh, "caso": 1}])
+    assert with_pressure["eficiencia_completa"] != without_pressure["eficiencia_completa"]
+
+
+def test_rows_match_inputs_seen():
+    document = make_document()
+    cases = [{TEMP: 300.0 + 12 * i, PRES: 1.0 + i} for i in range(4)]
+    table = make_sweep(document).run(cases, "planta.apw")
+    assert document.inputs_seen == cases
+    assert [{TEMP: row[TEMP], PRES: row[PRES]} for row in table] == cases
+
+
+def test_ragged_cases_are_rejected():
+    with pytest.raises(ValueError):
+        make_sweep(make_document()).run([{TEMP: 600.0, PRES: 5.0}, {TEMP: 600.0}], "planta.apw")
+
+
+def test_run_and_run_async_produce_the_same_table():
+    cases = [{TEMP: 300.0 + 12 * i, PRES: 1.0 + 0.5 * i} for i in range(5)]
+    table = make_sweep(make_document()).run(cases, "planta.apw")
+    async_table = asyncio.run(make_sweep(make_document()).run_async(cases, "planta.apw"))
+    assert table.columns == async_table.columns
+    assert comparable(table) == comparable(async_table)
+
+
+@pytest.mark.parametrize("mode", ["run", "run_async"])
+def test_failed_and_timed_out_cases_get_their_own_rows(mode):
+    temperatures = [300.0, FAILING, 310.0, SLOW, WITH_ERRORS, 330.0]
+    cases = [{TEMP: temperature} for temperature in temperatures]
+    sweep = make_sweep(make_document(), timeout=0.2)
+    if mode == "run":
+        table = sweep.run(cases, "planta.apw")
+    else:
+        table = asyncio.run(sweep.run_async(cases, "planta.apw"))
+
+    assert [row["caso"] for row in table] == list(range(len(cases)))
+    assert [row[TEMP] for row in table] == temperatures
+    assert [row["status"] for row in table] == [STATUS_CONVERGED, STATUS_FAILED, STATUS_CONVERGED,
+                                                STATUS_TIMEOUT, STATUS_ERRORS, STATUS_CONVERGED]
+    for row in table:
+        if row["status"] == STATUS_CONVERGED:
+            assert "eficiencia_completa" in row
+        else:
+            assert "eficiencia_completa" not in row
+    assert "falha na inicialização" in table.rows[1]["mensagem"]
+    assert table.rows[4]["erros_aspen"] == 2
+
+    # Os casos convergidos têm os mesmos resultados de uma varredura sem falhas
+    converged = [case for case, row in zip(cases, table) if row["status"] == STATUS_CONVERGED]
+    clean = make_sweep(make_document()).run(converged, "planta.apw")
+    expected = [row["eficiencia_completa"] for row in clean]
+    assert [row["eficiencia_completa"] for row in table.converged()] == expected